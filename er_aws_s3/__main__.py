@@ -1,33 +1,112 @@
 import os
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING
 
-from cdktf import App
+from external_resources_io.config import Action, Config
+from external_resources_io.exit_status import EXIT_SKIP
 from external_resources_io.input import parse_model, read_input_from_file
 
+from er_aws_s3 import memory_profile, metrics, node_cache
+from er_aws_s3.cache import SynthCache, state_id
 from er_aws_s3.input import AppInterfaceInput
-from er_aws_s3.s3 import Stack
+from er_aws_s3.json_stack import JsonStack
+from er_aws_s3.providers import write_offline_config
 
+# cdktf is imported on demand, the python engine does not need node/jsii
+if TYPE_CHECKING:
+    from cdktf import App
 
+
+@metrics.traced
 def get_ai_input() -> AppInterfaceInput:
     """Get the AppInterfaceInput from the input file."""
-    return parse_model(
-        AppInterfaceInput,
-        read_input_from_file(
+    with memory_profile.phase("get_ai_input"):
+        input_data = read_input_from_file(
             file_path=os.environ.get("ER_INPUT_FILE", "/inputs/input.json"),
-        ),
-    )
+        )
+        with metrics.span("parse_model"):
+            return parse_model(AppInterfaceInput, input_data)
 
 
-def init_cdktf_app(ai_input: AppInterfaceInput, id_: str = "CDKTF") -> App:
+@metrics.traced
+def init_cdktf_app(
+    ai_input: AppInterfaceInput, id_: str = "CDKTF", outdir: str | None = None
+) -> "App":
     """Initialize the CDKTF app and all the stacks."""
-    app = App(outdir=os.environ.get("ER_OUTDIR", None))
-    Stack(app, id_, ai_input)
+    from cdktf import App
+
+    from er_aws_s3.s3 import Stack
+
+    app = App(outdir=outdir or os.environ.get("ER_OUTDIR", None))
+    with memory_profile.phase("Stack.__init__"):
+        Stack(app, id_, ai_input)
     return app
 
 
+def synth(
+    ai_input: AppInterfaceInput, id_: str = "CDKTF", outdir: str | None = None
+) -> None:
+    """Synthesize the stack with the engine selected by ER_SYNTH_ENGINE.
+
+    'cdktf' (default) runs the cdktf Stack, 'python' the pure-Python JsonStack.
+    The provider lock and CLI config are written next to the stack when the
+    provider is in the plugin cache.
+    """
+    if os.environ.get("ER_SYNTH_ENGINE", "cdktf") == "python":
+        with metrics.span("init_json_stack"):
+            stack = JsonStack(id_, ai_input)
+        stack_file = stack.synth(
+            Path(outdir or os.environ.get("ER_OUTDIR") or "cdktf.out")
+        )
+    else:
+        app = init_cdktf_app(ai_input, id_, outdir)
+        with metrics.span("App.synth"), memory_profile.phase("App.synth"):
+            app.synth()
+        stack_file = Path(app.outdir) / "stacks" / id_ / "cdk.tf.json"
+    with metrics.span("write_offline_config"):
+        # outdir/stacks/<id>/cdk.tf.json
+        write_offline_config(stack_file.parents[2], stack_file.parent)
+    metrics.record_resources(stack_file)
+
+
+def cached_synth(cache: SynthCache, *, destroy: bool = False) -> bool:
+    """Synthesize through the cache. Returns true if the input is unchanged.
+
+    The input is unchanged when it is the last one applied to the same
+    terraform state, hence there is nothing left to plan. hooks/post_apply.py
+    records the applied input, once the apply succeeded. A destroy always plans.
+    """
+    input_data = read_input_from_file(
+        file_path=os.environ.get("ER_INPUT_FILE", "/inputs/input.json"),
+    )
+    with metrics.span("parse_model"):
+        ai_input = parse_model(AppInterfaceInput, input_data)
+    outdir = Path(os.environ.get("ER_OUTDIR", "cdktf.out"))
+
+    key = cache.key(input_data)
+    unchanged = not destroy and cache.is_unchanged(key, state_id(ai_input))
+    if not cache.restore(key, outdir):
+        synth(ai_input, outdir=str(outdir))
+        cache.store(key, outdir)
+    cache.mark_pending(key, state_id(ai_input))
+    return unchanged
+
+
 def main() -> None:
     """Proper entry point for the CDKTF app."""
-    app = init_cdktf_app(get_ai_input())
-    app.synth()
+    # Before the first cdktf import boots the jsii kernel
+    node_cache.configure()
+    with metrics.recording(), memory_profile.profiling():
+        if cache := SynthCache.from_env():
+            # The fields are read from the environment
+            config = Config()  # type: ignore[call-arg]
+            unchanged = cached_synth(cache, destroy=config.action == Action.DESTROY)
+        else:
+            synth(get_ai_input())
+            unchanged = False
+    if unchanged:
+        sys.exit(EXIT_SKIP)
 
 
 if __name__ == "__main__":
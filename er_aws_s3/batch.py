@@ -0,0 +1,233 @@
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import re
+import sys
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from operator import itemgetter
+from pathlib import Path
+from typing import TextIO
+
+from external_resources_io.exit_status import EXIT_ERROR, EXIT_OK
+from external_resources_io.input import parse_model
+
+from er_aws_s3 import node_cache
+from er_aws_s3.__main__ import synth
+from er_aws_s3.input import AppInterfaceInput
+
+logger = logging.getLogger(__name__)
+
+# Pools the unfinished items are retried over after a crash, before isolating them
+SHARED_POOL_ATTEMPTS = 2
+# Items are synthesized into <outdir>/<name>: no separator, no dot segment
+_NAME = re.compile(r"[A-Za-z0-9][A-Za-z0-9._-]*")
+
+
+@dataclass(frozen=True)
+class BatchItem:
+    """A single raw input of a batch"""
+
+    name: str
+    payload: str
+
+
+@dataclass(frozen=True)
+class BatchResult:
+    """The synthesis outcome of a single batch item"""
+
+    name: str
+    outdir: str
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        """Returns true if the item was synthesized"""
+        return self.error is None
+
+
+def _item_name(payload: str, default: str) -> str:
+    """Names a JSONL item after its bucket identifier, if it is a safe name"""
+    try:
+        name = str(json.loads(payload)["data"]["identifier"])
+    except (ValueError, KeyError, TypeError):
+        return default
+    return name if _NAME.fullmatch(name) else default
+
+
+def _unique(name: str, fallback: str, seen: set[str]) -> str:
+    """Returns name, or fallback suffixed until unique if it is already taken"""
+    if name in seen:
+        name = f"{name}-{fallback}"
+        while name in seen:
+            name += "_"
+    seen.add(name)
+    return name
+
+
+def iter_jsonl(stream: TextIO) -> Iterator[BatchItem]:
+    """Yields one item per non-empty line of a JSONL stream, uniquely named"""
+    seen: set[str] = set()
+    for lineno, line in enumerate(stream, start=1):
+        if payload := line.strip():
+            name = _item_name(payload, f"line-{lineno}")
+            yield BatchItem(name=_unique(name, f"line-{lineno}", seen), payload=payload)
+
+
+def iter_inputs(source: str) -> Iterator[BatchItem]:
+    """Yields the batch items of a directory, a JSONL file or stdin ('-')"""
+    if source == "-":
+        yield from iter_jsonl(sys.stdin)
+        return
+    path = Path(source)
+    if path.is_dir():
+        seen: set[str] = set()
+        for index, file in enumerate(sorted(path.glob("*.json")), start=1):
+            name = file.stem if _NAME.fullmatch(file.stem) else f"file-{index}"
+            yield BatchItem(
+                name=_unique(name, f"file-{index}", seen),
+                payload=file.read_text(encoding="utf-8"),
+            )
+        return
+    with path.open(encoding="utf-8") as stream:
+        yield from iter_jsonl(stream)
+
+
+def synth_item(item: BatchItem, outdir: str) -> BatchResult:
+    """Synthesizes a single item into <outdir>/<name>, isolating any failure"""
+    item_outdir = Path(outdir) / item.name
+    if not _NAME.fullmatch(item.name):
+        return BatchResult(
+            name=item.name, outdir=outdir, error=f"unsafe item name {item.name!r}"
+        )
+    try:
+        item_outdir.mkdir(parents=True, exist_ok=True)
+        ai_input = parse_model(AppInterfaceInput, json.loads(item.payload))
+        synth(ai_input, outdir=str(item_outdir))
+    except Exception as e:
+        logger.exception(f"{item.name}: synthesis failed")
+        return BatchResult(name=item.name, outdir=str(item_outdir), error=repr(e))
+    return BatchResult(name=item.name, outdir=str(item_outdir))
+
+
+def _pool_synth(
+    pending: list[tuple[int, BatchItem]],
+    outdir: str,
+    workers: int,
+    results: list[BatchResult | None],
+) -> list[tuple[int, BatchItem]]:
+    """Synthesizes the pending items over a new pool into results.
+
+    Returns the items left unfinished when a worker crashed: the pool is broken
+    then, failing every outstanding item whichever crashed it.
+    """
+    # The jsii kernel is a child process talking over pipes, it must not be
+    # shared with forked workers.
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=node_cache.configure,
+    ) as pool:
+        futures = {}
+        for index, item in pending:
+            try:
+                futures[pool.submit(synth_item, item, outdir)] = (index, item)
+            except BrokenProcessPool:
+                break
+        submitted = {index for index, _ in futures.values()}
+        unfinished = [p for p in pending if p[0] not in submitted]
+        for future in as_completed(futures):
+            index, item = futures[future]
+            try:
+                results[index] = future.result()
+            except BrokenProcessPool:
+                unfinished.append((index, item))
+            except Exception as e:
+                logger.exception(f"{item.name}: worker failed")
+                results[index] = BatchResult(
+                    name=item.name,
+                    outdir=str(Path(outdir) / item.name),
+                    error=repr(e),
+                )
+    return sorted(unfinished, key=itemgetter(0))
+
+
+def synth_batch(
+    items: Iterable[BatchItem], outdir: str, workers: int = 1
+) -> list[BatchResult]:
+    """Synthesizes all the items, in process or over a pool of worker processes.
+
+    In process, every item shares the jsii kernel started by the cdktf import.
+    Each pool worker boots its own kernel once and keeps it for the items it
+    picks up. Items sharing a name fail instead of overwriting each other.
+    A crashed worker breaks the pool: the unfinished items are retried over a new
+    one, then each over a pool of its own, so only the crashing item fails.
+    """
+    items = list(items)
+    results: list[BatchResult | None] = [None] * len(items)
+    seen: set[str] = set()
+    for index, item in enumerate(items):
+        if item.name in seen:
+            results[index] = BatchResult(
+                name=item.name, outdir=outdir, error=f"duplicate name {item.name!r}"
+            )
+        seen.add(item.name)
+    pending = [(i, item) for i, item in enumerate(items) if results[i] is None]
+    workers = min(workers or os.cpu_count() or 1, len(pending) or 1)
+    if workers == 1:
+        for index, item in pending:
+            results[index] = synth_item(item, outdir)
+        return [r for r in results if r is not None]
+
+    for _ in range(SHARED_POOL_ATTEMPTS):
+        if not pending:
+            break
+        pending = _pool_synth(pending, outdir, workers, results)
+    for index, item in pending:
+        if _pool_synth([(index, item)], outdir, 1, results):
+            logger.error(f"{item.name}: worker crashed")
+            results[index] = BatchResult(
+                name=item.name,
+                outdir=str(Path(outdir) / item.name),
+                error="worker crashed",
+            )
+    return [r for r in results if r is not None]
+
+
+def main() -> None:
+    """Batch entry point: synthesize many inputs in one process"""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument(
+        "source",
+        help="A directory of *.json inputs, a JSONL file or '-' for a JSONL stdin",
+    )
+    parser.add_argument(
+        "--outdir",
+        default=os.environ.get("ER_OUTDIR", "cdktf.out"),
+        help="Every input is synthesized into <outdir>/<name>",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes, 0 for one per CPU core",
+    )
+    args = parser.parse_args()
+
+    # Before the first cdktf import boots the jsii kernel
+    node_cache.configure()
+    logging.basicConfig(level=os.environ.get("LOG_LEVEL", "INFO"))
+    results = synth_batch(iter_inputs(args.source), args.outdir, args.workers)
+    failed = [r for r in results if not r.ok]
+    logger.info(f"synthesized {len(results) - len(failed)}/{len(results)} inputs")
+    for result in failed:
+        logger.error(f"{result.name}: {result.error}")
+    sys.exit(EXIT_ERROR if failed else EXIT_OK)
+
+
+if __name__ == "__main__":
+    main()
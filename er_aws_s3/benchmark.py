@@ -0,0 +1,203 @@
+import argparse
+import json
+import math
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable, Sequence
+from pathlib import Path
+from typing import Any, TypeVar
+
+from er_aws_s3.__main__ import get_ai_input, init_cdktf_app
+from er_aws_s3.cache import package_versions
+from er_aws_s3.fleet import DIMENSIONS, synthetic_input
+from er_aws_s3.input import AppInterfaceInput
+from er_aws_s3.json_stack import JsonStack
+from er_aws_s3.memory_profile import node_memory, node_pids
+
+T = TypeVar("T")
+
+DEFAULT_COUNTS = (1, 10, 100, 1000)
+PHASES = ("get_ai_input", "validate", "stack_init", "synth")
+# Growth exponent above which a builder is reported as superlinear
+SUPERLINEAR_EXPONENT = 1.2
+
+
+def _peak_rss_kb() -> int:
+    """Returns the peak RSS of this process and of its jsii node processes.
+
+    ru_maxrss is the peak over the whole process lifetime, each measurement runs
+    in a process of its own.
+    """
+    node_peak = sum(
+        memory["peak_rss_bytes"]
+        for pid in node_pids()
+        if (memory := node_memory(pid)) is not None
+    )
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss + node_peak // 1024
+
+
+def _timed(func: Callable[[], T]) -> tuple[T, float]:
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def measure(input_data: dict[str, Any], engine: str, workdir: Path) -> dict[str, Any]:
+    """Times every phase of a synthesis of input_data, in seconds"""
+    input_file = workdir / "input.json"
+    input_file.write_text(json.dumps(input_data), encoding="utf-8")
+    outdir = workdir / "out"
+
+    phases: dict[str, float] = {}
+    previous_input_file = os.environ.get("ER_INPUT_FILE")
+    os.environ["ER_INPUT_FILE"] = str(input_file)
+    try:
+        _, phases["get_ai_input"] = _timed(get_ai_input)
+    finally:
+        if previous_input_file is None:
+            del os.environ["ER_INPUT_FILE"]
+        else:
+            os.environ["ER_INPUT_FILE"] = previous_input_file
+    ai_input, phases["validate"] = _timed(
+        lambda: AppInterfaceInput.model_validate(input_data)
+    )
+    if engine == "python":
+        stack, phases["stack_init"] = _timed(lambda: JsonStack("CDKTF", ai_input))
+        _, phases["synth"] = _timed(lambda: stack.synth(outdir))
+    else:
+        app, phases["stack_init"] = _timed(
+            lambda: init_cdktf_app(ai_input, outdir=str(outdir))
+        )
+        _, phases["synth"] = _timed(app.synth)
+    return {"phases": phases, "peak_rss_kb": _peak_rss_kb()}
+
+
+def measure_file(input_file: Path, engine: str) -> dict[str, Any]:
+    """Measures the input of input_file, after a warm-up run of an empty bucket"""
+    input_data = json.loads(input_file.read_text(encoding="utf-8"))
+    with tempfile.TemporaryDirectory() as tmp:
+        # Warm up the provider imports and the jsii kernel outside the measurement
+        measure(synthetic_input({}), engine, Path(tmp))
+        return measure(input_data, engine, Path(tmp))
+
+
+def measure_isolated(
+    input_data: dict[str, Any], engine: str, workdir: Path
+) -> dict[str, Any]:
+    """Measures input_data in a new Python process, so the peak RSS is its own"""
+    input_file = workdir / "measured.json"
+    input_file.write_text(json.dumps(input_data), encoding="utf-8")
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "er_aws_s3.benchmark",
+            "--engine",
+            engine,
+            "--measure",
+            str(input_file),
+        ],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    measurement: dict[str, Any] = json.loads(result.stdout.splitlines()[-1])
+    return measurement
+
+
+def growth_exponent(counts: Sequence[int], seconds: Sequence[float]) -> float | None:
+    """Returns the slope of log(seconds) over log(count) between the extremes"""
+    if len(counts) < 2 or counts[0] == counts[-1] or min(seconds) <= 0:
+        return None
+    return math.log(seconds[-1] / seconds[0]) / math.log(counts[-1] / counts[0])
+
+
+def run(
+    engine: str = "cdktf",
+    counts: Sequence[int] = DEFAULT_COUNTS,
+    dimensions: Sequence[str] = tuple(DIMENSIONS),
+    repeat: int = 1,
+) -> dict[str, Any]:
+    """Benchmarks every dimension scaled over counts, capped at its AWS limit"""
+    results = []
+    scaling = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for dimension in dimensions:
+            dimension_counts = sorted({min(c, DIMENSIONS[dimension]) for c in counts})
+            totals = []
+            for count in dimension_counts:
+                runs = [
+                    measure_isolated(
+                        synthetic_input({dimension: count}), engine, Path(tmp)
+                    )
+                    for _ in range(repeat)
+                ]
+                # Keep the fastest run of every phase, the least noisy one
+                phases = {
+                    phase: min(r["phases"][phase] for r in runs) for phase in PHASES
+                }
+                totals.append(phases["stack_init"] + phases["synth"])
+                results.append({
+                    "dimension": dimension,
+                    "count": count,
+                    "phases": phases,
+                    "peak_rss_kb": max(r["peak_rss_kb"] for r in runs),
+                })
+            exponent = growth_exponent(dimension_counts, totals)
+            scaling[dimension] = {
+                "exponent": exponent,
+                "superlinear": exponent is not None and exponent > SUPERLINEAR_EXPONENT,
+            }
+    return {
+        "engine": engine,
+        "python": platform.python_version(),
+        "versions": package_versions(),
+        "results": results,
+        "scaling": scaling,
+    }
+
+
+def main() -> None:
+    """Benchmark input parsing, Stack construction and synth over synthetic inputs"""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--engine", choices=("cdktf", "python"), default="cdktf")
+    parser.add_argument(
+        "--counts",
+        type=int,
+        nargs="+",
+        default=DEFAULT_COUNTS,
+        help="Number of items of the scaled dimension, capped at the AWS limit",
+    )
+    parser.add_argument(
+        "--dimensions", nargs="+", choices=tuple(DIMENSIONS), default=tuple(DIMENSIONS)
+    )
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument(
+        "--output", type=Path, help="JSON report file, defaults to stdout"
+    )
+    parser.add_argument(
+        "--measure",
+        type=Path,
+        help="Measure a single input file in this process, as a JSON line",
+    )
+    args = parser.parse_args()
+
+    if args.measure:
+        sys.stdout.write(json.dumps(measure_file(args.measure, args.engine)) + "\n")
+        return
+    report = json.dumps(
+        run(args.engine, args.counts, args.dimensions, args.repeat), indent=2
+    )
+    if args.output:
+        args.output.write_text(report, encoding="utf-8")
+    else:
+        sys.stdout.write(report + "\n")
+
+
+if __name__ == "__main__":
+    main()
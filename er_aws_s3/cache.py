@@ -0,0 +1,161 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from collections.abc import Mapping
+from functools import cache
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from er_aws_s3.providers import plugin_cache_signature
+
+if TYPE_CHECKING:
+    from er_aws_s3.input import AppInterfaceInput
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+# Packages whose version changes the synthesized output
+VERSIONED_PACKAGES = ("er-aws-s3", "cdktf", "cdktf-cdktf-provider-aws")
+
+
+@cache
+def package_versions() -> dict[str, str]:
+    """Returns the installed version of every package affecting the synthesis"""
+    versions = {}
+    for package in VERSIONED_PACKAGES:
+        try:
+            versions[package] = version(package)
+        except PackageNotFoundError:
+            versions[package] = "unknown"
+    return versions
+
+
+def synth_settings() -> dict[str, Any]:
+    """Returns the settings, besides the input, shaping the synthesized outdir"""
+    cache_dir = os.environ.get("TF_PLUGIN_CACHE_DIR")
+    return {
+        "engine": os.environ.get("ER_SYNTH_ENGINE", "cdktf"),
+        "plugin_cache_dir": cache_dir,
+        "plugin_cache": plugin_cache_signature(Path(cache_dir)) if cache_dir else [],
+    }
+
+
+def state_id(ai_input: "AppInterfaceInput") -> str:
+    """Returns the terraform state an input is applied to"""
+    provision_data = ai_input.provision.module_provision_data
+    return f"{provision_data.tf_state_bucket}/{provision_data.tf_state_key}"
+
+
+def _tree_size(path: Path) -> int:
+    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+
+
+class SynthCache:
+    """Content-addressed on-disk store of synthesized outdirs with LRU eviction.
+
+    Entries are keyed on the canonicalized input, the package versions and the
+    synth settings. Every entry is a copy of an outdir, its mtime is bumped on
+    each hit and the least recently used entries are evicted once the store
+    exceeds max_bytes.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.entries = directory / "entries"
+        self.last = directory / "last"
+        self.pending = directory / "pending"
+
+    @classmethod
+    def from_env(cls) -> "SynthCache | None":
+        """Returns the cache configured via ER_SYNTH_CACHE_DIR, if any"""
+        if not (directory := os.environ.get("ER_SYNTH_CACHE_DIR")):
+            return None
+        return cls(
+            Path(directory),
+            int(os.environ.get("ER_SYNTH_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES)),
+        )
+
+    @staticmethod
+    def key(input_data: Mapping[str, Any]) -> str:
+        """Returns the cache key of an input under the current synth settings"""
+        canonical = json.dumps(
+            {
+                "input": input_data,
+                "versions": package_versions(),
+                "settings": synth_settings(),
+            },
+            sort_keys=True,
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def restore(self, key: str, outdir: Path) -> bool:
+        """Replaces outdir with a cached entry. Returns false on a cache miss"""
+        entry = self.entries / key
+        if not entry.is_dir():
+            return False
+        # No file of an earlier synth may outlive the restore
+        shutil.rmtree(outdir, ignore_errors=True)
+        shutil.copytree(entry, outdir)
+        entry.touch()
+        return True
+
+    def store(self, key: str, outdir: Path) -> None:
+        """Stores a synthesized outdir and evicts the least recently used entries"""
+        self.entries.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(dir=self.directory))
+        shutil.copytree(outdir, staging, dirs_exist_ok=True)
+        try:
+            staging.replace(self.entries / key)
+        except OSError:
+            # Stored concurrently by another run
+            shutil.rmtree(staging)
+        self.evict()
+
+    def evict(self) -> None:
+        """Removes the least recently used entries until the store fits max_bytes"""
+        entries = sorted(
+            (e for e in self.entries.iterdir() if e.is_dir()),
+            key=lambda e: e.stat().st_mtime,
+            reverse=True,
+        )
+        total = 0
+        for entry in entries:
+            total += _tree_size(entry)
+            if total > self.max_bytes:
+                shutil.rmtree(entry, ignore_errors=True)
+
+    @staticmethod
+    def _state_file(directory: Path, state_id: str) -> Path:
+        return directory / hashlib.sha256(state_id.encode("utf-8")).hexdigest()
+
+    def is_unchanged(self, key: str, state_id: str) -> bool:
+        """Returns true if key is the last one applied to this state"""
+        last_file = self._state_file(self.last, state_id)
+        return last_file.is_file() and last_file.read_text(encoding="utf-8") == key
+
+    def mark_pending(self, key: str, state_id: str) -> None:
+        """Records key as synthesized for this state, not applied yet"""
+        self.pending.mkdir(parents=True, exist_ok=True)
+        self._state_file(self.pending, state_id).write_text(key, encoding="utf-8")
+
+    def mark_applied(self, state_id: str) -> bool:
+        """Records the pending key of this state as the last one applied.
+
+        Call it once the apply succeeded only: a failed apply must not turn the
+        retries of the same input into skips. Returns false without a pending key.
+        """
+        pending_file = self._state_file(self.pending, state_id)
+        if not pending_file.is_file():
+            return False
+        self.last.mkdir(parents=True, exist_ok=True)
+        pending_file.replace(self._state_file(self.last, state_id))
+        return True
+
+    def mark_destroyed(self, state_id: str) -> None:
+        """Forgets the keys of this state, once its resources were destroyed"""
+        self._state_file(self.pending, state_id).unlink(missing_ok=True)
+        self._state_file(self.last, state_id).unlink(missing_ok=True)
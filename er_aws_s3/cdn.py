@@ -0,0 +1,146 @@
+import json
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from er_aws_s3.input import S3WebsiteCdn
+
+ORIGIN_ID = "s3"
+# Blocks the distribution repeats, cdktf needs them as a Terraform JSON override
+LIST_BLOCKS = ("origin", "custom_error_response")
+# S3 answers 403 for missing keys when the reader cannot list the bucket
+_ERROR_CODES = (403, 404)
+
+
+def origin_access_control_attributes(identifier: str) -> dict[str, Any]:
+    """Returns the aws_cloudfront_origin_access_control attributes"""
+    return {
+        "name": identifier,
+        "description": f"CloudFront access to the {identifier} bucket",
+        "origin_access_control_origin_type": "s3",
+        "signing_behavior": "always",
+        "signing_protocol": "sigv4",
+    }
+
+
+def cache_policy_attributes(identifier: str, cdn: "S3WebsiteCdn") -> dict[str, Any]:
+    """Returns the aws_cloudfront_cache_policy attributes, a static site one"""
+    return {
+        "name": f"{identifier}-cache",
+        "min_ttl": cdn.min_ttl,
+        "default_ttl": cdn.default_ttl,
+        "max_ttl": cdn.max_ttl,
+        "parameters_in_cache_key_and_forwarded_to_origin": {
+            "cookies_config": {"cookie_behavior": "none"},
+            "headers_config": {"header_behavior": "none"},
+            "query_strings_config": {"query_string_behavior": "none"},
+            "enable_accept_encoding_brotli": cdn.compress,
+            "enable_accept_encoding_gzip": cdn.compress,
+        },
+    }
+
+
+def distribution_attributes(
+    cdn: "S3WebsiteCdn",
+    website: dict[str, Any],
+    *,
+    domain_name: str,
+    origin_access_control_id: str,
+    cache_policy_id: str,
+) -> dict[str, Any]:
+    """Returns the aws_cloudfront_distribution attributes.
+
+    CloudFront reads the bucket through its REST endpoint, origin access control
+    does not sign requests to the website endpoint: the index and error
+    documents of the website configuration become the default root object and
+    the error responses.
+    """
+    attributes: dict[str, Any] = {
+        "enabled": True,
+        "is_ipv6_enabled": True,
+        "http_version": "http2and3",
+        "price_class": cdn.price_class,
+        "origin": [
+            {
+                "domain_name": domain_name,
+                "origin_id": ORIGIN_ID,
+                "origin_access_control_id": origin_access_control_id,
+            }
+        ],
+        "default_cache_behavior": {
+            "allowed_methods": ["GET", "HEAD"],
+            "cached_methods": ["GET", "HEAD"],
+            "target_origin_id": ORIGIN_ID,
+            "viewer_protocol_policy": "redirect-to-https",
+            "cache_policy_id": cache_policy_id,
+            "compress": cdn.compress,
+        },
+        "restrictions": {"geo_restriction": {"restriction_type": "none"}},
+        "viewer_certificate": {"cloudfront_default_certificate": True},
+    }
+    if suffix := (website.get("index_document") or {}).get("suffix"):
+        attributes["default_root_object"] = suffix
+    if key := (website.get("error_document") or {}).get("key"):
+        attributes["custom_error_response"] = [
+            {
+                "error_code": code,
+                "response_code": 404,
+                "response_page_path": f"/{key}",
+            }
+            for code in _ERROR_CODES
+        ]
+    return attributes
+
+
+def origin_access_statement(bucket_arn: str, distribution_arn: str) -> dict[str, Any]:
+    """Returns the bucket policy statement letting the distribution read objects"""
+    return {
+        "Sid": "AllowCloudFrontServicePrincipalReadOnly",
+        "Effect": "Allow",
+        "Principal": {"Service": "cloudfront.amazonaws.com"},
+        "Action": "s3:GetObject",
+        "Resource": f"{bucket_arn}/*",
+        "Condition": {"StringEquals": {"AWS:SourceArn": distribution_arn}},
+    }
+
+
+def merged_bucket_policy(
+    bucket_policy: str | None, statements: list[dict[str, Any]]
+) -> str | None:
+    """Returns the bucket policy with the statements appended.
+
+    Without statements the input policy is returned untouched.
+    """
+    if not statements:
+        return bucket_policy
+    policy = json.loads(bucket_policy) if bucket_policy else {}
+    policy.setdefault("Version", "2012-10-17")
+    existing = policy.get("Statement", [])
+    if isinstance(existing, dict):
+        existing = [existing]
+    policy["Statement"] = [*existing, *statements]
+    return json.dumps(policy, sort_keys=True)
+
+
+def validate_cdn(cdn: "S3WebsiteCdn", bucket_policy: str | None) -> None:
+    """Checks the CloudFront settings before they reach AWS.
+
+    Raises a ValueError listing every error.
+    """
+    errors = []
+    if not cdn.min_ttl <= cdn.default_ttl <= cdn.max_ttl:
+        errors.append(
+            f"cdn: TTLs must be min_ttl ({cdn.min_ttl}) <= default_ttl "
+            f"({cdn.default_ttl}) <= max_ttl ({cdn.max_ttl})"
+        )
+    if bucket_policy:
+        try:
+            policy = json.loads(bucket_policy)
+        except json.JSONDecodeError as e:
+            errors.append(
+                f"bucket_policy: not JSON, the cdn statement cannot merge: {e}"
+            )
+        else:
+            if not isinstance(policy, dict):
+                errors.append("bucket_policy: not a JSON policy document")
+    if errors:
+        raise ValueError("; ".join(errors))
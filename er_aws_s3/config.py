@@ -0,0 +1,18 @@
+from external_resources_io.config import Config
+from external_resources_io.input import parse_model, read_input_from_file
+from external_resources_io.terraform import create_backend_tf_file, create_tf_vars_json
+
+from er_aws_s3.input import AppInterfaceInput, TerraformModuledata
+
+
+def generate_tf_files() -> None:
+    """Writes the tfvars and the backend of the HCL module, without cdktf nor node"""
+    # The fields are read from the environment
+    config = Config()  # type: ignore[call-arg]
+    ai_input = parse_model(
+        AppInterfaceInput, read_input_from_file(file_path=config.input_file)
+    )
+    if ai_input.data.directory_bucket:
+        raise ValueError("The HCL module does not support directory buckets")
+    create_backend_tf_file(ai_input.provision, config.backend_tf_file)
+    create_tf_vars_json(TerraformModuledata(ai_input=ai_input), config.tf_vars_file)
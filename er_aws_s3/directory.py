@@ -0,0 +1,111 @@
+import re
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from er_aws_s3.input import S3Bucket
+
+NAME_SUFFIX = "--x-s3"
+MAX_NAME_LENGTH = 63
+# Availability Zone IDs start with the region code, e.g. use1-az4 in us-east-1
+_AZ_ID = re.compile(r"(?P<region>[a-z]+[0-9])-az[0-9]+")
+_DIRECTIONS = {
+    "north": "n",
+    "south": "s",
+    "east": "e",
+    "west": "w",
+    "central": "c",
+    "northeast": "ne",
+    "northwest": "nw",
+    "southeast": "se",
+    "southwest": "sw",
+}
+# Directory buckets do not support these lifecycle actions, there are no versions
+_LIFECYCLE_UNSUPPORTED = (
+    "transition",
+    "noncurrent_version_transition",
+    "noncurrent_version_expiration",
+)
+# Opt-in features directory buckets do not support, by input attribute
+_UNSUPPORTED = (
+    "cors_rules",
+    "replication_configurations",
+    "event_notifications",
+    "eventbridge",
+    "s3_bucket_logging",
+    "metrics_configurations",
+    "inventory_configurations",
+    "analytics_configurations",
+    "storage_class",
+    "website",
+    "request_payer",
+    "object_lock_enabled",
+)
+
+
+def directory_bucket_name(identifier: str, availability_zone_id: str) -> str:
+    """Returns the <base-name>--<azid>--x-s3 name of a directory bucket"""
+    return f"{identifier}--{availability_zone_id}{NAME_SUFFIX}"
+
+
+def region_code(region: str) -> str:
+    """Returns the code Availability Zone IDs start with, e.g. use1 for us-east-1"""
+    area, *directions, number = region.split("-")
+    return area + "".join(_DIRECTIONS.get(d, d) for d in directions) + number
+
+
+def zonal_endpoint(availability_zone_id: str, region: str) -> str:
+    """Returns the S3 Express One Zone endpoint of the object operations"""
+    return f"s3express-{availability_zone_id}.{region}.amazonaws.com"
+
+
+def session_policy(bucket_arn: str) -> dict[str, Any]:
+    """Returns the policy of the IAM user, object operations need a session"""
+    return {
+        "Version": "2012-10-17",
+        "Statement": [
+            {
+                "Sid": "CreateSession",
+                "Effect": "Allow",
+                "Action": "s3express:CreateSession",
+                "Resource": bucket_arn,
+            }
+        ],
+    }
+
+
+def validate_directory_bucket(data: "S3Bucket") -> None:
+    """Checks a directory bucket input before it reaches AWS.
+
+    Raises a ValueError listing every error.
+    """
+    if data.directory_bucket is None:
+        return
+    errors = []
+    availability_zone_id = data.directory_bucket.availability_zone_id
+    match = _AZ_ID.fullmatch(availability_zone_id)
+    if not match:
+        errors.append(f"{availability_zone_id}: not an Availability Zone ID")
+    elif match["region"] != region_code(data.region):
+        errors.append(f"{availability_zone_id}: not in {data.region}")
+    name = directory_bucket_name(data.identifier, availability_zone_id)
+    if len(name) > MAX_NAME_LENGTH:
+        errors.append(f"{name}: longer than {MAX_NAME_LENGTH} characters")
+    if "." in data.identifier:
+        errors.append(f"{data.identifier}: directory bucket names have no dots")
+    errors.extend(
+        f"{attribute}: not supported by directory buckets"
+        for attribute in _UNSUPPORTED
+        if getattr(data, attribute)
+    )
+    if data.performance.transfer_acceleration:
+        errors.append("transfer_acceleration: not supported by directory buckets")
+    for rule in data.lifecycle_configuration_rules:
+        unsupported = [key for key in _LIFECYCLE_UNSUPPORTED if rule.get(key)]
+        if (rule.get("expiration") or {}).get("expired_object_delete_marker"):
+            unsupported.append("expired_object_delete_marker")
+        errors.extend(
+            f"{rule['id']}: {key} not supported by directory buckets"
+            for key in unsupported
+        )
+    if errors:
+        raise ValueError("; ".join(errors))
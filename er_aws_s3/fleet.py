@@ -0,0 +1,121 @@
+from collections.abc import Iterator, Mapping
+from typing import Any
+
+from er_aws_s3.lifecycle import MAX_RULES
+
+# AWS limits of the input collections, per bucket. Versioned buckets get an extra
+# lifecycle rule expiring their noncurrent versions.
+MAX_LIFECYCLE_RULES = MAX_RULES - 1
+MAX_EVENT_NOTIFICATIONS = 100
+MAX_REPLICATION_CONFIGURATIONS = 1000
+MAX_CORS_RULES = 100
+MAX_TAGS = 50
+
+DIMENSIONS = {
+    "lifecycle_rules": MAX_LIFECYCLE_RULES,
+    "event_notifications": MAX_EVENT_NOTIFICATIONS,
+    "replication_configurations": MAX_REPLICATION_CONFIGURATIONS,
+    "cors_rules": MAX_CORS_RULES,
+    "tags": MAX_TAGS,
+}
+
+
+def _lifecycle_rules(count: int) -> list[dict[str, Any]]:
+    return [
+        {
+            "id": f"expire-{i}",
+            "enabled": True,
+            "filter": {"prefix": f"expire-{i}/"},
+            "expiration": {"days": 30 + i},
+        }
+        for i in range(count)
+    ]
+
+
+def _event_notifications(count: int) -> list[dict[str, Any]]:
+    return [
+        {
+            "destination_type": "sqs" if i % 2 else "sns",
+            "destination_identifier": (
+                f"arn:aws:sqs:us-east-1:123456789012:queue-{i}"
+                if i % 2
+                else f"arn:aws:sns:us-east-1:123456789012:topic-{i}"
+            ),
+            "event_type": ["s3:ObjectCreated:*"],
+            "filter_prefix": f"events-{i}/",
+            "filter_suffix": ".json",
+        }
+        for i in range(count)
+    ]
+
+
+def _replication_configurations(count: int) -> list[dict[str, Any]]:
+    return [
+        {
+            "rule_name": f"replicate-{i}",
+            "status": "Enabled",
+            "destination_bucket_identifier": f"replica-{i}",
+        }
+        for i in range(count)
+    ]
+
+
+def _cors_rules(count: int) -> list[dict[str, Any]]:
+    return [
+        {
+            "allowed_methods": ["GET", "HEAD"],
+            "allowed_origins": [f"https://origin-{i}.example.com"],
+            "max_age_seconds": 3000,
+        }
+        for i in range(count)
+    ]
+
+
+def synthetic_input(
+    counts: Mapping[str, int], identifier: str = "synthetic-s3"
+) -> dict[str, Any]:
+    """Returns a JSON input with counts items per dimension, capped at AWS limits"""
+    if unknown := set(counts) - set(DIMENSIONS):
+        msg = f"Unknown dimensions: {', '.join(sorted(unknown))}"
+        raise ValueError(msg)
+    sizes = {d: min(counts.get(d, 0), limit) for d, limit in DIMENSIONS.items()}
+    data: dict[str, Any] = {
+        "identifier": identifier,
+        "output_prefix": f"{identifier}-s3",
+        "default_tags": [{"tags": {"app": "synthetic"}}],
+        "tags": {f"tag-{i}": f"value-{i}" for i in range(sizes["tags"])},
+    }
+    if sizes["lifecycle_rules"]:
+        data["lifecycle_rules"] = _lifecycle_rules(sizes["lifecycle_rules"])
+    if sizes["event_notifications"]:
+        data["event_notifications"] = _event_notifications(sizes["event_notifications"])
+    if sizes["replication_configurations"]:
+        data["replication_configurations"] = _replication_configurations(
+            sizes["replication_configurations"]
+        )
+    if sizes["cors_rules"]:
+        data["cors_rules"] = _cors_rules(sizes["cors_rules"])
+    return {
+        "data": data,
+        "provision": {
+            "provision_provider": "aws",
+            "provisioner": "synthetic-account",
+            "provider": "s3",
+            "identifier": identifier,
+            "target_cluster": "synthetic-cluster",
+            "target_namespace": "synthetic-namespace",
+            "target_secret_name": identifier,
+            "module_provision_data": {
+                "tf_state_bucket": "synthetic-terraform-state",
+                "tf_state_region": "us-east-1",
+                "tf_state_dynamodb_table": "synthetic-terraform-lock",
+                "tf_state_key": f"aws/synthetic-account/s3/{identifier}/terraform.tfstate",
+            },
+        },
+    }
+
+
+def synthetic_fleet(size: int, scale: int = 1) -> Iterator[dict[str, Any]]:
+    """Yields size inputs, each with scale items of every dimension"""
+    for i in range(size):
+        yield synthetic_input(dict.fromkeys(DIMENSIONS, scale), f"synthetic-s3-{i}")
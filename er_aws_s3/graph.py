@@ -0,0 +1,186 @@
+import argparse
+import json
+import logging
+import os
+import re
+import sys
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass, field
+from graphlib import TopologicalSorter
+from operator import itemgetter
+from pathlib import Path
+from typing import Any, Literal
+
+from external_resources_io.exit_status import EXIT_ERROR, EXIT_OK
+
+logger = logging.getLogger(__name__)
+
+EdgeKind = Literal["reference", "depends_on"]
+
+_INTERPOLATION = re.compile(r"\$\{([^{}]*)\}")
+_ADDRESS = re.compile(r"(?:data\.)?[a-z][a-z0-9_]*\.[A-Za-z0-9_-]+")
+# Attributes of a block that are not terraform expressions
+_IGNORED_ATTRIBUTES = {"//", "depends_on", "provider"}
+
+
+@dataclass
+class Edge:
+    """A resource waiting for one of its dependencies"""
+
+    resource: str
+    dependency: str
+    reason: str = ""
+
+
+@dataclass
+class GraphReport:
+    """Apply ordering of a synthesized stack"""
+
+    depths: dict[str, int]
+    critical_path: list[str]
+    removable_edges: list[Edge] = field(default_factory=list)
+
+
+def _strings(value: object) -> Iterator[str]:
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, Mapping):
+        for key, item in value.items():
+            if key not in _IGNORED_ATTRIBUTES:
+                yield from _strings(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _strings(item)
+
+
+def iter_blocks(
+    document: Mapping[str, Any],
+) -> Iterator[tuple[str, Mapping[str, Any]]]:
+    """Yields the address and the block of every resource and data source"""
+    for kind, prefix in (("resource", ""), ("data", "data.")):
+        for type_, resources in document.get(kind, {}).items():
+            for name, block in resources.items():
+                yield f"{prefix}{type_}.{name}", block
+
+
+Graph = dict[str, dict[str, set[EdgeKind]]]
+
+
+def dependency_graph(document: Mapping[str, Any]) -> Graph:
+    """Returns the dependencies of every resource of a cdk.tf.json document"""
+    blocks = dict(iter_blocks(document))
+    graph: Graph = {}
+    for address, block in blocks.items():
+        edges: dict[str, set[EdgeKind]] = {
+            dependency: {"depends_on"}
+            for dependency in block.get("depends_on", [])
+            if dependency in blocks
+        }
+        for string in _strings(block):
+            for expression in _INTERPOLATION.findall(string):
+                for reference in _ADDRESS.findall(expression):
+                    if reference in blocks and reference != address:
+                        edges.setdefault(reference, set()).add("reference")
+        graph[address] = edges
+    return graph
+
+
+def _depths(graph: Graph) -> dict[str, int]:
+    """Returns the number of resources on the longest chain ending at each one"""
+    depths: dict[str, int] = {}
+    for address in TopologicalSorter(graph).static_order():
+        depths[address] = 1 + max(
+            (depths[d] for d in graph.get(address, {})), default=0
+        )
+    return depths
+
+
+def _reachable(graph: Graph, start: str, skip: Edge) -> set[str]:
+    """Returns the transitive dependencies of start, ignoring the skip edge"""
+    seen: set[str] = set()
+    stack = [start]
+    while stack:
+        address = stack.pop()
+        for dependency in graph.get(address, {}):
+            if (address, dependency) == (skip.resource, skip.dependency):
+                continue
+            if dependency not in seen:
+                seen.add(dependency)
+                stack.append(dependency)
+    return seen
+
+
+def removable_edges(graph: Graph) -> list[Edge]:
+    """Returns the depends_on edges that can be dropped keeping the apply order"""
+    edges = []
+    for address, dependencies in sorted(graph.items()):
+        for dependency, kinds in sorted(dependencies.items()):
+            if "depends_on" not in kinds:
+                continue
+            edge = Edge(address, dependency)
+            if "reference" in kinds:
+                edge.reason = "the resource already references it"
+            elif dependency in _reachable(graph, address, edge):
+                edge.reason = "implied by the other dependencies"
+            else:
+                continue
+            edges.append(edge)
+    return edges
+
+
+def analyze(document: Mapping[str, Any]) -> GraphReport:
+    """Reports the depths, the critical path and the removable depends_on edges"""
+    graph = dependency_graph(document)
+    depths = _depths(graph)
+    path = []
+    if depths:
+        address = max(sorted(depths), key=depths.__getitem__)
+        while True:
+            path.append(address)
+            dependencies = graph[address]
+            if not dependencies:
+                break
+            address = max(sorted(dependencies), key=depths.__getitem__)
+    return GraphReport(
+        depths=depths,
+        critical_path=path[::-1],
+        removable_edges=removable_edges(graph),
+    )
+
+
+def main() -> None:
+    """Report the apply critical path of a synthesized stack"""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("stack_file", type=Path, help="Path of a cdk.tf.json")
+    parser.add_argument(
+        "--max-critical-path",
+        type=int,
+        default=0,
+        help="Fail when the critical path has more resources, 0 to never fail",
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=os.environ.get("LOG_LEVEL", "INFO"))
+
+    report = analyze(json.loads(args.stack_file.read_text(encoding="utf-8")))
+    for address, depth in sorted(report.depths.items(), key=itemgetter(1, 0)):
+        logger.info("depth %d: %s", depth, address)
+    logger.info(
+        "critical path (%d): %s",
+        len(report.critical_path),
+        " -> ".join(report.critical_path),
+    )
+    for edge in report.removable_edges:
+        logger.warning(
+            "removable depends_on: %s -> %s, %s",
+            edge.resource,
+            edge.dependency,
+            edge.reason,
+        )
+    too_long = 0 < args.max_critical_path < len(report.critical_path)
+    if too_long:
+        logger.error("critical path longer than %d resources", args.max_critical_path)
+    sys.exit(EXIT_ERROR if too_long else EXIT_OK)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 from collections.abc import Sequence
+from functools import cached_property
 from typing import Any, Literal, Self
 
 from external_resources_io.input import AppInterfaceProvision
@@ -11,6 +12,22 @@ from pydantic import (
     model_validator,
 )
 
+from er_aws_s3.cdn import validate_cdn
+from er_aws_s3.directory import (
+    directory_bucket_name,
+    validate_directory_bucket,
+    zonal_endpoint,
+)
+from er_aws_s3.lifecycle import (
+    legacy_configuration_ids,
+    lifecycle_rules,
+    validate_lifecycle_rules,
+)
+from er_aws_s3.monitoring import validate_monitoring_configurations
+from er_aws_s3.notifications import validate_event_notifications
+from er_aws_s3.performance import encryption_rule, validate_performance_profile
+from er_aws_s3.replication import validate_replication_configurations
+
 DEFAULT_S3_SSE_CONFIGURATION = {
     "rule": {"apply_server_side_encryption_by_default": {"sse_algorithm": "AES256"}}
 }
@@ -23,19 +40,26 @@ class S3ReplicationConfiguration(BaseModel):
     status: str
     destination_bucket_identifier: str
     storage_class: str | None = Field(default=None)
+    # Higher wins when filters overlap, defaults to the reversed input order
+    priority: int | None = Field(default=None, ge=0)
+    filter_prefix: str | None = Field(default=None)
+    # Replicates 99.99% of the objects within 15 minutes, enables the metrics
+    replication_time_control: bool = Field(default=False)
+    replication_metrics: bool = Field(default=False)
 
 
 class S3EventNotification(BaseModel):
     """Model class for Event notifications"""
 
-    destination_type: Literal["sns", "sqs"]
+    # EventBridge rules fan out without the overlap limits of the bucket ones
+    destination_type: Literal["sns", "sqs", "lambda", "eventbridge"]
     destination_identifier: str
     event_type: list[str]
     filter_prefix: str
     filter_suffix: str
 
-    @property
-    @computed_field
+    @computed_field  # type: ignore[prop-decorator]
+    @cached_property
     def identifier(self) -> str:
         """Returns the destionation identifier"""
         if self.destination_identifier.startswith("arn:"):
@@ -43,21 +67,127 @@ class S3EventNotification(BaseModel):
         return self.destination_identifier
 
 
+class S3MetricsConfiguration(BaseModel):
+    """Model class for CloudWatch request metrics configurations"""
+
+    name: str
+    filter_prefix: str | None = Field(default=None)
+    filter_tags: dict[str, str] | None = Field(default=None)
+
+
+class S3InventoryConfiguration(BaseModel):
+    """Model class for S3 Inventory reports"""
+
+    name: str
+    destination_bucket_identifier: str
+    destination_prefix: str | None = Field(default=None)
+    format: Literal["CSV", "ORC", "Parquet"] = Field(default="Parquet")
+    frequency: Literal["Daily", "Weekly"] = Field(default="Daily")
+    included_object_versions: Literal["All", "Current"] = Field(default="Current")
+    optional_fields: list[
+        Literal[
+            "Size",
+            "LastModifiedDate",
+            "StorageClass",
+            "ETag",
+            "IsMultipartUploaded",
+            "ReplicationStatus",
+            "EncryptionStatus",
+            "ObjectLockRetainUntilDate",
+            "ObjectLockMode",
+            "ObjectLockLegalHoldStatus",
+            "IntelligentTieringAccessTier",
+            "BucketKeyStatus",
+            "ChecksumAlgorithm",
+            "ObjectAccessControlList",
+            "ObjectOwner",
+        ]
+    ] = Field(default_factory=list)
+    filter_prefix: str | None = Field(default=None)
+    enabled: bool = Field(default=True)
+
+
+class S3AnalyticsConfiguration(BaseModel):
+    """Model class for storage class analysis"""
+
+    name: str
+    filter_prefix: str | None = Field(default=None)
+    filter_tags: dict[str, str] | None = Field(default=None)
+    # Daily CSV export of the analysis, the S3 console only shows it otherwise
+    destination_bucket_identifier: str | None = Field(default=None)
+    destination_prefix: str | None = Field(default=None)
+
+
+class S3PerformanceProfile(BaseModel):
+    """Model class for the bucket performance settings"""
+
+    # Uploads and downloads through the closest CloudFront edge location
+    transfer_acceleration: bool = Field(default=False)
+    # Default of the aws:kms rules that do not set bucket_key_enabled
+    bucket_key_enabled: bool = Field(default=True)
+
+
+class S3DirectoryBucketConfiguration(BaseModel):
+    """Model class for S3 Express One Zone directory buckets"""
+
+    # The zone ID, e.g. use1-az4, not the account specific zone name
+    availability_zone_id: str
+
+
+class S3WebsiteCdn(BaseModel):
+    """Model class for the CloudFront distribution in front of a website bucket"""
+
+    price_class: Literal["PriceClass_All", "PriceClass_200", "PriceClass_100"] = Field(
+        default="PriceClass_All"
+    )
+    min_ttl: int = Field(default=0, ge=0)
+    default_ttl: int = Field(default=3600, ge=0)
+    max_ttl: int = Field(default=86400, ge=0)
+    # Gzip and Brotli, CloudFront compresses what the viewers accept
+    compress: bool = Field(default=True)
+
+
+class S3Website(BaseModel):
+    """Model class for the static website configuration"""
+
+    model_config = ConfigDict(extra="allow")
+    # Served by CloudFront instead of the website endpoint
+    cdn: S3WebsiteCdn | None = Field(default=None, exclude=True)
+
+
 class S3AppInterface(BaseModel):
     """S3 input data from AppInterface. Theses attributes are defined in AppInterface"""
 
     identifier: str = Field(exclude=True)
     allow_object_tagging: bool | None = Field(default=False, exclude=True)
-    bucket_policy: str | None = Field(default=None)
+    bucket_policy: str | None = Field(default=None, exclude=True)
     replication_configurations: list[S3ReplicationConfiguration] | None = Field(
         default=None, exclude=True
     )
     event_notifications: list[S3EventNotification] | None = Field(
         default=None, exclude=True
     )
+    # Send every event to the default EventBridge bus, rules or not
+    eventbridge: bool = Field(default=False, exclude=True)
     s3_bucket_logging: dict[str, Any] | None = Field(default=None, exclude=True)
+    # Single zone, low latency bucket instead of a general purpose one
+    directory_bucket: S3DirectoryBucketConfiguration | None = Field(
+        default=None, exclude=True
+    )
+    performance: S3PerformanceProfile = Field(
+        default_factory=S3PerformanceProfile, exclude=True
+    )
+    metrics_configurations: list[S3MetricsConfiguration] | None = Field(
+        default=None, exclude=True
+    )
+    inventory_configurations: list[S3InventoryConfiguration] | None = Field(
+        default=None, exclude=True
+    )
+    analytics_configurations: list[S3AnalyticsConfiguration] | None = Field(
+        default=None, exclude=True
+    )
     region: str = Field(default="us-east-1", exclude=True)
-    default_tags: Sequence[dict[str, Any]] = Field(default=None, exclude=True)
+    default_tags: Sequence[dict[str, Any]] | None = Field(default=None, exclude=True)
     output_prefix: str = Field(exclude=True)
 
     # Deprecated attributes in aws_s3_bucket
@@ -94,7 +224,7 @@ class S3AppInterface(BaseModel):
         | None
     ) = Field(default=None, exclude=True)
     versioning: bool | dict[str, bool] = Field(default=True, exclude=True)
-    website: dict[str, Any] | None = Field(default=None, exclude=True)
+    website: S3Website | None = Field(default=None, exclude=True)
 
 
 class S3Bucket(S3AppInterface):
@@ -118,6 +248,131 @@ class S3Bucket(S3AppInterface):
         """AppInterface allows lowercase values"""
         return v.upper()
 
+    @field_validator("lifecycle_rules", mode="after")
+    @classmethod
+    def lifecycle_rules_status(
+        cls, v: list[dict[str, Any]] | None
+    ) -> list[dict[str, Any]] | None:
+        """AppInterface sets the rule status with the enabled flag"""
+        if v is None:
+            return None
+        rules = []
+        for rule in v:
+            rule = dict(rule)  # noqa: PLW2901
+            if "enabled" in rule:
+                enabled = str(rule.pop("enabled")).lower() == "true"
+                rule["status"] = "Enabled" if enabled else "Disabled"
+            rules.append(rule)
+        return rules
+
+    @property
+    def bucket_name(self) -> str:
+        """The name of the bucket, directory buckets have a zonal suffix"""
+        if self.directory_bucket is None:
+            return self.identifier
+        return directory_bucket_name(
+            self.identifier, self.directory_bucket.availability_zone_id
+        )
+
+    @property
+    def endpoint(self) -> str:
+        """The endpoint of the object operations, zonal for directory buckets"""
+        if self.directory_bucket is None:
+            return f"s3.{self.region}.amazonaws.com"
+        return zonal_endpoint(self.directory_bucket.availability_zone_id, self.region)
+
+    @property
+    def versioning_enabled(self) -> bool:
+        """Directory buckets have no versioning, whatever the input says"""
+        return bool(self.versioning) and self.directory_bucket is None
+
+    @property
+    def lifecycle_configuration_rules(self) -> list[dict[str, Any]]:
+        """The rules of the single lifecycle configuration of the bucket"""
+        return lifecycle_rules(
+            self.lifecycle_rules,
+            versioning=self.versioning_enabled,
+            storage_class=self.storage_class,
+        )
+
+    @property
+    def legacy_lifecycle_configuration_id(self) -> str | None:
+        """The id of the one-rule configuration the merged one was moved from.
+
+        Earlier versions emitted a configuration per rule, terraform must move
+        the first one instead of deleting it: a deletion drops every rule.
+        """
+        ids = legacy_configuration_ids(
+            self.lifecycle_rules,
+            versioning=self.versioning_enabled,
+            storage_class=self.storage_class,
+        )
+        return ids[0] if ids else None
+
+    @model_validator(mode="after")
+    def valid_directory_bucket(self) -> Self:
+        """Fails on directory bucket settings S3 Express One Zone does not support"""
+        validate_directory_bucket(self)
+        return self
+
+    @property
+    def server_side_encryption_rule(self) -> dict[str, Any]:
+        """The rule of the encryption configuration, Bucket Keys applied"""
+        return encryption_rule(
+            self.server_side_encryption_configuration["rule"], self.performance
+        )
+
+    @model_validator(mode="after")
+    def valid_performance_profile(self) -> Self:
+        """Fails on performance settings the bucket name or region do not allow"""
+        validate_performance_profile(
+            self.performance,
+            self.server_side_encryption_rule,
+            bucket=self.identifier,
+            region=self.region,
+        )
+        return self
+
+    @model_validator(mode="after")
+    def valid_cdn(self) -> Self:
+        """Fails on CloudFront settings AWS would reject at apply time"""
+        if self.website and self.website.cdn:
+            validate_cdn(self.website.cdn, self.bucket_policy)
+        return self
+
+    @model_validator(mode="after")
+    def valid_lifecycle_configuration(self) -> Self:
+        """Fails on lifecycle rules S3 would reject at apply time"""
+        validate_lifecycle_rules(self.lifecycle_configuration_rules)
+        return self
+
+    @model_validator(mode="after")
+    def valid_replication_configurations(self) -> Self:
+        """Fails on replication rules S3 would reject at apply time"""
+        validate_replication_configurations(
+            self.replication_configurations or [],
+            identifier=self.identifier,
+            versioning=self.versioning_enabled,
+        )
+        return self
+
+    @model_validator(mode="after")
+    def valid_event_notifications(self) -> Self:
+        """Fails on overlapping notification filters S3 would reject at apply time"""
+        validate_event_notifications(self.event_notifications or [])
+        return self
+
+    @model_validator(mode="after")
+    def valid_monitoring_configurations(self) -> Self:
+        """Fails on metrics, inventory or analytics S3 would reject at apply time"""
+        validate_monitoring_configurations(
+            self.metrics_configurations or [],
+            self.inventory_configurations or [],
+            self.analytics_configurations or [],
+            identifier=self.identifier,
+        )
+        return self
+
 
 class AppInterfaceInput(BaseModel):
     """The input model class"""
@@ -140,5 +395,20 @@ class TerraformModuledata(BaseModel):
     def server_side_encryption_configuration(
         self,
     ) -> dict[str, Any] | None:
-        """The server_side_encryption_configuration variable"""
-        return self.ai_input.data.server_side_encryption_configuration
+        """The server_side_encryption_configuration variable, the rule block"""
+        return self.ai_input.data.server_side_encryption_rule
+
+    @computed_field
+    def lifecycle_rules(self) -> list[dict[str, Any]]:
+        """The lifecycle_rules variable, the rules of the Stack configuration"""
+        return self.ai_input.data.lifecycle_configuration_rules
+
+    @computed_field
+    def tags(self) -> dict[str, Any]:
+        """The tags variable"""
+        return self.ai_input.data.tags or {}
+
+    @computed_field
+    def region(self) -> str:
+        """The region variable"""
+        return self.ai_input.data.region
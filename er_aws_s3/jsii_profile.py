@@ -0,0 +1,175 @@
+import argparse
+import json
+import os
+import time
+from collections import Counter, defaultdict
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import wraps
+from pathlib import Path
+from typing import Any
+
+from er_aws_s3.fleet import DIMENSIONS, synthetic_input
+from er_aws_s3.input import AppInterfaceInput
+
+# Stack construction outside of the _s3_* steps: providers, backend, data sources
+OTHER_PHASE = "Stack"
+
+
+@dataclass
+class PhaseStats:
+    """Kernel round trips of a phase, by request type"""
+
+    calls: Counter[str] = field(default_factory=Counter)
+    seconds: float = 0.0
+
+    @property
+    def total(self) -> int:
+        """Number of round trips"""
+        return sum(self.calls.values())
+
+
+class KernelProfiler:
+    """Counts and times the jsii kernel round trips, by Stack step.
+
+    Every request sent to the node process is attributed to the innermost
+    Stack._s3_* (or _outputs) step running, callbacks from node included.
+    """
+
+    def __init__(self) -> None:
+        self.phases: defaultdict[str, PhaseStats] = defaultdict(PhaseStats)
+        self._open: list[str] = []
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Attributes the round trips of the enclosed block to name"""
+        self._open.append(name)
+        try:
+            yield
+        finally:
+            self._open.pop()
+
+    def record(self, request: object, seconds: float) -> None:
+        """Records one round trip"""
+        stats = self.phases[self._open[-1] if self._open else OTHER_PHASE]
+        stats.calls[type(request).__name__.removesuffix("Request")] += 1
+        stats.seconds += seconds
+
+    @property
+    def total(self) -> int:
+        """Number of round trips of every phase"""
+        return sum(stats.total for stats in self.phases.values())
+
+    def report(self) -> dict[str, Any]:
+        """Returns the round trips and their time by phase, busiest first"""
+        phases = sorted(self.phases.items(), key=lambda p: -p[1].total)
+        return {
+            "total_calls": self.total,
+            "total_time_ms": sum(s.seconds for _, s in phases) * 1e3,
+            "phases": {
+                name: {
+                    "calls": stats.total,
+                    "time_ms": stats.seconds * 1e3,
+                    "by_request": dict(stats.calls.most_common()),
+                }
+                for name, stats in phases
+            },
+        }
+
+
+def _phased(
+    profiler: KernelProfiler, name: str, method: Callable[..., Any]
+) -> Callable[..., Any]:
+    @wraps(method)
+    def wrapper(*args: object, **kwargs: object) -> object:
+        with profiler.phase(name):
+            return method(*args, **kwargs)
+
+    return wrapper
+
+
+@contextmanager
+def profiling() -> Iterator[KernelProfiler]:
+    """Profiles the kernel round trips of the Stacks built in the enclosed block"""
+    from jsii._kernel.providers.process import _NodeProcess  # noqa: PLC2701
+
+    from er_aws_s3.s3 import Stack
+
+    profiler = KernelProfiler()
+    send = _NodeProcess.send
+
+    def timed_send(self: _NodeProcess, request: Any, response_type: Any) -> Any:  # noqa: ANN401
+        start = time.perf_counter()
+        try:
+            return send(self, request, response_type)
+        finally:
+            profiler.record(request, time.perf_counter() - start)
+
+    steps = {
+        name: method
+        for name, method in vars(Stack).items()
+        if name.startswith("_s3_") or name == "_outputs"
+    }
+    _NodeProcess.send = timed_send  # type: ignore[method-assign]
+    for name, method in steps.items():
+        setattr(Stack, name, _phased(profiler, f"Stack.{name}", method))
+    try:
+        yield profiler
+    finally:
+        _NodeProcess.send = send  # type: ignore[method-assign]
+        for name, method in steps.items():
+            setattr(Stack, name, method)
+
+
+def profile_stacks(inputs: list[AppInterfaceInput]) -> KernelProfiler:
+    """Builds and synthesizes a Stack per input under the profiler"""
+    from cdktf import Testing
+
+    from er_aws_s3.s3 import Stack
+
+    # Load the provider assembly first, its round trips are not the Stack ones
+    Stack(Testing.app(), "warmup", inputs[0])
+    with profiling() as profiler:
+        for i, ai_input in enumerate(inputs):
+            app = Testing.app()
+            Stack(app, f"CDKTF{i}", ai_input)
+            with profiler.phase("App.synth"):
+                app.synth()
+    return profiler
+
+
+def main() -> None:
+    """Count the jsii kernel round trips per synthesized bucket"""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument(
+        "--buckets", type=int, default=10, help="Number of buckets synthesized"
+    )
+    parser.add_argument(
+        "--scale",
+        type=int,
+        default=1,
+        help="Items of every input dimension, e.g. lifecycle rules, per bucket",
+    )
+    parser.add_argument("--output", type=Path, help="Write the JSON report here")
+    args = parser.parse_args()
+    os.environ.setdefault("JSII_SILENCE_WARNING_DEPRECATED_NODE_VERSION", "1")
+
+    profiler = profile_stacks([
+        AppInterfaceInput.model_validate(
+            synthetic_input(dict.fromkeys(DIMENSIONS, args.scale), f"bucket-{i}")
+        )
+        for i in range(args.buckets)
+    ])
+    report = profiler.report()
+    report["buckets"] = args.buckets
+    report["calls_per_bucket"] = profiler.total / args.buckets
+    output = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(output, encoding="utf-8")
+    else:
+        print(output)  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
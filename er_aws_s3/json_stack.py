@@ -0,0 +1,680 @@
+import json
+import re
+from functools import cache
+from importlib.util import find_spec
+from pathlib import Path
+from typing import Any
+
+from er_aws_s3 import metrics
+from er_aws_s3.cdn import (
+    cache_policy_attributes,
+    distribution_attributes,
+    merged_bucket_policy,
+    origin_access_control_attributes,
+    origin_access_statement,
+)
+from er_aws_s3.directory import session_policy
+from er_aws_s3.input import AppInterfaceInput, S3EventNotification
+from er_aws_s3.lifecycle import LIFECYCLE_CONFIGURATION_ID
+from er_aws_s3.monitoring import (
+    analytics_attributes,
+    inventory_attributes,
+    metric_attributes,
+    report_delivery_statement,
+    report_destinations,
+)
+from er_aws_s3.notifications import (
+    eventbridge_event_pattern,
+    is_lambda_arn,
+    lambda_function_id,
+    lambda_permission,
+)
+from er_aws_s3.performance import accelerate_endpoint
+from er_aws_s3.replication import (
+    ASSUME_ROLE_POLICY,
+    replication_policy,
+    replication_role_name,
+    replication_rules,
+)
+
+# Same rule cdktf applies to the id of a construct defined in the stack scope
+_DISALLOWED_ID_CHARS = re.compile(r"[^A-Za-z0-9_-]")
+_PROVIDER_VERSION = re.compile(
+    r"registry\.terraform\.io/providers/hashicorp/aws/([^/]+)/"
+)
+
+
+@cache
+def aws_provider_version() -> str:
+    """Returns the terraform AWS provider version pinned by cdktf_cdktf_provider_aws
+
+    The version is read from the generated provider sources, importing the
+    package would load the whole provider assembly.
+    """
+    spec = find_spec("cdktf_cdktf_provider_aws")
+    if spec is None or spec.origin is None:
+        raise RuntimeError("cdktf_cdktf_provider_aws is not installed")
+    provider = Path(spec.origin).parent / "provider" / "__init__.py"
+    with provider.open(encoding="utf-8") as f:
+        for line in f:
+            if match := _PROVIDER_VERSION.search(line):
+                return match.group(1)
+    raise RuntimeError(f"AWS provider version not found in {provider}")
+
+
+def logical_id(id_: str) -> str:
+    """Returns the terraform name cdktf allocates to a construct id"""
+    return _DISALLOWED_ID_CHARS.sub("", id_)
+
+
+class JsonStack:
+    """Pure-Python twin of er_aws_s3.s3.Stack.
+
+    Builds the same cdk.tf.json document straight from the input model, without
+    cdktf, jsii or node. Every _s3_* step mirrors the Stack one; keep them in sync,
+    tests/test_json_stack.py diffs both engines.
+    """
+
+    def __init__(self, id_: str, app_interface_input: AppInterfaceInput) -> None:
+        self.id = id_
+        self.input = app_interface_input
+        self.document: dict[str, Any] = {}
+        # Addresses of the data sources, by (kind, name)
+        self._data_sources: dict[tuple[str, str], str] = {}
+        self._init_providers()
+        self._run()
+
+    def _resource(
+        self, type_: str, id_: str, *, data: bool = False, **attributes: object
+    ) -> str:
+        """Adds a resource (or data source) and returns its terraform address"""
+        name = logical_id(id_)
+        block = self.document.setdefault("data" if data else "resource", {})
+        resources = block.setdefault(type_, {})
+        if name in resources:
+            raise ValueError(f"There is already a {type_} with name '{name}'")
+        resources[name] = {k: v for k, v in attributes.items() if v is not None}
+        return f"data.{type_}.{name}" if data else f"{type_}.{name}"
+
+    def _data_source(
+        self, type_: str, kind: str, target: str, **attributes: object
+    ) -> str:
+        """Adds a data source once per (kind, name), returns its address"""
+        key = (kind, target)
+        if key not in self._data_sources:
+            self._data_sources[key] = self._resource(
+                type_, f"{target}-{kind}-ds", data=True, **attributes
+            )
+        return self._data_sources[key]
+
+    def _output(self, id_: str, value: object, *, sensitive: bool = False) -> None:
+        output: dict[str, Any] = {"value": value}
+        if sensitive:
+            output["sensitive"] = True
+        self.document.setdefault("output", {})[logical_id(id_)] = output
+
+    def _init_providers(self) -> None:
+        provision_data = self.input.provision.module_provision_data
+        self.document["terraform"] = {
+            "backend": {
+                "s3": {
+                    "bucket": provision_data.tf_state_bucket,
+                    "key": provision_data.tf_state_key,
+                    "encrypt": True,
+                    "region": provision_data.tf_state_region,
+                    "dynamodb_table": provision_data.tf_state_dynamodb_table,
+                    "profile": "external-resources-state",
+                }
+            },
+            "required_providers": {
+                "aws": {"source": "aws", "version": aws_provider_version()}
+            },
+        }
+        provider: dict[str, Any] = {"region": self.input.data.region}
+        if self.input.data.default_tags is not None:
+            provider["default_tags"] = list(self.input.data.default_tags)
+        self.document["provider"] = {"aws": [provider]}
+
+    @metrics.traced
+    def _outputs(self) -> None:
+        self._output(
+            self.input.data.output_prefix + "__bucket",
+            value=self.input.data.bucket_name,
+        )
+        self._output(
+            self.input.data.output_prefix + "__aws_region",
+            value=self.input.data.region,
+        )
+        self._output(
+            self.input.data.output_prefix + "__endpoint",
+            value=self.input.data.endpoint,
+        )
+        if self.input.data.performance.transfer_acceleration:
+            self._output(
+                self.input.data.output_prefix + "__accelerate_endpoint",
+                value=accelerate_endpoint(self.input.data.identifier),
+            )
+
+    @metrics.traced
+    def _s3_bucket_logging(self) -> None:
+        if self.input.data.s3_bucket_logging:
+            target_bucket = self.input.data.s3_bucket_logging["identifier"]
+            if target_bucket == self.input.data.identifier:
+                target_bucket_id = self.bucket_id
+            else:
+                target = self._data_source(
+                    "aws_s3_bucket", "s3", target_bucket, bucket=target_bucket
+                )
+                target_bucket_id = f"${{{target}.id}}"
+            self._resource(
+                "aws_s3_bucket_logging",
+                f"{self.input.data.identifier}-logging",
+                bucket=self.bucket_id,
+                target_bucket=target_bucket_id,
+                target_prefix=self.input.data.s3_bucket_logging.get(
+                    "target_prefix", ""
+                ),
+            )
+
+    @metrics.traced
+    def _s3_bucket_ownership_controls(self) -> str:
+        return self._resource(
+            "aws_s3_bucket_ownership_controls",
+            "bucket_ownership_controls",
+            bucket=self.bucket_id,
+            rule={"object_ownership": "BucketOwnerPreferred"},
+        )
+
+    @metrics.traced
+    def _s3_bucket_acl(self) -> None:
+        self._resource(
+            "aws_s3_bucket_acl",
+            "bucket_acl",
+            bucket=self.bucket_id,
+            acl="private",
+            depends_on=[self.bucket_ownership_controls],
+        )
+
+    @metrics.traced
+    def _s3_server_side_encryption(self) -> None:
+        self._resource(
+            "aws_s3_bucket_server_side_encryption_configuration",
+            "s3ss_enc_conf",
+            bucket=self.bucket_id,
+            rule=[self.input.data.server_side_encryption_rule],
+        )
+
+    @metrics.traced
+    def _s3_transfer_acceleration(self) -> None:
+        if not self.input.data.performance.transfer_acceleration:
+            return
+        self._resource(
+            "aws_s3_bucket_accelerate_configuration",
+            "bucket_accelerate_config",
+            bucket=self.bucket_id,
+            status="Enabled",
+        )
+
+    @metrics.traced
+    def _s3_bucket(self) -> str:
+        return self._resource(
+            "aws_s3_bucket",
+            self.input.data.identifier,
+            **self.input.data.model_dump(exclude_none=True),
+        )
+
+    @metrics.traced
+    def _s3_directory_bucket(self, availability_zone_id: str) -> str:
+        attributes: dict[str, Any] = {
+            "bucket": self.input.data.bucket_name,
+            "location": [
+                {
+                    "name": availability_zone_id,
+                    "type": "AvailabilityZone",
+                }
+            ],
+        }
+        if self.input.data.force_destroy is not None:
+            attributes["force_destroy"] = self.input.data.force_destroy
+        return self._resource(
+            "aws_s3_directory_bucket", self.input.data.identifier, **attributes
+        )
+
+    @metrics.traced
+    def _s3_versioning(self) -> str | None:
+        if not self.input.data.versioning_enabled:
+            return None
+        return self._resource(
+            "aws_s3_bucket_versioning",
+            "bucket_versioning",
+            bucket=self.bucket_id,
+            versioning_configuration={"status": "Enabled"},
+        )
+
+    @metrics.traced
+    def _s3_lifecycle_rules(self) -> None:
+        rules = self.input.data.lifecycle_configuration_rules
+        if not rules:
+            return
+        address = self._resource(
+            "aws_s3_bucket_lifecycle_configuration",
+            LIFECYCLE_CONFIGURATION_ID,
+            bucket=self.bucket_id,
+            rule=rules,
+            depends_on=[self.bucket_versioning] if self.bucket_versioning else None,
+        )
+        if (legacy := self.input.data.legacy_lifecycle_configuration_id) and (
+            logical_id(legacy) != LIFECYCLE_CONFIGURATION_ID
+        ):
+            self.document.setdefault("moved", []).append({
+                "from": f"aws_s3_bucket_lifecycle_configuration.{logical_id(legacy)}",
+                "to": address,
+            })
+
+    @metrics.traced
+    def _s3_cors_rules(self) -> None:
+        if not self.input.data.cors_rules:
+            return
+        self._resource(
+            "aws_s3_bucket_cors_configuration",
+            "bucket_cors_config",
+            bucket=self.bucket_id,
+            cors_rule=self.input.data.cors_rules,
+        )
+
+    def _looked_up_bucket_arn(self, identifier: str) -> str:
+        destination = self._data_source(
+            "aws_s3_bucket", "s3", identifier, bucket=identifier
+        )
+        return f"${{{destination}.arn}}"
+
+    def _destination_bucket_arn(self, identifier: str) -> str:
+        if identifier == self.input.data.identifier:
+            return self.bucket_arn
+        return self._looked_up_bucket_arn(identifier)
+
+    @metrics.traced
+    def _s3_metrics(self) -> None:
+        for config in self.input.data.metrics_configurations or []:
+            self._resource(
+                "aws_s3_bucket_metric",
+                f"{self.input.data.identifier}-metrics-{config.name}",
+                bucket=self.bucket_id,
+                **metric_attributes(config),
+            )
+
+    @metrics.traced
+    def _s3_inventory(self) -> None:
+        for config in self.input.data.inventory_configurations or []:
+            self._resource(
+                "aws_s3_bucket_inventory",
+                f"{self.input.data.identifier}-inventory-{config.name}",
+                bucket=self.bucket_id,
+                **inventory_attributes(
+                    config,
+                    self._destination_bucket_arn(config.destination_bucket_identifier),
+                ),
+            )
+
+    @metrics.traced
+    def _s3_analytics(self) -> None:
+        for config in self.input.data.analytics_configurations or []:
+            destination = config.destination_bucket_identifier
+            self._resource(
+                "aws_s3_bucket_analytics_configuration",
+                f"{self.input.data.identifier}-analytics-{config.name}",
+                bucket=self.bucket_id,
+                **analytics_attributes(
+                    config,
+                    self._destination_bucket_arn(destination) if destination else None,
+                ),
+            )
+
+    @metrics.traced
+    def _s3_replication_configs(self) -> None:
+        configs = self.input.data.replication_configurations
+        if not configs:
+            return
+        identifier = self.input.data.identifier
+        role = self._resource(
+            "aws_iam_role",
+            f"{identifier}_replication_iam_role",
+            name=replication_role_name(identifier),
+            assume_role_policy=json.dumps(ASSUME_ROLE_POLICY, sort_keys=True),
+        )
+        destination_arns = [
+            self._looked_up_bucket_arn(identifier)
+            for identifier in dict.fromkeys(
+                config.destination_bucket_identifier for config in configs
+            )
+        ]
+        policy = self._resource(
+            "aws_iam_policy",
+            f"{identifier}_replication_iam_policy",
+            name=replication_role_name(identifier),
+            policy=json.dumps(
+                replication_policy(self.bucket_arn, destination_arns),
+                sort_keys=True,
+            ),
+        )
+        self._resource(
+            "aws_iam_role_policy_attachment",
+            f"{identifier}_replication_iam_policy_attachment",
+            role=f"${{{role}.name}}",
+            policy_arn=f"${{{policy}.arn}}",
+        )
+        self._resource(
+            "aws_s3_bucket_replication_configuration",
+            "replication_configuration",
+            bucket=self.bucket_id,
+            role=f"${{{role}.arn}}",
+            rule=replication_rules(configs, self._looked_up_bucket_arn),
+            depends_on=[self.bucket_versioning] if self.bucket_versioning else None,
+        )
+
+    def _destination_arn(
+        self, config: S3EventNotification, data_type: str, name_attribute: str = "name"
+    ) -> str:
+        if config.destination_identifier.startswith("arn"):
+            return config.destination_identifier
+        name = config.destination_identifier
+        data_source = self._data_source(
+            data_type, config.destination_type, name, **{name_attribute: name}
+        )
+        return f"${{{data_source}.arn}}"
+
+    def _lambda_function_arn(self, config: S3EventNotification) -> str:
+        return self._destination_arn(config, "aws_lambda_function", "function_name")
+
+    def _lambda_permissions(
+        self, notifications: list[S3EventNotification]
+    ) -> list[str]:
+        identifier = self.input.data.identifier
+        configs = {
+            config.destination_identifier: config
+            for config in notifications
+            if config.destination_type == "lambda"
+        }
+        return [
+            self._resource(
+                "aws_lambda_permission",
+                f"{identifier}-"
+                f"{lambda_function_id(config.destination_identifier)}-s3-permission",
+                **lambda_permission(
+                    self._lambda_function_arn(config),
+                    statement_id=f"s3-{identifier}",
+                    principal="s3.amazonaws.com",
+                    source_arn=self.bucket_arn,
+                ),
+            )
+            for config in configs.values()
+        ]
+
+    def _eventbridge_rules(self, notifications: list[S3EventNotification]) -> None:
+        identifier = self.input.data.identifier
+        configs = [c for c in notifications if c.destination_type == "eventbridge"]
+        for index, config in enumerate(configs):
+            rule = self._resource(
+                "aws_cloudwatch_event_rule",
+                f"{identifier}-events-{index}",
+                description=f"S3 events of {identifier} to {config.identifier}",
+                event_pattern=json.dumps(
+                    eventbridge_event_pattern(self.input.data.bucket_name, config),
+                    sort_keys=True,
+                ),
+            )
+            self._resource(
+                "aws_cloudwatch_event_target",
+                f"{identifier}-events-{index}-target",
+                rule=f"${{{rule}.name}}",
+                arn=config.destination_identifier,
+            )
+            if is_lambda_arn(config.destination_identifier):
+                self._resource(
+                    "aws_lambda_permission",
+                    f"{identifier}-events-{index}-permission",
+                    **lambda_permission(
+                        config.destination_identifier,
+                        statement_id=f"events-{identifier}-{index}",
+                        principal="events.amazonaws.com",
+                        source_arn=f"${{{rule}.arn}}",
+                    ),
+                )
+
+    @metrics.traced
+    def _s3_event_notifications(self) -> None:
+        if not self.input.data.event_notifications and not self.input.data.eventbridge:
+            return
+        notifications = self.input.data.event_notifications or []
+        permissions = self._lambda_permissions(notifications)
+        self._eventbridge_rules(notifications)
+        queues = [
+            {
+                "events": config.event_type,
+                "queue_arn": self._destination_arn(config, "aws_sqs_queue"),
+                "filter_prefix": config.filter_prefix,
+                "filter_suffix": config.filter_suffix,
+            }
+            for config in notifications
+            if config.destination_type == "sqs"
+        ]
+        topics = [
+            {
+                "events": config.event_type,
+                "topic_arn": self._destination_arn(config, "aws_sns_topic"),
+                "filter_prefix": config.filter_prefix,
+                "filter_suffix": config.filter_suffix,
+            }
+            for config in notifications
+            if config.destination_type == "sns"
+        ]
+        functions = [
+            {
+                "events": config.event_type,
+                "lambda_function_arn": self._lambda_function_arn(config),
+                "filter_prefix": config.filter_prefix,
+                "filter_suffix": config.filter_suffix,
+            }
+            for config in notifications
+            if config.destination_type == "lambda"
+        ]
+        eventbridge = self.input.data.eventbridge or any(
+            config.destination_type == "eventbridge" for config in notifications
+        )
+        self._resource(
+            "aws_s3_bucket_notification",
+            f"{self.input.data.identifier}-event-notifications",
+            bucket=self.bucket_id,
+            queue=queues,
+            topic=topics,
+            lambda_function=functions or None,
+            eventbridge=eventbridge or None,
+            depends_on=permissions or None,
+        )
+
+    @metrics.traced
+    def _s3_cdn(self) -> str | None:
+        website = self.input.data.website
+        if not website or not website.cdn:
+            return None
+        identifier = self.input.data.identifier
+        origin_access_control = self._resource(
+            "aws_cloudfront_origin_access_control",
+            f"{identifier}-oac",
+            **origin_access_control_attributes(identifier),
+        )
+        cache_policy = self._resource(
+            "aws_cloudfront_cache_policy",
+            f"{identifier}-cache-policy",
+            **cache_policy_attributes(identifier, website.cdn),
+        )
+        distribution = self._resource(
+            "aws_cloudfront_distribution",
+            f"{identifier}-distribution",
+            **distribution_attributes(
+                website.cdn,
+                website.model_dump(),
+                domain_name=f"${{{self.bucket}.bucket_regional_domain_name}}",
+                origin_access_control_id=f"${{{origin_access_control}.id}}",
+                cache_policy_id=f"${{{cache_policy}.id}}",
+            ),
+        )
+        self._output(
+            self.input.data.output_prefix + "__cloudfront_domain",
+            value=f"${{{distribution}.domain_name}}",
+        )
+        return f"${{{distribution}.arn}}"
+
+    @metrics.traced
+    def _s3_bucket_policy(self) -> None:
+        statements = []
+        if self.distribution_arn:
+            statements.append(
+                origin_access_statement(self.bucket_arn, self.distribution_arn)
+            )
+        if self.input.data.identifier in report_destinations(
+            self.input.data.inventory_configurations or [],
+            self.input.data.analytics_configurations or [],
+        ):
+            caller_identity = self._resource(
+                "aws_caller_identity",
+                f"{self.input.data.identifier}-caller-identity",
+                data=True,
+            )
+            statements.append(
+                report_delivery_statement(
+                    self.bucket_arn, f"${{{caller_identity}.account_id}}"
+                )
+            )
+        policy = merged_bucket_policy(self.input.data.bucket_policy, statements)
+        if not policy:
+            return
+        self._resource(
+            "aws_s3_bucket_policy",
+            f"${self.input.data.identifier}-bucket_policy",
+            bucket=self.bucket_id,
+            policy=policy,
+        )
+
+    def _get_s3_bucket_iam_policy(self) -> str:
+        if self.input.data.directory_bucket:
+            return json.dumps(session_policy(self.bucket_arn), sort_keys=True)
+        action = ["s3:*Object"]
+        if self.input.data.acl == "public-read":
+            action.append("s3:PutObjectAcl")
+        if self.input.data.allow_object_tagging:
+            action.append("s3:*ObjectTagging")
+
+        return json.dumps(
+            {
+                "Version": "2012-10-17",
+                "Statement": [
+                    {
+                        "Sid": "ListObjectsInBucket",
+                        "Effect": "Allow",
+                        "Action": ["s3:ListBucket", "s3:PutBucketCORS"],
+                        "Resource": self.bucket_arn,
+                    },
+                    {
+                        "Sid": "AllObjectActions",
+                        "Effect": "Allow",
+                        "Action": action,
+                        "Resource": f"{self.bucket_arn}/*",
+                    },
+                ],
+            },
+            sort_keys=True,
+        )
+
+    @metrics.traced
+    def _s3_bucket_iam_user(self) -> None:
+        user = self._resource(
+            "aws_iam_user",
+            self.input.data.identifier + "_user",
+            name=self.input.data.identifier,
+        )
+        key = self._resource(
+            "aws_iam_access_key",
+            self.input.data.identifier + "_iam_key",
+            user=f"${{{user}.id}}",
+        )
+        policy = self._resource(
+            "aws_iam_policy",
+            self.input.data.identifier + "iam_policy",
+            policy=self._get_s3_bucket_iam_policy(),
+        )
+        self._resource(
+            "aws_iam_user_policy_attachment",
+            self.input.data.identifier + "iam_policy_attachment",
+            user=f"${{{user}.name}}",
+            policy_arn=f"${{{policy}.arn}}",
+        )
+        self._output(
+            f"${self.input.data.output_prefix}__aws_access_key_id",
+            value=f"${{{key}.id}}",
+            sensitive=True,
+        )
+        self._output(
+            f"${self.input.data.output_prefix}__aws_secret_access_key",
+            value=f"${{{key}.secret}}",
+            sensitive=True,
+        )
+
+    def _run(self) -> None:
+        self.bucket = (
+            self._s3_directory_bucket(directory.availability_zone_id)
+            if (directory := self.input.data.directory_bucket)
+            else self._s3_bucket()
+        )
+        self.bucket_id = f"${{{self.bucket}.id}}"
+        self.bucket_arn = f"${{{self.bucket}.arn}}"
+        # Directory buckets are always owner enforced, without ACLs
+        if not self.input.data.directory_bucket:
+            self.bucket_ownership_controls = self._s3_bucket_ownership_controls()
+            self._s3_bucket_acl()
+        self._s3_bucket_logging()
+        self._s3_server_side_encryption()
+        self._s3_transfer_acceleration()
+        self.bucket_versioning = self._s3_versioning()
+        self._s3_lifecycle_rules()
+        self._s3_cors_rules()
+        self._s3_metrics()
+        self._s3_inventory()
+        self._s3_analytics()
+        self._s3_replication_configs()
+        self._s3_event_notifications()
+        self.distribution_arn = self._s3_cdn()
+        self._s3_bucket_policy()
+        self._s3_bucket_iam_user()
+        self._outputs()
+
+    @metrics.traced
+    def synth(self, outdir: Path) -> Path:
+        """Writes the cdktf outdir layout and returns the path of cdk.tf.json"""
+        stack_dir = outdir / "stacks" / self.id
+        stack_dir.mkdir(parents=True, exist_ok=True)
+        tf_json = stack_dir / "cdk.tf.json"
+        tf_json.write_text(
+            json.dumps(self.document, indent=2, sort_keys=True), encoding="utf-8"
+        )
+        (outdir / "manifest.json").write_text(
+            json.dumps(
+                {
+                    "stacks": {
+                        self.id: {
+                            "annotations": [],
+                            "constructPath": self.id,
+                            "dependencies": [],
+                            "name": self.id,
+                            "synthesizedStackPath": f"stacks/{self.id}/cdk.tf.json",
+                            "workingDirectory": f"stacks/{self.id}",
+                        }
+                    },
+                    "version": "json_stack",
+                },
+                indent=2,
+                sort_keys=True,
+            ),
+            encoding="utf-8",
+        )
+        return tf_json
@@ -0,0 +1,206 @@
+from collections.abc import Iterable, Mapping, Sequence
+from itertools import pairwise
+from typing import Any
+
+# S3 accepts a single lifecycle configuration per bucket, with up to 1000 rules
+MAX_RULES = 1000
+MAX_ID_LENGTH = 255
+# Name of the merged configuration resource
+LIFECYCLE_CONFIGURATION_ID = "lifecycle_configuration"
+
+# Transitions only go down this waterfall
+STORAGE_CLASS_WATERFALL = (
+    "STANDARD_IA",
+    "INTELLIGENT_TIERING",
+    "ONEZONE_IA",
+    "GLACIER_IR",
+    "GLACIER",
+    "DEEP_ARCHIVE",
+)
+# Objects stay at least 30 days in these classes, before and after the transition
+INFREQUENT_ACCESS_STORAGE_CLASSES = {"STANDARD_IA", "ONEZONE_IA"}
+INFREQUENT_ACCESS_MIN_DAYS = 30
+
+NONCURRENT_VERSION_EXPIRATION_RULE = {
+    "id": "expire_noncurrent_versions",
+    "status": "Enabled",
+    "noncurrent_version_expiration": {"noncurrent_days": 30},
+}
+
+
+def storage_class_rule(storage_class: str) -> dict[str, Any]:
+    """Returns the rule moving noncurrent versions to the bucket storage class"""
+    days = 1
+    if storage_class in INFREQUENT_ACCESS_STORAGE_CLASSES:
+        days = INFREQUENT_ACCESS_MIN_DAYS
+    return {
+        "id": f"{storage_class}_storage_class",
+        "status": "Enabled",
+        "noncurrent_version_transition": [
+            {"storage_class": storage_class, "noncurrent_days": days}
+        ],
+    }
+
+
+def legacy_configuration_ids(
+    rules: Sequence[Mapping[str, Any]] | None,
+    *,
+    versioning: bool,
+    storage_class: str | None,
+) -> list[str]:
+    """Returns the ids of the one-rule configurations earlier versions emitted.
+
+    One per user rule, then the noncurrent version expiration and the storage
+    class ones, as lifecycle_rules merges them now.
+    """
+    ids = [str(r["id"]) for r in rules or [] if "id" in r]
+    if versioning and not any(
+        "noncurrent_version_expiration" in r for r in rules or []
+    ):
+        ids.append("noncurrent_version_expiration_lifecycle_rule")
+    if storage_class:
+        ids.append("storage_class_lifecycle_rule")
+    return ids
+
+
+def lifecycle_rules(
+    rules: Sequence[Mapping[str, Any]] | None,
+    *,
+    versioning: bool,
+    storage_class: str | None,
+) -> list[dict[str, Any]]:
+    """Merges the user, versioning and storage class rules, sorted by id.
+
+    Versioned buckets expire their noncurrent versions unless a user rule
+    already does.
+    """
+    merged = [dict(r) for r in rules or []]
+    if versioning and not any("noncurrent_version_expiration" in r for r in merged):
+        merged.append(NONCURRENT_VERSION_EXPIRATION_RULE)
+    if storage_class:
+        merged.append(storage_class_rule(storage_class))
+    return sorted(merged, key=lambda r: str(r.get("id", "")))
+
+
+def _as_list(value: object) -> list[Any]:
+    """Terraform JSON accepts a single block or a list of blocks"""
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return value
+    return [value]
+
+
+def _transition_errors(
+    rule_id: str, transitions: Iterable[Mapping[str, Any]], days_key: str
+) -> tuple[list[str], int]:
+    """Returns the errors of a transition list and its last transition day.
+
+    The last day is 0 without day based transitions, expirations must follow it.
+    """
+    errors = []
+    steps = []
+    for transition in transitions:
+        storage_class = str(transition.get("storage_class", "")).upper()
+        if storage_class not in STORAGE_CLASS_WATERFALL:
+            errors.append(f"{rule_id}: unknown storage class '{storage_class}'")
+            continue
+        if days_key not in transition:
+            # date based transitions are left to AWS
+            continue
+        try:
+            days = int(transition[days_key])
+        except (TypeError, ValueError):
+            errors.append(f"{rule_id}: {days_key} must be an integer")
+            continue
+        if (
+            storage_class in INFREQUENT_ACCESS_STORAGE_CLASSES
+            and days < INFREQUENT_ACCESS_MIN_DAYS
+        ):
+            errors.append(
+                f"{rule_id}: transition to {storage_class} requires "
+                f"{days_key} >= {INFREQUENT_ACCESS_MIN_DAYS}, got {days}"
+            )
+        steps.append((days, storage_class))
+
+    steps.sort()
+    for (days, storage_class), (next_days, next_class) in pairwise(steps):
+        if STORAGE_CLASS_WATERFALL.index(next_class) <= STORAGE_CLASS_WATERFALL.index(
+            storage_class
+        ):
+            errors.append(
+                f"{rule_id}: transition from {storage_class} to {next_class} "
+                "goes up the storage class waterfall"
+            )
+        elif (
+            storage_class in INFREQUENT_ACCESS_STORAGE_CLASSES
+            and next_days - days < INFREQUENT_ACCESS_MIN_DAYS
+        ):
+            errors.append(
+                f"{rule_id}: transition to {next_class} must be at least "
+                f"{INFREQUENT_ACCESS_MIN_DAYS} days after the one to {storage_class}"
+            )
+    return errors, steps[-1][0] if steps else 0
+
+
+def _expiration_errors(
+    rule_id: str, expirations: Iterable[Mapping[str, Any]], days_key: str, after: int
+) -> list[str]:
+    errors = []
+    for expiration in expirations:
+        if days_key not in expiration:
+            continue
+        try:
+            days = int(expiration[days_key])
+        except (TypeError, ValueError):
+            errors.append(f"{rule_id}: {days_key} must be an integer")
+            continue
+        if days <= after:
+            errors.append(
+                f"{rule_id}: expiration {days_key} must be greater than {after}, "
+                f"got {days}"
+            )
+    return errors
+
+
+def validate_lifecycle_rules(rules: Sequence[Mapping[str, Any]]) -> None:
+    """Checks the rules of a lifecycle configuration before they reach AWS.
+
+    Raises a ValueError listing every error.
+    """
+    errors = []
+    if len(rules) > MAX_RULES:
+        errors.append(f"{len(rules)} lifecycle rules, S3 allows at most {MAX_RULES}")
+    seen: set[str] = set()
+    for rule in rules:
+        rule_id = rule.get("id")
+        if not rule_id:
+            errors.append("every lifecycle rule requires an id")
+            continue
+        if rule_id in seen:
+            errors.append(f"{rule_id}: duplicate lifecycle rule id")
+        seen.add(rule_id)
+        if len(rule_id) > MAX_ID_LENGTH:
+            errors.append(f"{rule_id}: id longer than {MAX_ID_LENGTH} characters")
+
+        transition_errors, last_transition = _transition_errors(
+            rule_id, _as_list(rule.get("transition")), "days"
+        )
+        errors += transition_errors
+        errors += _expiration_errors(
+            rule_id, _as_list(rule.get("expiration")), "days", last_transition
+        )
+        transition_errors, last_transition = _transition_errors(
+            rule_id,
+            _as_list(rule.get("noncurrent_version_transition")),
+            "noncurrent_days",
+        )
+        errors += transition_errors
+        errors += _expiration_errors(
+            rule_id,
+            _as_list(rule.get("noncurrent_version_expiration")),
+            "noncurrent_days",
+            last_transition,
+        )
+    if errors:
+        raise ValueError("; ".join(errors))
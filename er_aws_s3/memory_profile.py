@@ -0,0 +1,330 @@
+import argparse
+import json
+import os
+import resource
+import tempfile
+import threading
+import tracemalloc
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from er_aws_s3 import node_cache
+from er_aws_s3.fleet import DIMENSIONS, synthetic_input
+from er_aws_s3.input import AppInterfaceInput
+
+# Interval of the node process sampler
+SAMPLE_INTERVAL = 0.005
+# Allocation sites of a phase kept in the report, largest first
+TOP_ALLOCATIONS = 10
+_KIB = 1024
+
+
+def node_pids() -> list[int]:
+    """Returns the pids of the node processes descending from this one.
+
+    jsii starts a node launcher which runs the kernel in a child process of its
+    own, both are returned.
+    """
+    processes: dict[int, tuple[int, str]] = {}
+    for path in Path("/proc").glob("[0-9]*"):
+        try:
+            stat = (path / "stat").read_text(encoding="utf-8")
+        except OSError:
+            continue
+        # pid (comm) state ppid ..., comm may contain spaces
+        comm = stat[stat.index("(") + 1 : stat.rindex(")")]
+        processes[int(path.name)] = (int(stat.rpartition(")")[2].split()[1]), comm)
+    descendants: list[int] = []
+    parents = {os.getpid()}
+    while parents:
+        children = {pid for pid, (ppid, _) in processes.items() if ppid in parents}
+        descendants.extend(children)
+        parents = children
+    return sorted(pid for pid in descendants if processes[pid][1] == "node")
+
+
+def node_memory(pid: int) -> dict[str, int] | None:
+    """Returns the resident, peak resident and anonymous memory of a process.
+
+    Returns None once the process exited.
+
+    The V8 heap is not reachable through the jsii protocol: the anonymous memory,
+    V8 heap and native allocations without the mapped code, stands for it.
+    """
+    try:
+        status = Path(f"/proc/{pid}/status").read_text(encoding="utf-8")
+    except OSError:
+        return None
+    fields = dict(line.split(":", 1) for line in status.splitlines())
+    return {
+        "rss_bytes": int(fields["VmRSS"].split()[0]) * _KIB,
+        "peak_rss_bytes": int(fields["VmHWM"].split()[0]) * _KIB,
+        "heap_bytes": int(fields["RssAnon"].split()[0]) * _KIB,
+    }
+
+
+@dataclass
+class NodeStats:
+    """Memory of the jsii node processes over a phase"""
+
+    start_rss_bytes: int
+    start_heap_bytes: int
+    rss_bytes: int = 0
+    peak_rss_bytes: int = 0
+    heap_bytes: int = 0
+    peak_heap_bytes: int = 0
+
+    def sample(self, memory: dict[str, int]) -> None:
+        """Records a sample, the last one is the memory at the end of the phase"""
+        self.rss_bytes, self.heap_bytes = memory["rss_bytes"], memory["heap_bytes"]
+        self.peak_rss_bytes = max(self.peak_rss_bytes, self.rss_bytes)
+        self.peak_heap_bytes = max(self.peak_heap_bytes, self.heap_bytes)
+
+
+@dataclass
+class PhaseMemory:
+    """Python and node memory of a phase.
+
+    peak_bytes is the Python heap peak above the start of the phase,
+    retained_bytes what the phase left allocated.
+    """
+
+    peak_bytes: int = 0
+    retained_bytes: int = 0
+    node: NodeStats | None = None
+    top_allocations: list[dict[str, Any]] = field(default_factory=list)
+
+
+class _NodeSampler(threading.Thread):
+    """Samples the node process memory into the open phases"""
+
+    def __init__(self) -> None:
+        super().__init__(name="node-memory-sampler", daemon=True)
+        self.open: list[PhaseMemory] = []
+        self._pids: list[int] = []
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+
+    def _memory(self) -> dict[str, int] | None:
+        samples = [node_memory(pid) for pid in self._pids]
+        if not self._pids or None in samples:
+            # The node processes start with the first jsii import
+            self._pids = node_pids()
+            samples = [node_memory(pid) for pid in self._pids]
+        if not self._pids or None in samples:
+            return None
+        return {
+            key: sum(sample[key] for sample in samples if sample is not None)
+            for key in ("rss_bytes", "heap_bytes")
+        }
+
+    def sample(self) -> None:
+        """Samples the memory of the node processes now"""
+        if (memory := self._memory()) is None:
+            return
+        with self._lock:
+            for phase in self.open:
+                phase.node = phase.node or NodeStats(
+                    start_rss_bytes=memory["rss_bytes"],
+                    start_heap_bytes=memory["heap_bytes"],
+                )
+                phase.node.sample(memory)
+
+    def track(self, phase: PhaseMemory) -> None:
+        """Starts sampling into phase"""
+        with self._lock:
+            self.open.append(phase)
+        self.sample()
+
+    def untrack(self, phase: PhaseMemory) -> None:
+        """Stops sampling into phase, after a last sample"""
+        self.sample()
+        with self._lock:
+            self.open.remove(phase)
+
+    def run(self) -> None:
+        while not self._stopped.wait(SAMPLE_INTERVAL):
+            self.sample()
+
+    def stop(self) -> None:
+        """Stops the sampling"""
+        self._stopped.set()
+        self.join()
+
+
+class MemoryProfiler:
+    """Captures the memory of the synth phases.
+
+    Every phase diffs tracemalloc snapshots taken around it, by allocation site,
+    and the jsii node process is sampled in the background. Phases run one after
+    the other: the Python peak is reset when a phase starts.
+    """
+
+    def __init__(self) -> None:
+        self.phases: dict[str, PhaseMemory] = {}
+        self._sampler = _NodeSampler()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[PhaseMemory]:
+        """Captures the memory of the enclosed block as name"""
+        memory = self.phases[name] = PhaseMemory()
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        start = tracemalloc.get_traced_memory()[0]
+        self._sampler.track(memory)
+        try:
+            yield memory
+        finally:
+            self._sampler.untrack(memory)
+            current, peak = tracemalloc.get_traced_memory()
+            memory.peak_bytes = peak - start
+            memory.retained_bytes = current - start
+            after = tracemalloc.take_snapshot()
+            memory.top_allocations = [
+                {
+                    "site": str(stat.traceback),
+                    "size_bytes": stat.size_diff,
+                    "count": stat.count_diff,
+                }
+                for stat in after.compare_to(before, "lineno")[:TOP_ALLOCATIONS]
+            ]
+
+    def start(self) -> None:
+        """Starts tracing the Python heap and sampling the node process"""
+        tracemalloc.start()
+        self._sampler.start()
+
+    def stop(self) -> None:
+        """Stops tracing and sampling"""
+        self._sampler.stop()
+        tracemalloc.stop()
+
+    def report(self) -> dict[str, Any]:
+        """Returns the memory of every phase and the peak RSS of the process"""
+        return {
+            "max_rss_bytes": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * _KIB,
+            "phases": {name: asdict(memory) for name, memory in self.phases.items()},
+        }
+
+
+_profiler: ContextVar[MemoryProfiler | None] = ContextVar("profiler", default=None)
+
+
+@contextmanager
+def profiling(report_file: str | None = None) -> Iterator[MemoryProfiler | None]:
+    """Profiles the enclosed run into report_file, ER_MEMORY_PROFILE by default.
+
+    Does nothing when no report file is configured.
+    """
+    report_file = report_file or os.environ.get("ER_MEMORY_PROFILE")
+    if not report_file:
+        yield None
+        return
+    profiler = MemoryProfiler()
+    token = _profiler.set(profiler)
+    profiler.start()
+    try:
+        yield profiler
+    finally:
+        profiler.stop()
+        _profiler.reset(token)
+        Path(report_file).write_text(
+            json.dumps(profiler.report(), indent=2), encoding="utf-8"
+        )
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Captures the enclosed block when profiling, a no-op otherwise"""
+    if (profiler := _profiler.get()) is None:
+        yield
+        return
+    with profiler.phase(name):
+        yield
+
+
+def _setenv(name: str, value: str | None) -> None:
+    if value is None:
+        os.environ.pop(name, None)
+    else:
+        os.environ[name] = value
+
+
+@contextmanager
+def _environment(**values: str | None) -> Iterator[None]:
+    """Sets the environment variables of the enclosed block, None unsets them"""
+    previous = {name: os.environ.get(name) for name in values}
+    for name, value in values.items():
+        _setenv(name, value)
+    try:
+        yield
+    finally:
+        for name, value in previous.items():
+            _setenv(name, value)
+
+
+def profile_synth(counts: dict[str, int], report_file: Path) -> dict[str, Any]:
+    """Runs the er-aws-s3 entry point with the cdktf engine under the profiler.
+
+    The entry point profiles itself into ER_MEMORY_PROFILE, this module may be
+    a copy run with -m whose phases it would not see.
+    """
+    from cdktf import Testing
+
+    from er_aws_s3.__main__ import main
+    from er_aws_s3.s3 import Stack
+
+    with tempfile.TemporaryDirectory() as tmp:
+        input_file = Path(tmp) / "input.json"
+        input_data = synthetic_input(counts)
+        input_file.write_text(json.dumps(input_data), encoding="utf-8")
+        # Load the provider modules first, tracemalloc slows their import tenfold
+        warmup = synthetic_input(dict.fromkeys(counts, 1), "warmup")
+        Stack(Testing.app(), "warmup", AppInterfaceInput.model_validate(warmup))
+        with _environment(
+            ER_INPUT_FILE=str(input_file),
+            ER_OUTDIR=str(Path(tmp) / "cdktf.out"),
+            ER_MEMORY_PROFILE=str(report_file),
+            ER_SYNTH_ENGINE="cdktf",
+            ER_SYNTH_CACHE_DIR=None,
+            ER_METRICS_FILE=None,
+        ):
+            main()
+    report: dict[str, Any] = json.loads(report_file.read_text(encoding="utf-8"))
+    return report
+
+
+def main() -> None:
+    """Profile the memory of get_ai_input, Stack.__init__ and App.synth"""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument(
+        "--scale",
+        type=int,
+        default=100,
+        help="Items of every input dimension, capped at the AWS limits",
+    )
+    parser.add_argument(
+        "--output", type=Path, default=Path("memory.json"), help="JSON report"
+    )
+    args = parser.parse_args()
+    os.environ.setdefault("JSII_SILENCE_WARNING_DEPRECATED_NODE_VERSION", "1")
+    os.environ["ER_SYNTH_ENGINE"] = "cdktf"
+    # Before the first cdktf import boots the jsii kernel
+    node_cache.configure()
+
+    report = profile_synth(dict.fromkeys(DIMENSIONS, args.scale), args.output)
+    for name, memory in report["phases"].items():
+        node = memory["node"] or {}
+        print(  # noqa: T201
+            f"{name}: python peak {memory['peak_bytes'] / _KIB**2:.1f} MiB, "
+            f"retained {memory['retained_bytes'] / _KIB**2:.1f} MiB, "
+            f"node rss {node.get('peak_rss_bytes', 0) / _KIB**2:.1f} MiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+import json
+import os
+import resource
+import secrets
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import wraps
+from pathlib import Path
+from typing import Any, ParamSpec, TypeVar
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+SERVICE_NAME = "er-aws-s3"
+
+# int is accepted where float is
+AttributeValue = bool | float | str
+
+
+@dataclass
+class Span:
+    """A timed phase of the synth pipeline"""
+
+    name: str
+    span_id: str
+    parent_span_id: str | None
+    start_time_unix_nano: int
+    end_time_unix_nano: int = 0
+    attributes: dict[str, AttributeValue] = field(default_factory=dict)
+
+
+def _otlp_value(value: AttributeValue) -> dict[str, Any]:
+    match value:
+        case bool():
+            return {"boolValue": value}
+        case int():
+            # OTLP JSON encodes 64 bit integers as strings
+            return {"intValue": str(value)}
+        case float():
+            return {"doubleValue": value}
+        case _:
+            return {"stringValue": value}
+
+
+def _otlp_attributes(
+    attributes: dict[str, AttributeValue],
+) -> list[dict[str, Any]]:
+    return [{"key": k, "value": _otlp_value(v)} for k, v in attributes.items()]
+
+
+class Recorder:
+    """Records nested spans with wall time, CPU time and allocation deltas.
+
+    alloc_blocks is the delta of allocated Python memory blocks. alloc_bytes,
+    the Python heap delta, is only recorded while tracemalloc is tracing, which
+    slows the provider import down tenfold. The memory of the jsii node process
+    is not accounted.
+    """
+
+    def __init__(self) -> None:
+        self.trace_id = secrets.token_hex(16)
+        self.spans: list[Span] = []
+        self._open: list[Span] = []
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[Span]:
+        """Records the enclosed block as a child span of the open one"""
+        span = Span(
+            name=name,
+            span_id=secrets.token_hex(8),
+            parent_span_id=self._open[-1].span_id if self._open else None,
+            start_time_unix_nano=time.time_ns(),
+        )
+        self.spans.append(span)
+        self._open.append(span)
+        wall, cpu = time.perf_counter_ns(), time.process_time_ns()
+        blocks = sys.getallocatedblocks()
+        allocated = tracemalloc.get_traced_memory()[0]
+        try:
+            yield span
+        finally:
+            span.attributes["wall_time_ms"] = (time.perf_counter_ns() - wall) / 1e6
+            span.attributes["cpu_time_ms"] = (time.process_time_ns() - cpu) / 1e6
+            span.attributes["alloc_blocks"] = sys.getallocatedblocks() - blocks
+            if tracemalloc.is_tracing():
+                span.attributes["alloc_bytes"] = (
+                    tracemalloc.get_traced_memory()[0] - allocated
+                )
+            span.end_time_unix_nano = time.time_ns()
+            self._open.pop()
+
+    def to_otlp(self) -> dict[str, Any]:
+        """Returns the spans as an OTLP/JSON ExportTraceServiceRequest"""
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": _otlp_attributes({"service.name": SERVICE_NAME})
+                    },
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": __name__},
+                            "spans": [
+                                {
+                                    "traceId": self.trace_id,
+                                    "spanId": span.span_id,
+                                    "parentSpanId": span.parent_span_id or "",
+                                    "name": span.name,
+                                    "kind": 1,
+                                    "startTimeUnixNano": str(span.start_time_unix_nano),
+                                    "endTimeUnixNano": str(span.end_time_unix_nano),
+                                    "attributes": _otlp_attributes(span.attributes),
+                                }
+                                for span in self.spans
+                            ],
+                        }
+                    ],
+                }
+            ]
+        }
+
+
+_recorder: ContextVar[Recorder | None] = ContextVar("recorder", default=None)
+
+
+@contextmanager
+def recording(metrics_file: str | None = None) -> Iterator[Recorder | None]:
+    """Records the enclosed run into metrics_file, ER_METRICS_FILE by default.
+
+    Does nothing when no metrics file is configured. Set ER_METRICS_TRACEMALLOC
+    to also trace the allocated bytes.
+    """
+    metrics_file = metrics_file or os.environ.get("ER_METRICS_FILE")
+    if not metrics_file:
+        yield None
+        return
+    recorder = Recorder()
+    token = _recorder.set(recorder)
+    # Tracing started by someone else is left running
+    start_tracing = not tracemalloc.is_tracing() and bool(
+        os.environ.get("ER_METRICS_TRACEMALLOC")
+    )
+    if start_tracing:
+        tracemalloc.start()
+    try:
+        with recorder.span(SERVICE_NAME) as root:
+            yield recorder
+            root.attributes["max_rss_kb"] = resource.getrusage(
+                resource.RUSAGE_SELF
+            ).ru_maxrss
+    finally:
+        if start_tracing:
+            tracemalloc.stop()
+        _recorder.reset(token)
+        Path(metrics_file).write_text(
+            json.dumps(recorder.to_otlp(), indent=2), encoding="utf-8"
+        )
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Records the enclosed block when recording, a no-op otherwise"""
+    if (recorder := _recorder.get()) is None:
+        yield
+        return
+    with recorder.span(name):
+        yield
+
+
+def traced(func: Callable[P, T]) -> Callable[P, T]:
+    """Records every call of func as a span named after its qualified name"""
+
+    @wraps(func)
+    def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+        if _recorder.get() is None:
+            return func(*args, **kwargs)
+        with span(func.__qualname__):
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+def record_resources(stack_file: Path) -> None:
+    """Adds the count of resources by type of a cdk.tf.json to the root span"""
+    if (recorder := _recorder.get()) is None or not recorder.spans:
+        return
+    document = json.loads(stack_file.read_text(encoding="utf-8"))
+    counts: Counter[str] = Counter()
+    for kind in ("resource", "data"):
+        for type_, resources in document.get(kind, {}).items():
+            prefix = "data." if kind == "data" else ""
+            counts[f"resources.{prefix}{type_}"] += len(resources)
+    recorder.spans[0].attributes.update(counts)
@@ -0,0 +1,165 @@
+import logging
+import re
+from collections.abc import Sequence
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from er_aws_s3.input import (
+        S3AnalyticsConfiguration,
+        S3InventoryConfiguration,
+        S3MetricsConfiguration,
+    )
+
+logger = logging.getLogger(__name__)
+
+# S3 accepts up to 1000 configurations of each kind per bucket
+MAX_CONFIGURATIONS = 1000
+# Names end up in the terraform resource names, keep them free of stripped chars
+_NAME = re.compile(r"[A-Za-z0-9_-]{1,64}")
+
+
+def _filter(prefix: str | None, tags: dict[str, str] | None = None) -> dict[str, Any]:
+    """Returns the filter block attributes, empty when the whole bucket matches"""
+    filter_: dict[str, Any] = {}
+    if prefix:
+        filter_["prefix"] = prefix
+    if tags:
+        filter_["tags"] = tags
+    return filter_
+
+
+def metric_attributes(config: "S3MetricsConfiguration") -> dict[str, Any]:
+    """Returns the aws_s3_bucket_metric attributes of a configuration"""
+    attributes: dict[str, Any] = {"name": config.name}
+    if filter_ := _filter(config.filter_prefix, config.filter_tags):
+        attributes["filter"] = filter_
+    return attributes
+
+
+def inventory_attributes(
+    config: "S3InventoryConfiguration", destination_arn: str
+) -> dict[str, Any]:
+    """Returns the aws_s3_bucket_inventory attributes of a configuration"""
+    destination: dict[str, Any] = {
+        "bucket_arn": destination_arn,
+        "format": config.format,
+    }
+    if config.destination_prefix:
+        destination["prefix"] = config.destination_prefix
+    attributes: dict[str, Any] = {
+        "name": config.name,
+        "enabled": config.enabled,
+        "included_object_versions": config.included_object_versions,
+        "schedule": {"frequency": config.frequency},
+        "destination": {"bucket": destination},
+    }
+    if config.optional_fields:
+        attributes["optional_fields"] = config.optional_fields
+    if filter_ := _filter(config.filter_prefix):
+        attributes["filter"] = filter_
+    return attributes
+
+
+def analytics_attributes(
+    config: "S3AnalyticsConfiguration", destination_arn: str | None
+) -> dict[str, Any]:
+    """Returns the aws_s3_bucket_analytics_configuration attributes.
+
+    Without a destination the analysis is only visible in the S3 console.
+    """
+    attributes: dict[str, Any] = {"name": config.name}
+    if filter_ := _filter(config.filter_prefix, config.filter_tags):
+        attributes["filter"] = filter_
+    if destination_arn is not None:
+        destination: dict[str, Any] = {"bucket_arn": destination_arn, "format": "CSV"}
+        if config.destination_prefix:
+            destination["prefix"] = config.destination_prefix
+        attributes["storage_class_analysis"] = {
+            "data_export": {
+                "output_schema_version": "V_1",
+                "destination": {"s3_bucket_destination": destination},
+            }
+        }
+    return attributes
+
+
+def report_destinations(
+    inventories: Sequence["S3InventoryConfiguration"],
+    analytics: Sequence["S3AnalyticsConfiguration"],
+) -> set[str]:
+    """Returns the identifiers of the buckets the reports are delivered to"""
+    return {config.destination_bucket_identifier for config in inventories} | {
+        config.destination_bucket_identifier
+        for config in analytics
+        if config.destination_bucket_identifier
+    }
+
+
+def report_delivery_statement(bucket_arn: str, account_id: str) -> dict[str, Any]:
+    """Returns the bucket policy statement letting S3 deliver the reports.
+
+    The bucket is both the source and the destination of its reports.
+    """
+    return {
+        "Sid": "AllowS3InventoryAndAnalyticsReports",
+        "Effect": "Allow",
+        "Principal": {"Service": "s3.amazonaws.com"},
+        "Action": "s3:PutObject",
+        "Resource": f"{bucket_arn}/*",
+        "Condition": {
+            "ArnLike": {"aws:SourceArn": bucket_arn},
+            "StringEquals": {"aws:SourceAccount": account_id},
+        },
+    }
+
+
+def _names(kind: str, names: Sequence[str]) -> list[str]:
+    errors = []
+    if len(names) > MAX_CONFIGURATIONS:
+        errors.append(
+            f"{len(names)} {kind} configurations, S3 allows at most "
+            f"{MAX_CONFIGURATIONS}"
+        )
+    seen: set[str] = set()
+    for name in names:
+        if name in seen:
+            errors.append(f"{name}: duplicate {kind} configuration name")
+        seen.add(name)
+        if not _NAME.fullmatch(name):
+            errors.append(
+                f"{name}: {kind} configuration names are 1 to 64 letters, digits, "
+                "'-' or '_'"
+            )
+    return errors
+
+
+def validate_monitoring_configurations(
+    metrics: Sequence["S3MetricsConfiguration"],
+    inventories: Sequence["S3InventoryConfiguration"],
+    analytics: Sequence["S3AnalyticsConfiguration"],
+    *,
+    identifier: str,
+) -> None:
+    """Checks the metrics, inventory and analytics configurations before AWS does.
+
+    Raises a ValueError listing every error. Other destination buckets are only
+    reported: their policy, managed elsewhere, must let S3 deliver the reports.
+    """
+    errors = [
+        *_names("metrics", [config.name for config in metrics]),
+        *_names("inventory", [config.name for config in inventories]),
+        *_names("analytics", [config.name for config in analytics]),
+    ]
+    errors.extend(
+        f"{config.name}: analytics destination_prefix without a destination bucket"
+        for config in analytics
+        if config.destination_prefix and not config.destination_bucket_identifier
+    )
+    if errors:
+        raise ValueError("; ".join(errors))
+    for destination in sorted(report_destinations(inventories, analytics)):
+        if destination != identifier:
+            logger.warning(
+                f"{destination}: the bucket policy must allow s3:PutObject to "
+                f"s3.amazonaws.com from {identifier}, to deliver its reports"
+            )
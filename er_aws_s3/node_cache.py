@@ -0,0 +1,217 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from importlib.metadata import version
+from importlib.util import find_spec
+from pathlib import Path
+from typing import Any
+
+PROVIDER_ASSEMBLY = "@cdktf/provider-aws"
+PROVIDER_PACKAGE = "cdktf-cdktf-provider-aws"
+# Variables pointing jsii and node at the cache, unset for a cold boot
+CACHE_VARIABLES = (
+    "JSII_RUNTIME",
+    "JSII_RUNTIME_PACKAGE_CACHE_ROOT",
+    "NODE_COMPILE_CACHE",
+)
+
+
+def runtime_entrypoint(root: Path) -> Path:
+    """Returns the jsii runtime extracted under root, one per jsii version"""
+    return root / f"jsii-runtime-{version('jsii')}" / "bin" / "jsii-runtime.js"
+
+
+def extract_runtime(root: Path) -> Path:
+    """Extracts the jsii runtime under root, returns its entrypoint.
+
+    jsii extracts it into a new temporary directory on every boot otherwise,
+    a path the node compile cache never sees twice.
+    """
+    import jsii._embedded.jsii as embedded  # noqa: PLC2701
+
+    entrypoint = runtime_entrypoint(root)
+    runtime = entrypoint.parents[1]
+    for resource, filename in embedded.EMBEDDED_FILES.items():
+        path = runtime / filename
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes((Path(embedded.__file__).parent / resource).read_bytes())
+    return runtime / embedded.EMBEDDED_FILES[embedded.ENTRYPOINT]
+
+
+def cache_environment(root: Path) -> dict[str, str]:
+    """Returns the jsii and node variables of the startup cache under root.
+
+    jsii keeps the extracted assemblies in its package cache, node 22.1+ the
+    compiled code of the modules it loads in its compile cache, older node
+    versions ignore it.
+    """
+    environment = {
+        "JSII_RUNTIME_PACKAGE_CACHE_ROOT": str(root / "packages"),
+        "NODE_COMPILE_CACHE": str(root / "compile"),
+    }
+    if (entrypoint := runtime_entrypoint(root)).is_file():
+        environment["JSII_RUNTIME"] = str(entrypoint)
+    return environment
+
+
+def configure(root: Path | None = None) -> bool:
+    """Points jsii at the startup cache under root, ER_NODE_CACHE_DIR by default.
+
+    Must run before the jsii kernel boots, variables already set are kept.
+    Returns whether the cache is used.
+    """
+    if root is None:
+        if not (cache_dir := os.environ.get("ER_NODE_CACHE_DIR")):
+            return False
+        root = Path(cache_dir)
+    # jsii locks the package cache entries it reads, a read-only cache fails the load
+    if not root.is_dir() or not os.access(root, os.W_OK):
+        return False
+    for name, value in cache_environment(root).items():
+        os.environ.setdefault(name, value)
+    return True
+
+
+def provider_tarball() -> Path:
+    """Returns the AWS provider assembly, without importing its huge package"""
+    spec = find_spec("cdktf_cdktf_provider_aws")
+    if spec is None or spec.origin is None:
+        raise RuntimeError("cdktf_cdktf_provider_aws is not installed")
+    jsii_dir = Path(spec.origin).parent / "_jsii"
+    return jsii_dir / f"provider-aws@{version(PROVIDER_PACKAGE)}.jsii.tgz"
+
+
+def warm(root: Path) -> None:
+    """Fills the startup cache under root by synthesizing a synthetic bucket"""
+    from er_aws_s3.__main__ import init_cdktf_app
+    from er_aws_s3.fleet import DIMENSIONS, synthetic_input
+    from er_aws_s3.input import AppInterfaceInput
+
+    root.mkdir(parents=True, exist_ok=True)
+    extract_runtime(root)
+    configure(root)
+    ai_input = AppInterfaceInput.model_validate(
+        synthetic_input(dict.fromkeys(DIMENSIONS, 1))
+    )
+    with tempfile.TemporaryDirectory() as outdir:
+        init_cdktf_app(ai_input, outdir=outdir).synth()
+
+
+def boot_time() -> dict[str, float]:
+    """Boots the jsii kernel and loads the assemblies, in seconds.
+
+    cdktf is the node start and the cdktf and constructs assemblies, provider
+    the AWS provider assembly. The Python provider modules are not imported.
+    """
+    start = time.perf_counter()
+    import cdktf  # noqa: F401
+    import jsii
+
+    booted = time.perf_counter()
+    jsii.kernel.load(
+        PROVIDER_ASSEMBLY, version(PROVIDER_PACKAGE), str(provider_tarball())
+    )
+    end = time.perf_counter()
+    return {"cdktf": booted - start, "provider": end - booted, "total": end - start}
+
+
+def boot(environment: dict[str, str]) -> dict[str, float]:
+    """Returns the boot_time of a new Python process"""
+    result = subprocess.run(
+        [sys.executable, "-m", "er_aws_s3.node_cache", "boot"],
+        env=environment,
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    times: dict[str, float] = json.loads(result.stdout.splitlines()[-1])
+    return times
+
+
+def _median(boots: list[dict[str, float]]) -> dict[str, float]:
+    return {key: statistics.median(boot[key] for boot in boots) for key in boots[0]}
+
+
+def benchmark(root: Path, repeats: int = 3) -> dict[str, Any]:
+    """Compares the median kernel boot time without and with the cache under root"""
+    environment = {
+        name: value
+        for name, value in os.environ.items()
+        if name not in {*CACHE_VARIABLES, "ER_NODE_CACHE_DIR"}
+    }
+    environment.setdefault("JSII_SILENCE_WARNING_DEPRECATED_NODE_VERSION", "1")
+    cold = {**environment, "JSII_RUNTIME_PACKAGE_CACHE": "disabled"}
+    warm = {**environment, **cache_environment(root)}
+    cold_boots = [boot(cold) for _ in range(repeats)]
+    warm_boots = [boot(warm) for _ in range(repeats)]
+    node = subprocess.run(
+        [os.environ.get("JSII_NODE", "node"), "--version"],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    report: dict[str, Any] = {
+        "node": node.stdout.strip(),
+        "jsii": version("jsii"),
+        "provider": version(PROVIDER_PACKAGE),
+        "repeats": repeats,
+        "cold": _median(cold_boots),
+        "warm": _median(warm_boots),
+    }
+    report["speedup"] = report["cold"]["total"] / report["warm"]["total"]
+    return report
+
+
+def main() -> None:
+    """Build the jsii/node startup cache or benchmark the kernel boot with it"""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("command", choices=("warm", "benchmark", "boot"))
+    parser.add_argument(
+        "--root",
+        type=Path,
+        default=os.environ.get("ER_NODE_CACHE_DIR"),
+        help="Cache directory, ER_NODE_CACHE_DIR by default",
+    )
+    parser.add_argument("--repeats", type=int, default=3, help="Boots per variant")
+    parser.add_argument(
+        "--min-speedup",
+        type=float,
+        help="Fail when the cache speeds the boot up less than this",
+    )
+    parser.add_argument("--output", type=Path, help="Write the JSON report here")
+    args = parser.parse_args()
+
+    if args.command == "boot":
+        print(json.dumps(boot_time()))  # noqa: T201
+        return
+    if args.command == "warm":
+        if args.root is None:
+            parser.error("warm needs --root or ER_NODE_CACHE_DIR")
+        warm(args.root)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = args.root
+        if root is None:
+            root = Path(tmp)
+            subprocess.run(
+                [sys.executable, "-m", "er_aws_s3.node_cache", "warm", "--root", tmp],
+                check=True,
+            )
+        report = benchmark(root, args.repeats)
+    output = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(output, encoding="utf-8")
+    else:
+        print(output)  # noqa: T201
+    if args.min_speedup is not None and report["speedup"] < args.min_speedup:
+        sys.exit(f"speedup {report['speedup']:.2f} below {args.min_speedup}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+from collections import defaultdict
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from er_aws_s3.input import S3EventNotification
+
+# The event types S3 notifies, by wildcard
+EVENT_TYPES = {
+    "s3:ObjectCreated:*": (
+        "s3:ObjectCreated:Put",
+        "s3:ObjectCreated:Post",
+        "s3:ObjectCreated:Copy",
+        "s3:ObjectCreated:CompleteMultipartUpload",
+    ),
+    "s3:ObjectRemoved:*": (
+        "s3:ObjectRemoved:Delete",
+        "s3:ObjectRemoved:DeleteMarkerCreated",
+    ),
+    "s3:ObjectRestore:*": (
+        "s3:ObjectRestore:Post",
+        "s3:ObjectRestore:Completed",
+        "s3:ObjectRestore:Delete",
+    ),
+    "s3:Replication:*": (
+        "s3:Replication:OperationFailedReplication",
+        "s3:Replication:OperationMissedThreshold",
+        "s3:Replication:OperationReplicatedAfterThreshold",
+        "s3:Replication:OperationNotTracked",
+    ),
+    "s3:LifecycleExpiration:*": (
+        "s3:LifecycleExpiration:Delete",
+        "s3:LifecycleExpiration:DeleteMarkerCreated",
+    ),
+    "s3:ObjectTagging:*": ("s3:ObjectTagging:Put", "s3:ObjectTagging:Delete"),
+}
+
+
+# The EventBridge detail type of the S3 events, by event type prefix
+EVENTBRIDGE_DETAIL_TYPES = {
+    "s3:ObjectCreated:": "Object Created",
+    "s3:ObjectRemoved:": "Object Deleted",
+    "s3:LifecycleExpiration:": "Object Deleted",
+    "s3:LifecycleTransition": "Object Storage Class Changed",
+    "s3:IntelligentTiering": "Object Access Tier Changed",
+    "s3:ObjectAcl:Put": "Object ACL Updated",
+    "s3:ObjectRestore:Post": "Object Restore Initiated",
+    "s3:ObjectRestore:Completed": "Object Restore Completed",
+    "s3:ObjectRestore:Delete": "Object Restore Expired",
+    "s3:ObjectTagging:Put": "Object Tags Added",
+    "s3:ObjectTagging:Delete": "Object Tags Deleted",
+}
+
+
+def expand_event_types(event_types: Sequence[str]) -> set[str]:
+    """Returns the event types, wildcards replaced by the events they match"""
+    expanded: set[str] = set()
+    for event_type in event_types:
+        expanded.update(EVENT_TYPES.get(event_type, (event_type,)))
+    return expanded
+
+
+def _collapse(event_types: set[str]) -> list[str]:
+    """Returns the event types, wildcards standing for all the events they match"""
+    collapsed = set(event_types)
+    for wildcard, events in EVENT_TYPES.items():
+        if collapsed.issuperset(events):
+            collapsed = (collapsed - set(events)) | {wildcard}
+    return sorted(collapsed)
+
+
+def _detail_type(event_type: str) -> str | None:
+    return next(
+        (
+            detail_type
+            for prefix, detail_type in EVENTBRIDGE_DETAIL_TYPES.items()
+            if event_type.startswith(prefix)
+        ),
+        None,
+    )
+
+
+def _escape_wildcard(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("*", "\\*")
+
+
+def eventbridge_event_pattern(
+    bucket: str, notification: "S3EventNotification"
+) -> dict[str, Any]:
+    """Returns the EventBridge rule pattern matching the notification events"""
+    detail: dict[str, Any] = {"bucket": {"name": [bucket]}}
+    prefix, suffix = notification.filter_prefix, notification.filter_suffix
+    if prefix and suffix:
+        key = {"wildcard": f"{_escape_wildcard(prefix)}*{_escape_wildcard(suffix)}"}
+        detail["object"] = {"key": [key]}
+    elif prefix or suffix:
+        detail["object"] = {
+            "key": [{"prefix": prefix} if prefix else {"suffix": suffix}]
+        }
+    detail_types = {
+        _detail_type(event_type)
+        for event_type in expand_event_types(notification.event_type)
+    }
+    return {
+        "source": ["aws.s3"],
+        "detail-type": sorted(filter(None, detail_types)),
+        "detail": detail,
+    }
+
+
+def lambda_permission(
+    function: str, *, statement_id: str, principal: str, source_arn: str
+) -> dict[str, Any]:
+    """Returns the aws_lambda_permission attributes letting principal invoke function"""
+    return {
+        "statement_id": statement_id,
+        "action": "lambda:InvokeFunction",
+        "function_name": function,
+        "principal": principal,
+        "source_arn": source_arn,
+    }
+
+
+def lambda_function_id(destination: str) -> str:
+    """Returns the function name of a Lambda destination, with its qualifier if any.
+
+    arn:aws:lambda:<region>:<account>:function:<name>[:<qualifier>] gives
+    <name>[-<qualifier>], any other destination is returned as is.
+    """
+    if not is_lambda_arn(destination):
+        return destination
+    return "-".join(destination.split(":")[6:])
+
+
+def is_lambda_arn(arn: str) -> bool:
+    """Whether the ARN is the one of a Lambda function, qualified or not"""
+    return arn.startswith("arn:") and arn.split(":")[2] == "lambda"
+
+
+@dataclass
+class _Trie:
+    """Character trie of filter prefixes, or of reversed filter suffixes"""
+
+    children: dict[str, "_Trie"] = field(default_factory=dict)
+    indexes: list[int] = field(default_factory=list)
+
+    def insert(self, key: str, index: int) -> None:
+        node = self
+        for char in key:
+            node = node.children.setdefault(char, _Trie())
+        node.indexes.append(index)
+
+    def subtree(self) -> Iterator[int]:
+        """Yields the indexes of the node and of its descendants"""
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield from node.indexes
+            stack.extend(node.children.values())
+
+    def overlapping(self, key: str) -> set[int]:
+        """Returns the indexes whose key is a prefix of key, or key a prefix of it"""
+        found: set[int] = set()
+        node = self
+        for char in key:
+            found.update(node.indexes)
+            if char not in node.children:
+                return found
+            node = node.children[char]
+        found.update(node.subtree())
+        return found
+
+
+@dataclass
+class Conflict:
+    """Two notifications S3 would both send for some objects and events"""
+
+    first: int
+    second: int
+    event_types: list[str]
+
+    def describe(self, notifications: Sequence["S3EventNotification"]) -> str:
+        """Returns the conflict in terms of the input notifications"""
+        first, second = notifications[self.first], notifications[self.second]
+        return (
+            f"event notifications {self.first} ({first.identifier}) and "
+            f"{self.second} ({second.identifier}) overlap on "
+            f"{', '.join(self.event_types)}: prefixes '{first.filter_prefix}' and "
+            f"'{second.filter_prefix}', suffixes '{first.filter_suffix}' and "
+            f"'{second.filter_suffix}'"
+        )
+
+
+def find_conflicts(notifications: Sequence["S3EventNotification"]) -> list[Conflict]:
+    """Returns the pairs of notifications S3 rejects as overlapping.
+
+    Two notifications overlap when they share an event type, one prefix starts
+    the other and one suffix ends the other. Every event type indexes its
+    notifications in a prefix trie and a reversed suffix trie, the overlapping
+    ones are those both tries return, without comparing every pair. EventBridge
+    rules are not part of the bucket configuration, they may overlap.
+    """
+    prefixes: defaultdict[str, _Trie] = defaultdict(_Trie)
+    suffixes: defaultdict[str, _Trie] = defaultdict(_Trie)
+    pairs: defaultdict[tuple[int, int], set[str]] = defaultdict(set)
+    for index, notification in enumerate(notifications):
+        if notification.destination_type == "eventbridge":
+            continue
+        reversed_suffix = notification.filter_suffix[::-1]
+        for event_type in expand_event_types(notification.event_type):
+            overlapping = prefixes[event_type].overlapping(notification.filter_prefix)
+            if overlapping:
+                overlapping &= suffixes[event_type].overlapping(reversed_suffix)
+            for other in overlapping:
+                pairs[other, index].add(event_type)
+            prefixes[event_type].insert(notification.filter_prefix, index)
+            suffixes[event_type].insert(reversed_suffix, index)
+    return [
+        Conflict(first, second, _collapse(event_types))
+        for (first, second), event_types in sorted(pairs.items())
+    ]
+
+
+def validate_event_notifications(
+    notifications: Sequence["S3EventNotification"],
+) -> None:
+    """Checks the notification filters before they reach AWS.
+
+    Raises a ValueError listing every overlapping pair and every EventBridge
+    notification EventBridge cannot deliver.
+    """
+    errors = [
+        conflict.describe(notifications) for conflict in find_conflicts(notifications)
+    ]
+    for index, notification in enumerate(notifications):
+        if notification.destination_type != "eventbridge":
+            continue
+        if not notification.destination_identifier.startswith("arn:"):
+            errors.append(
+                f"event notification {index}: EventBridge targets are ARNs, not "
+                f"{notification.destination_identifier}"
+            )
+        errors.extend(
+            f"event notification {index}: EventBridge does not deliver {event_type}"
+            for event_type in sorted(expand_event_types(notification.event_type))
+            if _detail_type(event_type) is None
+        )
+    if errors:
+        raise ValueError("; ".join(errors))
@@ -0,0 +1,57 @@
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from er_aws_s3.input import S3PerformanceProfile
+
+# Bucket Keys cut the KMS requests of SSE-KMS, DSSE-KMS does not support them
+BUCKET_KEY_ALGORITHMS = ("aws:kms",)
+DSSE_KMS_ALGORITHM = "aws:kms:dsse"
+# Partitions without Transfer Acceleration: China, GovCloud and the ISO regions
+ACCELERATION_UNSUPPORTED_REGIONS = ("cn-", "us-gov-", "us-iso", "eu-isoe-")
+
+
+def accelerate_endpoint(bucket: str) -> str:
+    """Returns the Transfer Acceleration endpoint of a bucket"""
+    return f"{bucket}.s3-accelerate.amazonaws.com"
+
+
+def encryption_rule(
+    rule: dict[str, Any], profile: "S3PerformanceProfile"
+) -> dict[str, Any]:
+    """Returns the encryption rule, Bucket Keys on for aws:kms unless set"""
+    default = rule.get("apply_server_side_encryption_by_default") or {}
+    if (
+        default.get("sse_algorithm") in BUCKET_KEY_ALGORITHMS
+        and "bucket_key_enabled" not in rule
+    ):
+        return {**rule, "bucket_key_enabled": profile.bucket_key_enabled}
+    return rule
+
+
+def validate_performance_profile(
+    profile: "S3PerformanceProfile",
+    rule: dict[str, Any],
+    *,
+    bucket: str,
+    region: str,
+) -> None:
+    """Checks the performance settings before they reach AWS.
+
+    Raises a ValueError listing every error.
+    """
+    errors = []
+    if profile.transfer_acceleration:
+        if "." in bucket:
+            errors.append(
+                f"{bucket}: Transfer Acceleration requires a bucket name without dots"
+            )
+        if region.startswith(ACCELERATION_UNSUPPORTED_REGIONS):
+            errors.append(f"{region}: Transfer Acceleration is not available")
+    algorithm = (rule.get("apply_server_side_encryption_by_default") or {}).get(
+        "sse_algorithm"
+    )
+    bucket_key = str(rule.get("bucket_key_enabled")).lower() == "true"
+    if bucket_key and algorithm == DSSE_KMS_ALGORITHM:
+        errors.append(f"bucket_key_enabled: {algorithm} does not support Bucket Keys")
+    if errors:
+        raise ValueError("; ".join(errors))
@@ -0,0 +1,309 @@
+import json
+import re
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Any
+
+from external_resources_io.terraform import Action, ResourceChange
+from pydantic import BaseModel
+
+CHUNK_SIZE = 1024 * 1024
+
+_STRUCTURAL = re.compile(r'[\[\]{}"]')
+_STRING_END = re.compile(r'["\\]')
+_SCALAR_END = re.compile(r"[\s,\]}]")
+
+
+class JsonStream:
+    """Pull reader over a JSON document, holding one chunk at a time.
+
+    Values are either skipped, never materializing them, or read one at a
+    time, so memory is bounded by the largest value read.
+    """
+
+    def __init__(self, stream: IO[str], chunk_size: int = CHUNK_SIZE) -> None:
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+
+    def _fill(self) -> bool:
+        """Replaces the consumed buffer with the next chunk, false at EOF"""
+        chunk = self.stream.read(self.chunk_size)
+        self.buffer = self.buffer[self.pos :] + chunk
+        self.pos = 0
+        return bool(chunk)
+
+    def peek(self) -> str:
+        """Returns the next non-whitespace character without consuming it"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos].isspace():
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                raise ValueError("Unexpected end of JSON document")
+
+    def expect(self, char: str) -> None:
+        """Consumes the next non-whitespace character, which must be char"""
+        if (found := self.peek()) != char:
+            raise ValueError(f"Expected '{char}', found '{found}'")
+        self.pos += 1
+
+    def _scan_scalar(self, *, keep: bool) -> str:
+        """Consumes a number, true, false or null"""
+        parts = []
+        start = self.pos
+        while not (match := _SCALAR_END.search(self.buffer, self.pos)):
+            if keep:
+                parts.append(self.buffer[start:])
+            self.pos = len(self.buffer)
+            start = 0
+            if not self._fill():
+                return "".join(parts)
+        self.pos = match.start()
+        if keep:
+            parts.append(self.buffer[start : self.pos])
+        return "".join(parts)
+
+    def _next_chunk(self, parts: list[str], start: int, *, keep: bool) -> None:
+        """Moves on to the next chunk, keeping the scanned text of the current one"""
+        if keep:
+            parts.append(self.buffer[start : self.pos])
+        if not self._fill():
+            raise ValueError("Unexpected end of JSON document")
+
+    def _scan(self, *, keep: bool) -> str:
+        """Consumes the next value, returning its text when keep is true"""
+        if self.peek() not in '[{"':
+            return self._scan_scalar(keep=keep)
+        parts = []
+        start = self.pos
+        depth = 0
+        in_string = False
+        while True:
+            pattern = _STRING_END if in_string else _STRUCTURAL
+            match = pattern.search(self.buffer, self.pos)
+            if match is None:
+                self.pos = len(self.buffer)
+            elif match.group() != "\\" or match.end() < len(self.buffer):
+                self.pos = match.end()
+                if match.group() == "\\":
+                    # Skip the escaped character
+                    self.pos += 1
+                elif match.group() == '"':
+                    in_string = not in_string
+                else:
+                    depth += 1 if match.group() in "[{" else -1
+                if depth == 0 and not in_string:
+                    if keep:
+                        parts.append(self.buffer[start : self.pos])
+                    return "".join(parts)
+                continue
+            # Out of buffer, or a backslash escaping the first character of the next
+            # chunk, left unconsumed
+            self._next_chunk(parts, start, keep=keep)
+            start = 0
+
+    def skip(self) -> None:
+        """Consumes the next value without building it"""
+        self._scan(keep=False)
+
+    def read(self) -> Any:  # noqa: ANN401
+        """Consumes and returns the next value"""
+        return json.loads(self._scan(keep=True))
+
+    def items(self) -> Iterator[str]:
+        """Yields the keys of the next object, the caller consumes every value"""
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.read()
+            self.expect(":")
+            yield key
+            if self.peek() == ",":
+                self.pos += 1
+                continue
+            self.expect("}")
+            return
+
+    def elements(self) -> Iterator[None]:
+        """Iterates over the next array, the caller consumes every element"""
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield
+            if self.peek() == ",":
+                self.pos += 1
+                continue
+            self.expect("]")
+            return
+
+
+def iter_resource_changes(stream: IO[str]) -> Iterator[ResourceChange]:
+    """Yields the resource changes of a `terraform show -json` plan, one at a time"""
+    reader = JsonStream(stream)
+    for key in reader.items():
+        if key != "resource_changes":
+            reader.skip()
+            continue
+        for _ in reader.elements():
+            yield ResourceChange.model_validate(reader.read())
+
+
+class Finding(BaseModel):
+    """A destructive or risky change of the plan"""
+
+    address: str
+    type: str
+    reason: str
+    actions: list[str]
+
+
+class Verdict(BaseModel):
+    """Outcome of the plan analysis.
+
+    Findings are destructive and fail the plan, warnings are expected changes
+    worth a look, e.g. an access key rotation.
+    """
+
+    destructive: bool
+    resource_changes: int
+    findings: list[Finding]
+    warnings: list[Finding] = []
+
+
+def _first(value: object) -> dict[str, Any]:
+    """Terraform JSON nests single blocks in lists"""
+    if isinstance(value, list):
+        value = value[0] if value else {}
+    return value if isinstance(value, dict) else {}
+
+
+@dataclass(frozen=True)
+class _Delta:
+    """The values of a resource change the checks look at"""
+
+    before: dict[str, Any]
+    after: dict[str, Any]
+    deleted: bool
+    replaced: bool
+
+
+def _bucket_reasons(delta: _Delta, *, destroy: bool) -> list[str]:
+    reasons = []
+    if delta.replaced:
+        reasons.append("bucket replacement, its objects are lost")
+    elif delta.deleted and not destroy:
+        reasons.append("bucket deletion")
+    if not delta.before.get("force_destroy") and delta.after.get("force_destroy"):
+        reasons.append("force_destroy enabled, deleting the bucket empties it")
+    return reasons
+
+
+def _versioning_reasons(delta: _Delta, *, destroy: bool) -> list[str]:
+    # Deleting the versioning resource suspends the bucket versioning
+    before = _first(delta.before.get("versioning_configuration"))
+    if before.get("status") != "Enabled":
+        return []
+    if delta.deleted and not delta.replaced:
+        return [] if destroy else ["versioning disabled"]
+    after = _first(delta.after.get("versioning_configuration"))
+    if after.get("status") != "Enabled":
+        return ["versioning disabled"]
+    return []
+
+
+def _access_key_reasons(delta: _Delta, *, destroy: bool) -> list[str]:
+    if delta.replaced or (delta.deleted and not destroy):
+        return ["IAM access key rotation, the current key stops working"]
+    return []
+
+
+_CHECKS = {
+    "aws_s3_bucket": _bucket_reasons,
+    "aws_s3_directory_bucket": _bucket_reasons,
+    "aws_s3_bucket_versioning": _versioning_reasons,
+}
+# Expected changes, reported without failing the plan
+_WARNINGS = {
+    "aws_iam_access_key": _access_key_reasons,
+}
+
+
+def _delta(change: ResourceChange) -> _Delta | None:
+    if not change.change:
+        return None
+    actions = set(change.change.actions)
+    deleted = Action.ActionDelete in actions
+    return _Delta(
+        before=_first(change.change.before),
+        after=_first(change.change.after),
+        deleted=deleted,
+        replaced=deleted and Action.ActionCreate in actions,
+    )
+
+
+def _findings(change: ResourceChange, reasons: list[str]) -> list[Finding]:
+    actions = [a.value for a in change.change.actions] if change.change else []
+    return [
+        Finding(
+            address=change.address or f"{change.type}.{change.name}",
+            type=change.type,
+            reason=reason,
+            actions=actions,
+        )
+        for reason in reasons
+    ]
+
+
+LIFECYCLE_DELETION = (
+    "lifecycle configuration deletion drops the rules of the kept one, "
+    "run terraform state rm on it first"
+)
+
+
+def analyze(stream: IO[str], *, destroy: bool = False) -> Verdict:
+    """Flags the destructive S3 changes of a streamed plan.
+
+    Deletions are expected, hence not flagged, when destroying.
+    """
+    findings: list[Finding] = []
+    warnings: list[Finding] = []
+    # S3 keeps one lifecycle configuration per bucket, deleting any drops it
+    deleted_lifecycles: list[ResourceChange] = []
+    kept_lifecycle = False
+    count = 0
+    for change in iter_resource_changes(stream):
+        count += 1
+        if (delta := _delta(change)) is None:
+            continue
+        if check := _CHECKS.get(change.type):
+            findings += _findings(change, check(delta, destroy=destroy))
+        if warn := _WARNINGS.get(change.type):
+            warnings += _findings(change, warn(delta, destroy=destroy))
+        if change.type == "aws_s3_bucket_lifecycle_configuration":
+            if delta.deleted and not delta.replaced:
+                deleted_lifecycles.append(change)
+            else:
+                kept_lifecycle = True
+    if kept_lifecycle and not destroy:
+        for change in deleted_lifecycles:
+            findings += _findings(change, [LIFECYCLE_DELETION])
+    return Verdict(
+        destructive=bool(findings),
+        resource_changes=count,
+        findings=findings,
+        warnings=warnings,
+    )
+
+
+def analyze_file(plan_file: Path, *, destroy: bool = False) -> Verdict:
+    """Flags the destructive S3 changes of a plan file"""
+    with plan_file.open(encoding="utf-8") as stream:
+        return analyze(stream, destroy=destroy)
@@ -0,0 +1,140 @@
+import base64
+import hashlib
+import logging
+import os
+from functools import cache
+from pathlib import Path
+
+from er_aws_s3.json_stack import aws_provider_version
+
+logger = logging.getLogger(__name__)
+
+PROVIDER_SOURCE = "registry.terraform.io/hashicorp/aws"
+LOCK_FILE = ".terraform.lock.hcl"
+CLI_CONFIG_FILE = "terraform.rc"
+
+
+def provider_dir(cache_dir: Path, version: str) -> Path:
+    """Returns the directory of a provider version in an unpacked plugin cache"""
+    return cache_dir.joinpath(*PROVIDER_SOURCE.split("/"), version)
+
+
+@cache
+def _package_hash(
+    package_dir: Path, signature: tuple[tuple[str, int, int], ...]
+) -> str:
+    """Memoized on the name, size and mtime of every file of the package"""
+    summary = hashlib.sha256()
+    for name, _, _ in signature:
+        digest = hashlib.sha256()
+        with (package_dir / name).open("rb") as f:
+            while chunk := f.read(1024 * 1024):
+                digest.update(chunk)
+        summary.update(f"{digest.hexdigest()}  {name}\n".encode())
+    return "h1:" + base64.b64encode(summary.digest()).decode()
+
+
+def package_hash(package_dir: Path) -> str:
+    """Returns the h1 hash terraform computes for an unpacked provider package.
+
+    That is the Go dirhash Hash1: the SHA-256 of the sorted "<sha256>  <name>"
+    lines of every file of the package.
+    """
+    files = sorted(
+        (path.relative_to(package_dir).as_posix(), path)
+        for path in package_dir.rglob("*")
+        if path.is_file()
+    )
+    signature = tuple(
+        (name, path.stat().st_size, path.stat().st_mtime_ns) for name, path in files
+    )
+    return _package_hash(package_dir, signature)
+
+
+def provider_hashes(cache_dir: Path, version: str) -> list[str]:
+    """Returns the h1 hash of every platform package of the cached version"""
+    version_dir = provider_dir(cache_dir, version)
+    if not version_dir.is_dir():
+        return []
+    return sorted(
+        package_hash(platform_dir)
+        for platform_dir in version_dir.iterdir()
+        if platform_dir.is_dir()
+    )
+
+
+def plugin_cache_signature(cache_dir: Path) -> list[tuple[str, int, int]]:
+    """Returns the name, size and mtime of every cached file of the pinned version.
+
+    The offline config synth writes depends on them only, without hashing the
+    provider binaries.
+    """
+    version_dir = provider_dir(cache_dir, aws_provider_version())
+    if not version_dir.is_dir():
+        return []
+    return sorted(
+        (path.relative_to(version_dir).as_posix(), stat.st_size, stat.st_mtime_ns)
+        for path in version_dir.rglob("*")
+        if path.is_file() and (stat := path.stat())
+    )
+
+
+def lock_file(version: str, hashes: list[str]) -> str:
+    """Returns a .terraform.lock.hcl pinning the AWS provider to version"""
+    lines = [
+        '# This file is maintained automatically by "terraform init".',
+        "# Manual edits may be lost in future updates.",
+        "",
+        f'provider "{PROVIDER_SOURCE}" {{',
+        f'  version     = "{version}"',
+        f'  constraints = "{version}"',
+        "  hashes = [",
+        *(f'    "{h}",' for h in hashes),
+        "  ]",
+        "}",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def cli_config(cache_dir: Path) -> str:
+    """Returns a terraform CLI config installing the AWS provider from cache_dir.
+
+    The directory is a filesystem mirror, terraform forbids also using it as its
+    plugin cache: run init without TF_PLUGIN_CACHE_DIR.
+    """
+    return f"""\
+provider_installation {{
+  filesystem_mirror {{
+    path    = "{cache_dir}"
+    include = ["{PROVIDER_SOURCE}"]
+  }}
+  direct {{
+    exclude = ["{PROVIDER_SOURCE}"]
+  }}
+}}
+"""
+
+
+def write_offline_config(
+    outdir: Path, stack_dir: Path, cache_dir: Path | None = None
+) -> bool:
+    """Writes the provider lock into stack_dir and the CLI config into outdir.
+
+    Point TF_CLI_CONFIG_FILE to the CLI config and terraform init installs the
+    provider from the plugin cache, TF_PLUGIN_CACHE_DIR by default, without any
+    network access. Returns false, writing nothing, when the pinned provider
+    version is not cached.
+    """
+    if cache_dir is None:
+        if not (env_dir := os.environ.get("TF_PLUGIN_CACHE_DIR")):
+            return False
+        cache_dir = Path(env_dir)
+    version = aws_provider_version()
+    if not (hashes := provider_hashes(cache_dir, version)):
+        logger.warning(f"AWS provider {version} is not cached in {cache_dir}")
+        return False
+    (stack_dir / LOCK_FILE).write_text(lock_file(version, hashes), encoding="utf-8")
+    (outdir / CLI_CONFIG_FILE).write_text(
+        cli_config(cache_dir.absolute()), encoding="utf-8"
+    )
+    return True
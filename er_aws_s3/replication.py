@@ -0,0 +1,165 @@
+from collections.abc import Callable, Sequence
+from itertools import count
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from er_aws_s3.input import S3ReplicationConfiguration
+
+# S3 accepts a single replication configuration per bucket, with up to 1000 rules
+MAX_RULES = 1000
+MAX_ID_LENGTH = 255
+# IAM limit on the role name
+MAX_ROLE_NAME_LENGTH = 64
+# The only threshold S3 Replication Time Control supports
+REPLICATION_TIME_MINUTES = 15
+
+ASSUME_ROLE_POLICY = {
+    "Version": "2012-10-17",
+    "Statement": [
+        {
+            "Action": "sts:AssumeRole",
+            "Principal": {"Service": "s3.amazonaws.com"},
+            "Effect": "Allow",
+            "Sid": "",
+        }
+    ],
+}
+
+
+def priorities(configs: Sequence["S3ReplicationConfiguration"]) -> list[int]:
+    """Returns the rule priorities, rules without one win in the input order.
+
+    They get the lowest priorities no rule sets explicitly.
+    """
+    explicit = {config.priority for config in configs if config.priority is not None}
+    free = (n for n in count(1) if n not in explicit)
+    defaults = [next(free) for config in configs if config.priority is None]
+    return [
+        defaults.pop() if config.priority is None else config.priority
+        for config in configs
+    ]
+
+
+def replication_role_name(identifier: str) -> str:
+    """Returns the name of the role and policy replicating the bucket"""
+    return f"{identifier}-replication"
+
+
+def _destination(
+    config: "S3ReplicationConfiguration", destination_arn: str
+) -> dict[str, Any]:
+    destination: dict[str, Any] = {"bucket": destination_arn}
+    if config.storage_class:
+        destination["storage_class"] = config.storage_class
+    if config.replication_time_control:
+        destination["replication_time"] = {
+            "status": "Enabled",
+            "time": {"minutes": REPLICATION_TIME_MINUTES},
+        }
+    # Replication Time Control requires the replication metrics
+    if config.replication_metrics or config.replication_time_control:
+        destination["metrics"] = {
+            "status": "Enabled",
+            "event_threshold": {"minutes": REPLICATION_TIME_MINUTES},
+        }
+    return destination
+
+
+def replication_rules(
+    configs: Sequence["S3ReplicationConfiguration"],
+    destination_arn: Callable[[str], str],
+) -> list[dict[str, Any]]:
+    """Returns the rules of the single replication configuration of the bucket.
+
+    destination_arn maps a destination bucket identifier to its ARN.
+    """
+    return [
+        {
+            "id": config.rule_name,
+            "status": config.status,
+            "priority": priority,
+            "filter": {"prefix": config.filter_prefix} if config.filter_prefix else {},
+            # Rules with a filter must set it, S3 defaults it to Disabled
+            "delete_marker_replication": {"status": "Disabled"},
+            "destination": _destination(
+                config, destination_arn(config.destination_bucket_identifier)
+            ),
+        }
+        for config, priority in zip(configs, priorities(configs), strict=True)
+    ]
+
+
+def replication_policy(source_arn: str, destination_arns: Sequence[str]) -> dict:
+    """Returns the policy of the role replicating to every destination"""
+    return {
+        "Version": "2012-10-17",
+        "Statement": [
+            {
+                "Action": ["s3:GetReplicationConfiguration", "s3:ListBucket"],
+                "Effect": "Allow",
+                "Resource": [source_arn],
+            },
+            {
+                "Action": [
+                    "s3:GetObjectVersionAcl",
+                    "s3:GetObjectVersionForReplication",
+                    "s3:GetObjectVersionTagging",
+                ],
+                "Effect": "Allow",
+                "Resource": [f"{source_arn}/*"],
+            },
+            {
+                "Action": [
+                    "s3:ReplicateDelete",
+                    "s3:ReplicateObject",
+                    "s3:ReplicateTags",
+                ],
+                "Effect": "Allow",
+                "Resource": [f"{arn}/*" for arn in destination_arns],
+            },
+        ],
+    }
+
+
+def validate_replication_configurations(
+    configs: Sequence["S3ReplicationConfiguration"],
+    *,
+    identifier: str,
+    versioning: bool,
+) -> None:
+    """Checks the replication rules before they reach AWS.
+
+    Raises a ValueError listing every error.
+    """
+    errors = []
+    if configs and not versioning:
+        errors.append("replication requires the bucket versioning")
+    role = replication_role_name(identifier)
+    if configs and len(role) > MAX_ROLE_NAME_LENGTH:
+        errors.append(
+            f"{role}: replication role name longer than "
+            f"{MAX_ROLE_NAME_LENGTH} characters"
+        )
+    if len(configs) > MAX_RULES:
+        errors.append(
+            f"{len(configs)} replication rules, S3 allows at most {MAX_RULES}"
+        )
+    seen: set[str] = set()
+    for config in configs:
+        if config.rule_name in seen:
+            errors.append(f"{config.rule_name}: duplicate replication rule name")
+        seen.add(config.rule_name)
+        if len(config.rule_name) > MAX_ID_LENGTH:
+            errors.append(
+                f"{config.rule_name}: name longer than {MAX_ID_LENGTH} characters"
+            )
+    by_priority: dict[int, str] = {}
+    for config, priority in zip(configs, priorities(configs), strict=True):
+        if priority in by_priority:
+            errors.append(
+                f"{config.rule_name}: priority {priority} already used by "
+                f"{by_priority[priority]}"
+            )
+        by_priority.setdefault(priority, config.rule_name)
+    if errors:
+        raise ValueError("; ".join(errors))
@@ -1,156 +1,264 @@
 import json
-from typing import Any, ClassVar
-
-from cdktf import ITerraformDependable, S3Backend, TerraformOutput, TerraformStack
-from cdktf_cdktf_provider_aws.data_aws_sns_topic import DataAwsSnsTopic
-from cdktf_cdktf_provider_aws.data_aws_sqs_queue import DataAwsSqsQueue
-from cdktf_cdktf_provider_aws.iam_access_key import IamAccessKey
-from cdktf_cdktf_provider_aws.iam_policy import IamPolicy
-from cdktf_cdktf_provider_aws.iam_role import IamRole
-from cdktf_cdktf_provider_aws.iam_role_policy_attachment import IamRolePolicyAttachment
-from cdktf_cdktf_provider_aws.iam_user import IamUser
-from cdktf_cdktf_provider_aws.iam_user_policy_attachment import IamUserPolicyAttachment
-from cdktf_cdktf_provider_aws.provider import AwsProvider
-from cdktf_cdktf_provider_aws.s3_bucket import S3Bucket
-from cdktf_cdktf_provider_aws.s3_bucket_acl import S3BucketAcl
-from cdktf_cdktf_provider_aws.s3_bucket_cors_configuration import (
-    S3BucketCorsConfiguration,
+from collections.abc import Callable
+from typing import TYPE_CHECKING, ClassVar, TypeVar, cast
+
+from cdktf import (
+    ITerraformDependable,
+    S3Backend,
+    TerraformDataSource,
+    TerraformOutput,
+    TerraformStack,
 )
-from cdktf_cdktf_provider_aws.s3_bucket_lifecycle_configuration import (
-    S3BucketLifecycleConfiguration,
-    S3BucketLifecycleConfigurationRule,
-    S3BucketLifecycleConfigurationRuleNoncurrentVersionExpiration,
-    S3BucketLifecycleConfigurationRuleNoncurrentVersionTransition,
-)
-from cdktf_cdktf_provider_aws.s3_bucket_logging import S3BucketLoggingA
-from cdktf_cdktf_provider_aws.s3_bucket_notification import (
-    S3BucketNotification,
-    S3BucketNotificationQueue,
-    S3BucketNotificationTopic,
-)
-from cdktf_cdktf_provider_aws.s3_bucket_ownership_controls import (
-    S3BucketOwnershipControls,
-    S3BucketOwnershipControlsRule,
-)
-from cdktf_cdktf_provider_aws.s3_bucket_policy import S3BucketPolicy
-from cdktf_cdktf_provider_aws.s3_bucket_request_payment_configuration import (
-    S3BucketRequestPaymentConfiguration,
+from constructs import Construct
+
+from er_aws_s3 import metrics
+from er_aws_s3.cdn import (
+    LIST_BLOCKS,
+    cache_policy_attributes,
+    distribution_attributes,
+    merged_bucket_policy,
+    origin_access_control_attributes,
+    origin_access_statement,
 )
-from cdktf_cdktf_provider_aws.s3_bucket_server_side_encryption_configuration import (
-    S3BucketServerSideEncryptionConfigurationA,
+from er_aws_s3.directory import session_policy
+from er_aws_s3.input import AppInterfaceInput, S3EventNotification
+from er_aws_s3.json_stack import logical_id
+from er_aws_s3.lifecycle import LIFECYCLE_CONFIGURATION_ID
+from er_aws_s3.monitoring import (
+    analytics_attributes,
+    inventory_attributes,
+    metric_attributes,
+    report_delivery_statement,
+    report_destinations,
 )
-from cdktf_cdktf_provider_aws.s3_bucket_versioning import (
-    S3BucketVersioningA,
-    S3BucketVersioningVersioningConfiguration,
+from er_aws_s3.notifications import (
+    eventbridge_event_pattern,
+    is_lambda_arn,
+    lambda_function_id,
+    lambda_permission,
 )
-from cdktf_cdktf_provider_aws.s3_bucket_website_configuration import (
-    S3BucketWebsiteConfiguration,
+from er_aws_s3.performance import accelerate_endpoint
+from er_aws_s3.replication import (
+    ASSUME_ROLE_POLICY,
+    replication_policy,
+    replication_role_name,
+    replication_rules,
 )
-from constructs import Construct
 
-from er_aws_s3.input import (
-    AppInterfaceInput,
-    S3EventNotification,
-    S3ReplicationConfiguration,
-)
+# cdktf_cdktf_provider_aws constructs are imported on demand, in the method that
+# emits them, so importing this module does not load the provider assembly.
+if TYPE_CHECKING:
+    from cdktf_cdktf_provider_aws.data_aws_lambda_function import (
+        DataAwsLambdaFunction,
+    )
+    from cdktf_cdktf_provider_aws.data_aws_s3_bucket import DataAwsS3Bucket
+    from cdktf_cdktf_provider_aws.data_aws_sns_topic import DataAwsSnsTopic
+    from cdktf_cdktf_provider_aws.data_aws_sqs_queue import DataAwsSqsQueue
+    from cdktf_cdktf_provider_aws.iam_policy import IamPolicy
+    from cdktf_cdktf_provider_aws.iam_role import IamRole
+    from cdktf_cdktf_provider_aws.lambda_permission import LambdaPermission
+    from cdktf_cdktf_provider_aws.s3_bucket import S3Bucket
+    from cdktf_cdktf_provider_aws.s3_bucket_notification import (
+        S3BucketNotificationLambdaFunction,
+        S3BucketNotificationQueue,
+        S3BucketNotificationTopic,
+    )
+    from cdktf_cdktf_provider_aws.s3_bucket_ownership_controls import (
+        S3BucketOwnershipControls,
+    )
+    from cdktf_cdktf_provider_aws.s3_bucket_versioning import S3BucketVersioningA
+    from cdktf_cdktf_provider_aws.s3_directory_bucket import S3DirectoryBucket
+
+D = TypeVar("D", bound=TerraformDataSource)
+
+
+class DataSourceRegistry:
+    """Per-stack registry of the data sources shared by the helpers.
+
+    Every (type, name) is looked up once, however many resources reference it.
+    """
+
+    def __init__(self, construct: TerraformStack) -> None:
+        self.construct = construct
+        self._data_sources: dict[tuple[str, str], TerraformDataSource] = {}
+        # The ARN tokens, reading an attribute is a jsii kernel round trip
+        self._arns: dict[tuple[str, str], str] = {}
+
+    def _lookup(self, type_: str, name: str, create: Callable[[str], D]) -> D:
+        key = (type_, name)
+        if key not in self._data_sources:
+            self._data_sources[key] = create(f"{name}-{type_}-ds")
+        return cast("D", self._data_sources[key])
+
+    def _arn(
+        self,
+        type_: str,
+        name: str,
+        lookup: Callable[
+            [],
+            "DataAwsSqsQueue | DataAwsSnsTopic | DataAwsS3Bucket | DataAwsLambdaFunction",
+        ],
+    ) -> str:
+        key = (type_, name)
+        if key not in self._arns:
+            self._arns[key] = lookup().arn
+        return self._arns[key]
+
+    def _sqs_queue(self, name: str) -> "DataAwsSqsQueue":
+        from cdktf_cdktf_provider_aws.data_aws_sqs_queue import DataAwsSqsQueue
+
+        return self._lookup(
+            "sqs",
+            name,
+            lambda id_: DataAwsSqsQueue(self.construct, id_=id_, name=name),
+        )
+
+    def _sns_topic(self, name: str) -> "DataAwsSnsTopic":
+        from cdktf_cdktf_provider_aws.data_aws_sns_topic import DataAwsSnsTopic
+
+        return self._lookup(
+            "sns",
+            name,
+            lambda id_: DataAwsSnsTopic(self.construct, id_=id_, name=name),
+        )
+
+    def _lambda_function(self, name: str) -> "DataAwsLambdaFunction":
+        from cdktf_cdktf_provider_aws.data_aws_lambda_function import (
+            DataAwsLambdaFunction,
+        )
+
+        return self._lookup(
+            "lambda",
+            name,
+            lambda id_: DataAwsLambdaFunction(
+                self.construct, id_=id_, function_name=name
+            ),
+        )
+
+    def sqs_queue_arn(self, name: str) -> str:
+        """Returns the ARN of an SQS queue looked up by name"""
+        return self._arn("sqs", name, lambda: self._sqs_queue(name))
+
+    def sns_topic_arn(self, name: str) -> str:
+        """Returns the ARN of an SNS topic looked up by name"""
+        return self._arn("sns", name, lambda: self._sns_topic(name))
+
+    def lambda_function_arn(self, name: str) -> str:
+        """Returns the ARN of a Lambda function looked up by name"""
+        return self._arn("lambda", name, lambda: self._lambda_function(name))
+
+    def s3_bucket(self, name: str) -> "DataAwsS3Bucket":
+        """Returns an S3 bucket managed outside of the stack, looked up by name"""
+        from cdktf_cdktf_provider_aws.data_aws_s3_bucket import DataAwsS3Bucket
+
+        return self._lookup(
+            "s3",
+            name,
+            lambda id_: DataAwsS3Bucket(self.construct, id_=id_, bucket=name),
+        )
+
+    def s3_bucket_arn(self, name: str) -> str:
+        """Returns the ARN of an S3 bucket managed outside of the stack"""
+        return self._arn("s3", name, lambda: self.s3_bucket(name))
 
 
 class S3ReplicationConfigsHelper:
-    """Helper class for creating S3 replication configs"""
+    """Helper class for creating the S3 replication configuration.
 
-    assume_role_policy: ClassVar[dict[str, Any]] = {
-        "Version": "2012-10-17",
-        "Statement": [
-            {
-                "Action": "sts:AssumeRole",
-                "Principal": {"Service": "s3.amazonaws.com"},
-                "Effect": "Allow",
-                "Sid": "",
-            }
-        ],
-    }
+    Every rule shares one IAM role and one policy, S3 accepts a single
+    replication configuration per bucket.
+    """
 
     def __init__(
-        self, construct: TerraformStack, app_interface_input: AppInterfaceInput
+        self,
+        construct: TerraformStack,
+        app_interface_input: AppInterfaceInput,
+        data_sources: DataSourceRegistry,
     ) -> None:
         self.construct = construct
         self.input = app_interface_input
+        self.data_sources = data_sources
+
+    def _destination_arn(self, identifier: str) -> str:
+        return self.data_sources.s3_bucket_arn(identifier)
 
-    def _create_iam_policy(self, config: S3ReplicationConfiguration) -> IamPolicy:
+    def _create_iam_policy(self, source_arn: str) -> "IamPolicy":
+        from cdktf_cdktf_provider_aws.iam_policy import IamPolicy
+
+        configs = self.input.data.replication_configurations or []
+        # Deduplicated by identifier, every token access is a distinct string
+        destination_arns = [
+            self._destination_arn(identifier)
+            for identifier in dict.fromkeys(
+                config.destination_bucket_identifier for config in configs
+            )
+        ]
         return IamPolicy(
             self.construct,
-            id_=f"${self.input.data.identifier}_${config.rule_name}",
-            name=f"${config.rule_name}_iam_policy",
+            id_=f"{self.input.data.identifier}_replication_iam_policy",
+            name=replication_role_name(self.input.data.identifier),
             policy=json.dumps(
-                {
-                    "Version": "2012-10-17",
-                    "Statement": [
-                        {
-                            "Action": [
-                                "s3:GetReplicationConfiguration",
-                                "s3:ListBucket",
-                            ],
-                            "Effect": "Allow",
-                            "Resource": [
-                                "${aws_s3_bucket."
-                                + self.input.data.identifier
-                                + ".arn}",
-                                "${aws_s3_bucket."
-                                + config.destination_bucket_identifier
-                                + ".arn}",
-                            ],
-                        },
-                        {
-                            "Action": ["s3:GetObjectVersion", "s3:GetObjectVersionAcl"],
-                            "Effect": "Allow",
-                            "Resource": [
-                                "${aws_s3_bucket."
-                                + self.input.data.identifier
-                                + ".arn}/*"
-                            ],
-                        },
-                        {
-                            "Action": ["s3:ReplicateObject", "s3:ReplicateDelete"],
-                            "Effect": "Allow",
-                            "Resource": f"${{aws_s3_bucket.${config.destination_bucket_identifier}.arn}}/*",
-                        },
-                    ],
-                },
+                replication_policy(source_arn, destination_arns),
                 sort_keys=True,
             ),
         )
 
-    def _create_aws_iam_role(
-        self,
-        config: S3ReplicationConfiguration,
-    ) -> IamRole:
-        """Creates the necessary IAM role for the replication bucket"""
+    def _create_aws_iam_role(self) -> "IamRole":
+        """Creates the IAM role S3 assumes to replicate the bucket"""
+        from cdktf_cdktf_provider_aws.iam_role import IamRole
+
         return IamRole(
             self.construct,
-            id_=f"${self.input.data.identifier}_${config.rule_name}",
-            name=f"${config.rule_name}_iam_role",
-            assume_role_policy=json.dumps(
-                S3ReplicationConfigsHelper.assume_role_policy, sort_keys=True
-            ),
+            id_=f"{self.input.data.identifier}_replication_iam_role",
+            name=replication_role_name(self.input.data.identifier),
+            assume_role_policy=json.dumps(ASSUME_ROLE_POLICY, sort_keys=True),
         )
 
     def _create_aws_iam_policy_attachment(
-        self, config: S3ReplicationConfiguration, role: IamRole, policy: IamPolicy
+        self, role: "IamRole", policy: "IamPolicy"
     ) -> None:
+        from cdktf_cdktf_provider_aws.iam_role_policy_attachment import (
+            IamRolePolicyAttachment,
+        )
+
         IamRolePolicyAttachment(
             self.construct,
-            id_=f"${self.input.data.identifier}_${config.rule_name}",
+            id_=f"{self.input.data.identifier}_replication_iam_policy_attachment",
             role=role.name,
             policy_arn=policy.arn,
         )
 
-    def create_replication_rule_iam_configuration(
-        self, config: S3ReplicationConfiguration
+    def create_replication_configuration(
+        self,
+        bucket_id: str,
+        bucket_arn: str,
+        versioning: "S3BucketVersioningA | None",
     ) -> None:
-        """Creates the necessary IAM objects for a replication configuration"""
-        role = self._create_aws_iam_role(config)
-        policy = self._create_iam_policy(config)
-        self._create_aws_iam_policy_attachment(config, role, policy)
+        """Creates the replication configuration and its IAM role"""
+        from cdktf_cdktf_provider_aws.s3_bucket_replication_configuration import (
+            S3BucketReplicationConfigurationA,
+        )
+
+        role = self._create_aws_iam_role()
+        policy = self._create_iam_policy(bucket_arn)
+        self._create_aws_iam_policy_attachment(role, policy)
+        replication = S3BucketReplicationConfigurationA(
+            self.construct,
+            id_="replication_configuration",
+            bucket=bucket_id,
+            role=role.arn,
+            rule=[],
+            # S3 rejects the configuration until the versioning is enabled
+            depends_on=[versioning] if versioning else None,
+        )
+        # Terraform JSON passthrough, jsii drops the snake_case keys of plain dicts
+        replication.add_override(
+            "rule",
+            replication_rules(
+                self.input.data.replication_configurations or [],
+                self._destination_arn,
+            ),
+        )
 
 
 class S3EventNotificationsHelper:
@@ -160,27 +268,29 @@ class S3EventNotificationsHelper:
         self,
         construct: TerraformStack,
         app_interface_input: AppInterfaceInput,
+        data_sources: DataSourceRegistry,
     ) -> None:
         self.construct = construct
         self.input = app_interface_input
+        self.data_sources = data_sources
 
     def _get_sqs_queue_arn(self, config: S3EventNotification) -> str:
         if config.destination_identifier.startswith("arn"):
             return config.destination_identifier
-        ds_identifier = f"{config.identifier}-sqs-ds"
-        DataAwsSqsQueue(self.construct, id_=f"${ds_identifier}", name=config.identifier)
-        return f"${{data.aws_sqs_queue.${ds_identifier}.arn}}"
+        return self.data_sources.sqs_queue_arn(config.destination_identifier)
 
     def _get_sns_topic_arn(self, config: S3EventNotification) -> str:
         if config.destination_identifier.startswith("arn"):
             return config.destination_identifier
-        ds_identifier = f"{config.identifier}-sns-ds"
-        DataAwsSnsTopic(self.construct, id_=f"${ds_identifier}", name=config.identifier)
-        return f"${{data.aws_sns_topic.${ds_identifier}.arn}}"
+        return self.data_sources.sns_topic_arn(config.destination_identifier)
 
     def _get_sqs_event_notification(
         self, config: S3EventNotification
-    ) -> S3BucketNotificationQueue:
+    ) -> "S3BucketNotificationQueue":
+        from cdktf_cdktf_provider_aws.s3_bucket_notification import (
+            S3BucketNotificationQueue,
+        )
+
         return S3BucketNotificationQueue(
             events=config.event_type,
             queue_arn=self._get_sqs_queue_arn(config),
@@ -190,7 +300,11 @@ class S3EventNotificationsHelper:
 
     def _get_sns_event_notification(
         self, config: S3EventNotification
-    ) -> S3BucketNotificationTopic:
+    ) -> "S3BucketNotificationTopic":
+        from cdktf_cdktf_provider_aws.s3_bucket_notification import (
+            S3BucketNotificationTopic,
+        )
+
         return S3BucketNotificationTopic(
             events=config.event_type,
             topic_arn=self._get_sns_topic_arn(config),
@@ -198,22 +312,124 @@ class S3EventNotificationsHelper:
             filter_suffix=config.filter_suffix,
         )
 
-    def create_s3_bucket_notification(self, bucket_id: str) -> None:
-        """Creates the bucket notification configuration"""
+    def _get_lambda_function_arn(self, config: S3EventNotification) -> str:
+        if config.destination_identifier.startswith("arn"):
+            return config.destination_identifier
+        return self.data_sources.lambda_function_arn(config.destination_identifier)
+
+    def _get_lambda_event_notification(
+        self, config: S3EventNotification
+    ) -> "S3BucketNotificationLambdaFunction":
+        from cdktf_cdktf_provider_aws.s3_bucket_notification import (
+            S3BucketNotificationLambdaFunction,
+        )
+
+        return S3BucketNotificationLambdaFunction(
+            events=config.event_type,
+            lambda_function_arn=self._get_lambda_function_arn(config),
+            filter_prefix=config.filter_prefix,
+            filter_suffix=config.filter_suffix,
+        )
+
+    def _configs(self, destination_type: str) -> list[S3EventNotification]:
+        return [
+            config
+            for config in self.input.data.event_notifications or []
+            if config.destination_type == destination_type
+        ]
+
+    def _create_lambda_permissions(self, bucket_arn: str) -> list["LambdaPermission"]:
+        """S3 checks it may invoke every function when the configuration is put"""
+        from cdktf_cdktf_provider_aws.lambda_permission import LambdaPermission
+
+        identifier = self.input.data.identifier
+        # One permission per function, however many notifications invoke it
+        configs = {
+            config.destination_identifier: config for config in self._configs("lambda")
+        }
+        return [
+            LambdaPermission(
+                self.construct,
+                id_=(
+                    f"{identifier}-"
+                    f"{lambda_function_id(config.destination_identifier)}-s3-permission"
+                ),
+                **lambda_permission(
+                    self._get_lambda_function_arn(config),
+                    statement_id=f"s3-{identifier}",
+                    principal="s3.amazonaws.com",
+                    source_arn=bucket_arn,
+                ),
+            )
+            for config in configs.values()
+        ]
+
+    def _create_eventbridge_rules(self) -> None:
+        """A rule per notification, sending the matching events to its target"""
+        from cdktf_cdktf_provider_aws.cloudwatch_event_rule import CloudwatchEventRule
+        from cdktf_cdktf_provider_aws.cloudwatch_event_target import (
+            CloudwatchEventTarget,
+        )
+        from cdktf_cdktf_provider_aws.lambda_permission import LambdaPermission
+
+        identifier = self.input.data.identifier
+        for index, config in enumerate(self._configs("eventbridge")):
+            rule = CloudwatchEventRule(
+                self.construct,
+                id_=f"{identifier}-events-{index}",
+                description=f"S3 events of {identifier} to {config.identifier}",
+                event_pattern=json.dumps(
+                    eventbridge_event_pattern(self.input.data.bucket_name, config),
+                    sort_keys=True,
+                ),
+            )
+            CloudwatchEventTarget(
+                self.construct,
+                id_=f"{identifier}-events-{index}-target",
+                rule=rule.name,
+                arn=config.destination_identifier,
+            )
+            if is_lambda_arn(config.destination_identifier):
+                LambdaPermission(
+                    self.construct,
+                    id_=f"{identifier}-events-{index}-permission",
+                    **lambda_permission(
+                        config.destination_identifier,
+                        statement_id=f"events-{identifier}-{index}",
+                        principal="events.amazonaws.com",
+                        source_arn=rule.arn,
+                    ),
+                )
+
+    def create_s3_bucket_notification(self, bucket_id: str, bucket_arn: str) -> None:
+        """Creates the bucket notification configuration and its destinations"""
+        from cdktf_cdktf_provider_aws.s3_bucket_notification import (
+            S3BucketNotification,
+        )
+
+        permissions = self._create_lambda_permissions(bucket_arn)
+        self._create_eventbridge_rules()
+        eventbridge = self.input.data.eventbridge or bool(self._configs("eventbridge"))
         S3BucketNotification(
             self.construct,
             id_=f"{self.input.data.identifier}-event-notifications",
             bucket=bucket_id,
             queue=[
                 self._get_sqs_event_notification(config)
-                for config in self.input.data.event_notifications or []
-                if config.destination_type == "sqs"
+                for config in self._configs("sqs")
             ],
             topic=[
                 self._get_sns_event_notification(config)
-                for config in self.input.data.event_notifications or []
-                if config.destination_type == "sns"
+                for config in self._configs("sns")
             ],
+            lambda_function=[
+                self._get_lambda_event_notification(config)
+                for config in self._configs("lambda")
+            ]
+            or None,
+            eventbridge=eventbridge or None,
+            # S3 rejects the configuration until it may invoke the functions
+            depends_on=permissions or None,
         )
 
 
@@ -228,6 +444,7 @@ class Stack(TerraformStack):
         super().__init__(scope, id_)
         self.input = app_interface_input
         self._init_providers()
+        self.data_sources = DataSourceRegistry(self)
         self._run()
 
     def _init_providers(self) -> None:
@@ -240,6 +457,8 @@ class Stack(TerraformStack):
             dynamodb_table=self.input.provision.module_provision_data.tf_state_dynamodb_table,
             profile="external-resources-state",
         )
+        from cdktf_cdktf_provider_aws.provider import AwsProvider
+
         AwsProvider(
             self,
             "Aws",
@@ -247,11 +466,12 @@ class Stack(TerraformStack):
             default_tags=self.input.data.default_tags,
         )
 
+    @metrics.traced
     def _outputs(self) -> None:
         TerraformOutput(
             self,
             self.input.data.output_prefix + "__bucket",
-            value=self.input.data.identifier,
+            value=self.input.data.bucket_name,
         )
         TerraformOutput(
             self,
@@ -261,160 +481,349 @@ class Stack(TerraformStack):
         TerraformOutput(
             self,
             self.input.data.output_prefix + "__endpoint",
-            value=f"s3.{self.input.data.region}.amazonaws.com",
+            value=self.input.data.endpoint,
         )
+        if self.input.data.performance.transfer_acceleration:
+            TerraformOutput(
+                self,
+                self.input.data.output_prefix + "__accelerate_endpoint",
+                value=accelerate_endpoint(self.input.data.identifier),
+            )
 
+    @metrics.traced
     def _s3_bucket_logging(self) -> None:
         if self.input.data.s3_bucket_logging:
+            from cdktf_cdktf_provider_aws.s3_bucket_logging import S3BucketLoggingA
+
             # Ignore changes
-            target_bucket = self.input.data.s3_bucket_logging.get("identifier")
+            target_bucket = self.input.data.s3_bucket_logging["identifier"]
             logging_values = {
-                "bucket": f"${{aws_s3_bucket.${self.input.data.identifier}.id}}",
-                "target_bucket": f"${{aws_s3_bucket.${target_bucket}.id}}",
+                "bucket": self.bucket_id,
+                "target_bucket": self.bucket_id
+                if target_bucket == self.input.data.identifier
+                else self.data_sources.s3_bucket(target_bucket).id,
                 "target_prefix": self.input.data.s3_bucket_logging.get(
                     "target_prefix", ""
                 ),
             }
             S3BucketLoggingA(
-                id_=f"{self.input.data.identifier}-logging", **logging_values
+                self, id_=f"{self.input.data.identifier}-logging", **logging_values
             )
 
-    def _s3_bucket_ownership_controls(self) -> S3BucketOwnershipControls:
+    @metrics.traced
+    def _s3_bucket_ownership_controls(self) -> "S3BucketOwnershipControls":
+        from cdktf_cdktf_provider_aws.s3_bucket_ownership_controls import (
+            S3BucketOwnershipControls,
+            S3BucketOwnershipControlsRule,
+        )
+
         return S3BucketOwnershipControls(
             self,
             id_="bucket_ownership_controls",
-            bucket=self.bucket_obj.id,
+            bucket=self.bucket_id,
             rule=S3BucketOwnershipControlsRule(object_ownership="BucketOwnerPreferred"),
         )
 
+    @metrics.traced
     def _s3_bucket_acl(self) -> None:
         # aws_s3_bucket_public_access_block not implemented for now
+        from cdktf_cdktf_provider_aws.s3_bucket_acl import S3BucketAcl
+
         S3BucketAcl(
             self,
             id_="bucket_acl",
-            bucket=self.bucket_obj.id,
+            bucket=self.bucket_id,
             acl="private",
             depends_on=[self.bucket_ownership_controls],
         )
 
+    @metrics.traced
     def _s3_server_side_encryption(self) -> None:
-        S3BucketServerSideEncryptionConfigurationA(
+        from cdktf_cdktf_provider_aws.s3_bucket_server_side_encryption_configuration import (
+            S3BucketServerSideEncryptionConfigurationA,
+        )
+
+        sse = S3BucketServerSideEncryptionConfigurationA(
+            self, id_="s3ss_enc_conf", bucket=self.bucket_id, rule=[]
+        )
+        # Terraform JSON passthrough, jsii drops the snake_case keys of plain dicts
+        sse.add_override("rule", [self.input.data.server_side_encryption_rule])
+
+    @metrics.traced
+    def _s3_transfer_acceleration(self) -> None:
+        if not self.input.data.performance.transfer_acceleration:
+            return
+        from cdktf_cdktf_provider_aws.s3_bucket_accelerate_configuration import (
+            S3BucketAccelerateConfiguration,
+        )
+
+        S3BucketAccelerateConfiguration(
             self,
-            id_="s3ss_enc_conf",
-            bucket=self.bucket_obj.id,
-            rule=[self.input.data.server_side_encryption_configuration["rule"]],
+            id_="bucket_accelerate_config",
+            bucket=self.bucket_id,
+            status="Enabled",
         )
 
-    def _s3_lifecycle_rules(self) -> None:
-        for rule in self.input.data.lifecycle_rules or []:
-            rule["status"] = rule["enabled"]
-            S3BucketLifecycleConfiguration(
-                self, id_=rule["id"], bucket=self.bucket_obj.id, rule=[rule]
-            )
+    @metrics.traced
+    def _s3_bucket(self) -> "S3Bucket":
+        from cdktf_cdktf_provider_aws.s3_bucket import S3Bucket
 
-    def _s3_bucket(self) -> S3Bucket:
         return S3Bucket(
             self,
             id_=self.input.data.identifier,
             **self.input.data.model_dump(exclude_none=True),
         )
 
-    def _exists_noncurrent_version_expiration_lifecycle_rule(self) -> bool:
-        """Returns true if lifecycle rule with a noncurrent_version_expiration exixts"""
-        return bool([
-            r
-            for r in self.input.data.lifecycle_rules or []
-            if "noncurrent_version_expiration" in r
-        ])
+    @metrics.traced
+    def _s3_directory_bucket(self, availability_zone_id: str) -> "S3DirectoryBucket":
+        from cdktf_cdktf_provider_aws.s3_directory_bucket import (
+            S3DirectoryBucket,
+            S3DirectoryBucketLocation,
+        )
 
-    def _s3_versioning(self) -> None:
-        if not self.input.data.versioning:
-            return
-        S3BucketVersioningA(
+        return S3DirectoryBucket(
+            self,
+            id=self.input.data.identifier,
+            bucket=self.input.data.bucket_name,
+            location=[
+                S3DirectoryBucketLocation(
+                    name=availability_zone_id,
+                    type="AvailabilityZone",
+                )
+            ],
+            force_destroy=self.input.data.force_destroy,
+        )
+
+    @metrics.traced
+    def _s3_versioning(self) -> "S3BucketVersioningA | None":
+        if not self.input.data.versioning_enabled:
+            return None
+        from cdktf_cdktf_provider_aws.s3_bucket_versioning import (
+            S3BucketVersioningA,
+            S3BucketVersioningVersioningConfiguration,
+        )
+
+        return S3BucketVersioningA(
             self,
             id_="bucket_versioning",
-            bucket=self.bucket_obj.id,
+            bucket=self.bucket_id,
             versioning_configuration=S3BucketVersioningVersioningConfiguration(
                 status="Enabled"
             ),
         )
-        if not self._exists_noncurrent_version_expiration_lifecycle_rule():
-            S3BucketLifecycleConfiguration(
-                self,
-                id_="noncurrent_version_expiration_lifecycle_rule",
-                bucket=self.bucket_obj.id,
-                rule=[
-                    S3BucketLifecycleConfigurationRule(
-                        id="expire_noncurrent_versions",
-                        status="Enabled",
-                        noncurrent_version_expiration=S3BucketLifecycleConfigurationRuleNoncurrentVersionExpiration(
-                            noncurrent_days=30
-                        ),
-                    )
-                ],
-            )
 
-    def _s3_storage_class(self) -> None:
-        if not self.input.data.storage_class:
+    @metrics.traced
+    def _s3_lifecycle_rules(self) -> None:
+        """A single configuration, S3 keeps only one per bucket"""
+        rules = self.input.data.lifecycle_configuration_rules
+        if not rules:
             return
-        days = 1
-        if self.input.data.storage_class in {"STANDARD_IA", "ONEZONE_IA"}:
-            # Infrequent Access storage class has minimum 30 days
-            # before transition
-            days = 30
+        from cdktf_cdktf_provider_aws.s3_bucket_lifecycle_configuration import (
+            S3BucketLifecycleConfiguration,
+        )
 
-        S3BucketLifecycleConfiguration(
+        lifecycle = S3BucketLifecycleConfiguration(
             self,
-            id_="storage_class_lifecycle_rule",
-            bucket=self.bucket_obj.id,
-            rule=[
-                S3BucketLifecycleConfigurationRule(
-                    id=f"${self.input.data.storage_class}_storage_class",
-                    status="Enabled",
-                    noncurrent_version_transition=[
-                        S3BucketLifecycleConfigurationRuleNoncurrentVersionTransition(
-                            storage_class=self.input.data.storage_class,
-                            noncurrent_days=days,
-                        )
-                    ],
-                )
-            ],
+            id_=LIFECYCLE_CONFIGURATION_ID,
+            bucket=self.bucket_id,
+            rule=[],
+            # Noncurrent version rules need the versioning to be enabled first
+            depends_on=[self.bucket_versioning] if self.bucket_versioning else None,
         )
+        # Terraform JSON passthrough, jsii drops the snake_case keys of plain dicts
+        lifecycle.add_override("rule", rules)
+        if (legacy := self.input.data.legacy_lifecycle_configuration_id) and (
+            logical_id(legacy) != LIFECYCLE_CONFIGURATION_ID
+        ):
+            # A raw moved block, move_from_id makes cdktf run `terraform version`
+            self.add_override(
+                "moved",
+                [
+                    {
+                        "from": "aws_s3_bucket_lifecycle_configuration."
+                        f"{logical_id(legacy)}",
+                        "to": "aws_s3_bucket_lifecycle_configuration."
+                        f"{LIFECYCLE_CONFIGURATION_ID}",
+                    }
+                ],
+            )
 
+    @metrics.traced
     def _s3_cors_rules(self) -> None:
         if not self.input.data.cors_rules:
             return
-        S3BucketCorsConfiguration(
-            self,
-            id_="bucket_cors_config",
-            bucket=self.bucket_obj.id,
-            cors_rule=self.input.data.cors_rules,
+        from cdktf_cdktf_provider_aws.s3_bucket_cors_configuration import (
+            S3BucketCorsConfiguration,
+        )
+
+        cors = S3BucketCorsConfiguration(
+            self, id_="bucket_cors_config", bucket=self.bucket_id, cors_rule=[]
         )
+        cors.add_override("cors_rule", self.input.data.cors_rules)
+
+    def _destination_bucket_arn(self, identifier: str) -> str:
+        """Returns the ARN of the bucket itself, or of another one looked up"""
+        if identifier == self.input.data.identifier:
+            return self.bucket_arn
+        return self.data_sources.s3_bucket_arn(identifier)
+
+    @metrics.traced
+    def _s3_metrics(self) -> None:
+        """CloudWatch request metrics, by prefix and tags"""
+        if not self.input.data.metrics_configurations:
+            return
+        from cdktf_cdktf_provider_aws.s3_bucket_metric import S3BucketMetric
 
+        for config in self.input.data.metrics_configurations:
+            S3BucketMetric(
+                self,
+                id_=f"{self.input.data.identifier}-metrics-{config.name}",
+                bucket=self.bucket_id,
+                **metric_attributes(config),
+            )
+
+    @metrics.traced
+    def _s3_inventory(self) -> None:
+        if not self.input.data.inventory_configurations:
+            return
+        from cdktf_cdktf_provider_aws.s3_bucket_inventory import S3BucketInventory
+
+        for config in self.input.data.inventory_configurations:
+            S3BucketInventory(
+                self,
+                id_=f"{self.input.data.identifier}-inventory-{config.name}",
+                bucket=self.bucket_id,
+                **inventory_attributes(
+                    config,
+                    self._destination_bucket_arn(config.destination_bucket_identifier),
+                ),
+            )
+
+    @metrics.traced
+    def _s3_analytics(self) -> None:
+        """Storage class analysis"""
+        if not self.input.data.analytics_configurations:
+            return
+        from cdktf_cdktf_provider_aws.s3_bucket_analytics_configuration import (
+            S3BucketAnalyticsConfiguration,
+        )
+
+        for config in self.input.data.analytics_configurations:
+            destination = config.destination_bucket_identifier
+            S3BucketAnalyticsConfiguration(
+                self,
+                id_=f"{self.input.data.identifier}-analytics-{config.name}",
+                bucket=self.bucket_id,
+                **analytics_attributes(
+                    config,
+                    self._destination_bucket_arn(destination) if destination else None,
+                ),
+            )
+
+    @metrics.traced
     def _s3_replication_configs(self) -> None:
         if not self.input.data.replication_configurations:
             return
-        helper = S3ReplicationConfigsHelper(self, self.input)
-        for config in self.input.data.replication_configurations:
-            helper.create_replication_rule_iam_configuration(config)
+        helper = S3ReplicationConfigsHelper(self, self.input, self.data_sources)
+        helper.create_replication_configuration(
+            self.bucket_id, self.bucket_arn, self.bucket_versioning
+        )
 
+    @metrics.traced
     def _s3_event_notifications(self) -> None:
-        if not self.input.data.event_notifications:
+        if not self.input.data.event_notifications and not self.input.data.eventbridge:
             return
-        helper = S3EventNotificationsHelper(self, self.input)
-        helper.create_s3_bucket_notification(self.bucket_obj.id)
+        helper = S3EventNotificationsHelper(self, self.input, self.data_sources)
+        helper.create_s3_bucket_notification(self.bucket_id, self.bucket_arn)
+
+    @metrics.traced
+    def _s3_cdn(self) -> str | None:
+        """CloudFront distribution reading the bucket through an origin access control
+
+        Returns the distribution ARN the bucket policy lets read the objects.
+        """
+        website = self.input.data.website
+        if not website or not website.cdn:
+            return None
+        from cdktf_cdktf_provider_aws.cloudfront_cache_policy import (
+            CloudfrontCachePolicy,
+        )
+        from cdktf_cdktf_provider_aws.cloudfront_distribution import (
+            CloudfrontDistribution,
+        )
+        from cdktf_cdktf_provider_aws.cloudfront_origin_access_control import (
+            CloudfrontOriginAccessControl,
+        )
 
+        identifier = self.input.data.identifier
+        origin_access_control = CloudfrontOriginAccessControl(
+            self,
+            id_=f"{identifier}-oac",
+            **origin_access_control_attributes(identifier),
+        )
+        cache_policy = CloudfrontCachePolicy(
+            self,
+            id_=f"{identifier}-cache-policy",
+            **cache_policy_attributes(identifier, website.cdn),
+        )
+        attributes = distribution_attributes(
+            website.cdn,
+            website.model_dump(),
+            # Directory buckets have no website, this is a general purpose one
+            domain_name=cast("S3Bucket", self.bucket_obj).bucket_regional_domain_name,
+            origin_access_control_id=origin_access_control.id,
+            cache_policy_id=cache_policy.id,
+        )
+        blocks = {key: attributes.pop(key) for key in LIST_BLOCKS if key in attributes}
+        distribution = CloudfrontDistribution(
+            self, id_=f"{identifier}-distribution", origin=[], **attributes
+        )
+        # Terraform JSON passthrough, jsii drops the keys of the dicts in lists
+        for key, value in blocks.items():
+            distribution.add_override(key, value)
+        TerraformOutput(
+            self,
+            self.input.data.output_prefix + "__cloudfront_domain",
+            value=distribution.domain_name,
+        )
+        return distribution.arn
+
+    @metrics.traced
     def _s3_bucket_policy(self) -> None:
-        if not self.input.data.bucket_policy:
+        statements = []
+        if self.distribution_arn:
+            statements.append(
+                origin_access_statement(self.bucket_arn, self.distribution_arn)
+            )
+        if self.input.data.identifier in report_destinations(
+            self.input.data.inventory_configurations or [],
+            self.input.data.analytics_configurations or [],
+        ):
+            from cdktf_cdktf_provider_aws.data_aws_caller_identity import (
+                DataAwsCallerIdentity,
+            )
+
+            caller_identity = DataAwsCallerIdentity(
+                self, id_=f"{self.input.data.identifier}-caller-identity"
+            )
+            statements.append(
+                report_delivery_statement(self.bucket_arn, caller_identity.account_id)
+            )
+        policy = merged_bucket_policy(self.input.data.bucket_policy, statements)
+        if not policy:
             return
+        from cdktf_cdktf_provider_aws.s3_bucket_policy import S3BucketPolicy
+
         S3BucketPolicy(
             self,
             id_=f"${self.input.data.identifier}-bucket_policy",
-            bucket=self.bucket_obj.id,
-            policy=self.input.data.bucket_policy,
+            bucket=self.bucket_id,
+            policy=policy,
         )
 
     def _get_s3_bucket_iam_policy(self) -> str:
+        if self.input.data.directory_bucket:
+            return json.dumps(session_policy(self.bucket_arn), sort_keys=True)
         action = ["s3:*Object"]
         if self.input.data.acl == "public-read":
             action.append("s3:PutObjectAcl")
@@ -429,31 +838,35 @@ class Stack(TerraformStack):
                         "Sid": "ListObjectsInBucket",
                         "Effect": "Allow",
                         "Action": ["s3:ListBucket", "s3:PutBucketCORS"],
-                        "Resource": self.bucket_obj.arn,
+                        "Resource": self.bucket_arn,
                     },
                     {
                         "Sid": "AllObjectActions",
                         "Effect": "Allow",
                         "Action": action,
-                        "Resource": f"${self.bucket_obj.arn}/*",
+                        "Resource": f"{self.bucket_arn}/*",
                     },
                 ],
             },
             sort_keys=True,
         )
 
+    @metrics.traced
     def _s3_bucket_iam_user(self) -> None:
+        from cdktf_cdktf_provider_aws.iam_access_key import IamAccessKey
+        from cdktf_cdktf_provider_aws.iam_policy import IamPolicy
+        from cdktf_cdktf_provider_aws.iam_user import IamUser
+        from cdktf_cdktf_provider_aws.iam_user_policy_attachment import (
+            IamUserPolicyAttachment,
+        )
+
         user = IamUser(
             self,
             id_=self.input.data.identifier + "_user",
             name=self.input.data.identifier,
-            depends_on=[self.bucket_obj],
         )
         key = IamAccessKey(
-            self,
-            id_=self.input.data.identifier + "_iam_key",
-            user=user.id,
-            depends_on=[user],
+            self, id_=self.input.data.identifier + "_iam_key", user=user.id
         )
 
         policy = IamPolicy(
@@ -485,36 +898,56 @@ class Stack(TerraformStack):
     def _s3_website(self) -> None:
         if not self.input.data.website:
             return
+        from cdktf_cdktf_provider_aws.s3_bucket_website_configuration import (
+            S3BucketWebsiteConfiguration,
+        )
+
         S3BucketWebsiteConfiguration(
             self,
             id_=f"{self.input.data.identifier}-website-conf",
-            bucket=self.bucket_obj.id,
-            **self.input.data.website,
+            bucket=self.bucket_id,
+            **self.input.data.website.model_dump(),
         )
 
     def _s3_request_payer(self) -> None:
         if not self.input.data.request_payer:
             return
+        from cdktf_cdktf_provider_aws.s3_bucket_request_payment_configuration import (
+            S3BucketRequestPaymentConfiguration,
+        )
 
         S3BucketRequestPaymentConfiguration(
             self,
             id_=f"{self.input.data.identifier}-request-payer",
-            bucket=self.bucket_obj.id,
+            bucket=self.bucket_id,
             payer=self.input.data.request_payer,
         )
 
     def _run(self) -> None:
-        self.bucket_obj = self._s3_bucket()
-        self.bucket_ownership_controls = self._s3_bucket_ownership_controls()
-        self._s3_bucket_acl()
+        self.bucket_obj = (
+            self._s3_directory_bucket(directory.availability_zone_id)
+            if (directory := self.input.data.directory_bucket)
+            else self._s3_bucket()
+        )
+        # Every attribute access is a jsii kernel round trip, the tokens are reusable
+        self.bucket_id = self.bucket_obj.id
+        self.bucket_arn = self.bucket_obj.arn
+        # Directory buckets are always owner enforced, without ACLs
+        if not self.input.data.directory_bucket:
+            self.bucket_ownership_controls = self._s3_bucket_ownership_controls()
+            self._s3_bucket_acl()
         self._s3_bucket_logging()
         self._s3_server_side_encryption()
+        self._s3_transfer_acceleration()
+        self.bucket_versioning = self._s3_versioning()
         self._s3_lifecycle_rules()
-        self._s3_versioning()
-        self._s3_storage_class()
         self._s3_cors_rules()
+        self._s3_metrics()
+        self._s3_inventory()
+        self._s3_analytics()
         self._s3_replication_configs()
         self._s3_event_notifications()
+        self.distribution_arn = self._s3_cdn()
         self._s3_bucket_policy()
         self._s3_bucket_iam_user()
         self._outputs()
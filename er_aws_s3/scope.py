@@ -0,0 +1,130 @@
+import argparse
+import json
+import logging
+import os
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any
+
+from external_resources_io.input import parse_model, read_input_from_file
+from pydantic import BaseModel
+
+from er_aws_s3.graph import iter_blocks
+from er_aws_s3.input import AppInterfaceInput
+from er_aws_s3.json_stack import JsonStack
+
+logger = logging.getLogger(__name__)
+
+STATE_VERSION = 4
+# Top-level blocks whose changes concern every resource
+_GLOBAL_BLOCKS = ("terraform", "provider", "output")
+
+
+class PlanScope(BaseModel):
+    """The resources a plan has to refresh and diff"""
+
+    full: bool
+    targets: list[str]
+    reason: str
+
+    def args(self) -> list[str]:
+        """Returns the terraform plan arguments of the scope"""
+        if self.full:
+            return []
+        if not self.targets:
+            # Nothing to change, nothing worth refreshing
+            return ["-refresh=false"]
+        return [f"-target={target}" for target in self.targets]
+
+
+def state_addresses(state: Mapping[str, Any]) -> set[str] | None:
+    """Returns the root module addresses of a terraform.tfstate, None if unknown"""
+    if state.get("version") != STATE_VERSION:
+        return None
+    addresses = set()
+    for resource in state.get("resources", []):
+        if "module" in resource:
+            return None
+        prefix = "data." if resource["mode"] == "data" else ""
+        addresses.add(f"{prefix}{resource['type']}.{resource['name']}")
+    return addresses
+
+
+def plan_scope(
+    state: Mapping[str, Any] | None,
+    previous: AppInterfaceInput | None,
+    current: AppInterfaceInput,
+) -> PlanScope:
+    """Returns the resources the plan of current has to cover.
+
+    Both inputs are synthesized with JsonStack, the twin of Stack, and their
+    resources diffed: every input field maps to the resources it shapes. The
+    state adds the resources it misses or holds on top of the documents, e.g.
+    after a failed apply. Terraform refreshes the targets and their dependencies
+    only.
+    """
+    if previous is None:
+        return PlanScope(full=True, targets=[], reason="no previous input")
+    addresses = state_addresses(state) if state is not None else None
+    if addresses is None:
+        return PlanScope(full=True, targets=[], reason="no usable state")
+
+    old = JsonStack("CDKTF", previous).document
+    new = JsonStack("CDKTF", current).document
+    for block in _GLOBAL_BLOCKS:
+        if old.get(block) != new.get(block):
+            return PlanScope(full=True, targets=[], reason=f"{block} changed")
+
+    old_resources, new_resources = dict(iter_blocks(old)), dict(iter_blocks(new))
+    changed = {
+        address
+        for address in old_resources.keys() | new_resources.keys()
+        if old_resources.get(address) != new_resources.get(address)
+    }
+    drifted = addresses ^ new_resources.keys()
+    targets = sorted(changed | drifted)
+    if targets and set(targets) >= new_resources.keys():
+        return PlanScope(full=True, targets=[], reason="every resource changed")
+    return PlanScope(
+        full=False,
+        targets=targets,
+        reason=f"{len(changed)} changed, {len(drifted)} out of sync with the state",
+    )
+
+
+def main() -> None:
+    """Print the terraform plan arguments scoped to what the input changed"""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--state", type=Path, help="Local terraform.tfstate")
+    parser.add_argument("--previous", type=Path, help="Input of the last applied run")
+    parser.add_argument(
+        "--input",
+        type=Path,
+        default=Path(os.environ.get("ER_INPUT_FILE", "/inputs/input.json")),
+        help="Input of this run, ER_INPUT_FILE by default",
+    )
+    parser.add_argument(
+        "--json", action="store_true", help="Print the scope as JSON instead"
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=os.environ.get("LOG_LEVEL", "INFO"))
+
+    state = None
+    if args.state and args.state.is_file():
+        state = json.loads(args.state.read_text(encoding="utf-8"))
+    previous = None
+    if args.previous and args.previous.is_file():
+        previous = parse_model(
+            AppInterfaceInput, read_input_from_file(file_path=str(args.previous))
+        )
+    current = parse_model(
+        AppInterfaceInput, read_input_from_file(file_path=str(args.input))
+    )
+
+    scope = plan_scope(state, previous, current)
+    logger.info(f"plan scope: {scope.reason}")
+    print(scope.model_dump_json() if args.json else " ".join(scope.args()))  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,398 @@
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import queue
+import socketserver
+import tempfile
+import threading
+import time
+from collections import Counter
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from multiprocessing.connection import Connection
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+from urllib.parse import parse_qs, urlparse
+
+if TYPE_CHECKING:
+    from multiprocessing.process import BaseProcess
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_REQUESTS = 100
+DEFAULT_TIMEOUT = 300.0
+STACK_ID = "CDKTF"
+
+
+def _worker_loop(conn: Connection, warmup: bool) -> None:  # noqa: FBT001
+    """Worker process: synthesizes the requests received over conn until closed"""
+    from external_resources_io.input import parse_model
+    from pydantic import ValidationError
+
+    from er_aws_s3 import node_cache
+    from er_aws_s3.__main__ import synth
+    from er_aws_s3.input import AppInterfaceInput
+
+    # Before the first cdktf import boots the jsii kernel
+    node_cache.configure()
+    if warmup:
+        # Load cdktf, the jsii kernel and the provider modules before the first request
+        from er_aws_s3.fleet import DIMENSIONS, synthetic_input
+
+        with tempfile.TemporaryDirectory() as tmp:
+            synth(
+                AppInterfaceInput.model_validate(
+                    synthetic_input(dict.fromkeys(DIMENSIONS, 1))
+                ),
+                STACK_ID,
+                tmp,
+            )
+
+    while True:
+        try:
+            payload, outdir = conn.recv()
+        except EOFError:
+            return
+        try:
+            ai_input = parse_model(AppInterfaceInput, json.loads(payload))
+        except (ValueError, ValidationError) as e:
+            conn.send((HTTPStatus.UNPROCESSABLE_ENTITY, str(e)))
+            continue
+        try:
+            if outdir:
+                Path(outdir).mkdir(parents=True, exist_ok=True)
+                synth(ai_input, STACK_ID, outdir)
+                conn.send((HTTPStatus.OK, json.dumps({"outdir": outdir})))
+                continue
+            with tempfile.TemporaryDirectory() as tmp:
+                synth(ai_input, STACK_ID, tmp)
+                stack_file = Path(tmp) / "stacks" / STACK_ID / "cdk.tf.json"
+                conn.send((HTTPStatus.OK, stack_file.read_text(encoding="utf-8")))
+        except Exception as e:
+            logger.exception("synthesis failed")
+            conn.send((HTTPStatus.INTERNAL_SERVER_ERROR, repr(e)))
+
+
+class Worker:
+    """A synth worker process, serving one request at a time"""
+
+    def __init__(self, *, warmup: bool) -> None:
+        self.conn, child_conn = multiprocessing.Pipe()
+        # The jsii kernel is a child process talking over pipes, never fork it
+        self.process: BaseProcess = multiprocessing.get_context("spawn").Process(
+            target=_worker_loop, args=(child_conn, warmup), daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        self.requests = 0
+
+    def synth(
+        self, payload: bytes, outdir: str | None, timeout: float
+    ) -> tuple[HTTPStatus, str] | None:
+        """Returns the status and body of a synthesis, None on timeout"""
+        self.requests += 1
+        self.conn.send((payload, outdir))
+        if not self.conn.poll(timeout):
+            return None
+        return self.conn.recv()
+
+    def stop(self) -> None:
+        """Stops the worker, killing it if it does not exit on its own"""
+        self.conn.close()
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+
+
+class WorkerPool:
+    """Fixed set of synth workers bounding the concurrency.
+
+    A worker is recycled after max_requests to cap the jsii object handles
+    leaked by the kernel, and killed when a request exceeds its timeout. A worker
+    failing to start is missing, the pool is degraded, until a later request
+    starts it.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        max_requests: int = DEFAULT_MAX_REQUESTS,
+        timeout: float = DEFAULT_TIMEOUT,
+        *,
+        warmup: bool = True,
+    ) -> None:
+        self.size = size
+        self.max_requests = max_requests
+        self.timeout = timeout
+        self.warmup = warmup
+        self.idle: queue.Queue[Worker] = queue.Queue()
+        for _ in range(size):
+            self.idle.put(Worker(warmup=warmup))
+        self.missing = 0
+        self.stats: Counter[str] = Counter()
+        self.durations = 0.0
+        self._lock = threading.Lock()
+
+    def _start_worker(self) -> None:
+        """Starts an idle worker, counting it missing if it fails to start"""
+        try:
+            worker = Worker(warmup=self.warmup)
+        except Exception:
+            logger.exception("failed to start a worker")
+            with self._lock:
+                self.missing += 1
+            return
+        self.idle.put(worker)
+
+    def _replenish(self) -> None:
+        """Retries starting the missing workers"""
+        with self._lock:
+            missing, self.missing = self.missing, 0
+        for _ in range(missing):
+            self._start_worker()
+
+    def _recycle(self, worker: Worker) -> None:
+        """Replaces a worker by a new one"""
+        self._count("recycles")
+        try:
+            worker.stop()
+        except Exception:
+            logger.exception("failed to stop a worker")
+        self._start_worker()
+
+    def _count(self, key: str, duration: float = 0.0) -> None:
+        with self._lock:
+            self.stats[key] += 1
+            self.durations += duration
+
+    def synth(self, payload: bytes, outdir: str | None) -> tuple[HTTPStatus, str]:
+        """Synthesizes a payload on the next idle worker"""
+        if self.missing:
+            self._replenish()
+        try:
+            worker = self.idle.get(timeout=self.timeout)
+        except queue.Empty:
+            self._count("busy")
+            return HTTPStatus.SERVICE_UNAVAILABLE, "all workers are busy"
+
+        start = time.perf_counter()
+        try:
+            result = worker.synth(payload, outdir, self.timeout)
+        except (OSError, EOFError) as e:
+            # The worker died, e.g. killed by the OOM killer
+            result = HTTPStatus.INTERNAL_SERVER_ERROR, repr(e)
+            worker.requests = self.max_requests
+        if result is None:
+            self._count("timeouts")
+            result = HTTPStatus.GATEWAY_TIMEOUT, f"timed out after {self.timeout}s"
+            worker.process.kill()
+            worker.requests = self.max_requests
+        self._count(f"status_{result[0].value}", time.perf_counter() - start)
+
+        if worker.requests >= self.max_requests:
+            self._recycle(worker)
+        else:
+            self.idle.put(worker)
+        return result
+
+    def close(self) -> None:
+        """Stops every idle worker"""
+        while not self.idle.empty():
+            self.idle.get_nowait().stop()
+
+    def metrics(self) -> str:
+        """Returns the pool metrics in the Prometheus text format"""
+        with self._lock:
+            stats = dict(self.stats)
+            durations = self.durations
+        statuses = {k: v for k, v in stats.items() if k.startswith("status_")}
+        lines = [
+            "# TYPE er_aws_s3_requests_total counter",
+            *(
+                f'er_aws_s3_requests_total{{status="{k.removeprefix("status_")}"}} {v}'
+                for k, v in sorted(statuses.items())
+            ),
+            "# TYPE er_aws_s3_request_duration_seconds summary",
+            f"er_aws_s3_request_duration_seconds_sum {durations}",
+            f"er_aws_s3_request_duration_seconds_count {sum(statuses.values())}",
+            "# TYPE er_aws_s3_rejected_requests_total counter",
+            f"er_aws_s3_rejected_requests_total {stats.get('busy', 0)}",
+            "# TYPE er_aws_s3_timeouts_total counter",
+            f"er_aws_s3_timeouts_total {stats.get('timeouts', 0)}",
+            "# TYPE er_aws_s3_worker_recycles_total counter",
+            f"er_aws_s3_worker_recycles_total {stats.get('recycles', 0)}",
+            "# TYPE er_aws_s3_workers gauge",
+            f"er_aws_s3_workers {self.size}",
+            "# TYPE er_aws_s3_idle_workers gauge",
+            f"er_aws_s3_idle_workers {self.idle.qsize()}",
+            "# TYPE er_aws_s3_missing_workers gauge",
+            f"er_aws_s3_missing_workers {self.missing}",
+        ]
+        return "\n".join(lines) + "\n"
+
+
+class SynthRequestHandler(BaseHTTPRequestHandler):
+    """POST /synth[?outdir=...], GET /healthz and GET /metrics"""
+
+    pool: WorkerPool
+    # Directory the requested outdirs must resolve into, None rejects them
+    outdir_root: Path | None = None
+
+    def address_string(self) -> str:
+        """Unix socket clients have no address"""
+        if isinstance(self.client_address, tuple):
+            return str(self.client_address[0])
+        return "unix"
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002, ANN401
+        """Logs through logging instead of stderr"""
+        logger.info("%s %s", self.address_string(), format % args)
+
+    def _reply(
+        self, status: HTTPStatus, body: str, content_type: str = "application/json"
+    ) -> None:
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _outdir(self, requested: str) -> str:
+        """Resolves a requested outdir under the outdir root.
+
+        Raises a ValueError for an outdir escaping the root, symlinks followed.
+        """
+        if self.outdir_root is None:
+            raise ValueError("outdir requires the server --outdir-root")
+        root = self.outdir_root.resolve()
+        outdir = (root / requested).resolve()
+        if not outdir.is_relative_to(root):
+            raise ValueError(f"outdir {requested!r} is outside of the outdir root")
+        return str(outdir)
+
+    def do_GET(self) -> None:  # noqa: N802
+        """Health and metrics endpoints"""
+        match urlparse(self.path).path:
+            case "/healthz":
+                missing = self.pool.missing
+                self._reply(
+                    HTTPStatus.SERVICE_UNAVAILABLE if missing else HTTPStatus.OK,
+                    json.dumps({
+                        "status": "degraded" if missing else "ok",
+                        "workers": self.pool.size,
+                        "idle": self.pool.idle.qsize(),
+                        "missing": missing,
+                    }),
+                )
+            case "/metrics":
+                self._reply(
+                    HTTPStatus.OK,
+                    self.pool.metrics(),
+                    "text/plain; version=0.0.4",
+                )
+            case _:
+                self._reply(HTTPStatus.NOT_FOUND, json.dumps({"error": "not found"}))
+
+    def do_POST(self) -> None:  # noqa: N802
+        """Synthesizes the AppInterfaceInput of the request body"""
+        url = urlparse(self.path)
+        if url.path != "/synth":
+            self._reply(HTTPStatus.NOT_FOUND, json.dumps({"error": "not found"}))
+            return
+        payload = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        outdir = parse_qs(url.query).get("outdir", [None])[0]
+        if outdir is not None:
+            try:
+                outdir = self._outdir(outdir)
+            except ValueError as e:
+                self._reply(HTTPStatus.BAD_REQUEST, json.dumps({"error": str(e)}))
+                return
+        status, body = self.pool.synth(payload, outdir)
+        if status != HTTPStatus.OK:
+            body = json.dumps({"error": body})
+        self._reply(status, body)
+
+
+class ThreadingUnixHTTPServer(
+    socketserver.ThreadingMixIn, socketserver.UnixStreamServer
+):
+    """HTTP server listening on a Unix socket"""
+
+    daemon_threads = True
+
+    def server_bind(self) -> None:
+        """Replaces a stale socket of a previous run"""
+        Path(self.server_address).unlink(missing_ok=True)  # type: ignore[arg-type]
+        super().server_bind()
+
+
+def make_server(
+    pool: WorkerPool,
+    *,
+    socket: str | None = None,
+    port: int = 0,
+    outdir_root: Path | None = None,
+) -> socketserver.TCPServer:
+    """Returns an HTTP server bound to a Unix socket or to a localhost port"""
+    handler = type(
+        "Handler",
+        (SynthRequestHandler,),
+        {"pool": pool, "outdir_root": outdir_root},
+    )
+    if socket:
+        return ThreadingUnixHTTPServer(socket, handler)
+    return ThreadingHTTPServer(("127.0.0.1", port), handler)
+
+
+def main() -> None:
+    """Serve synthesis requests from warm worker processes"""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    listen = parser.add_mutually_exclusive_group(required=True)
+    listen.add_argument("--socket", help="Unix socket path")
+    listen.add_argument("--port", type=int, help="Localhost TCP port")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes, the maximum concurrent syntheses",
+    )
+    parser.add_argument(
+        "--max-requests",
+        type=int,
+        default=DEFAULT_MAX_REQUESTS,
+        help="Requests served by a worker before it is recycled",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=DEFAULT_TIMEOUT,
+        help="Seconds a request waits for a worker and for its synthesis",
+    )
+    parser.add_argument(
+        "--outdir-root",
+        type=Path,
+        help="Directory the ?outdir= of the requests must be in, none allowed if unset",
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=os.environ.get("LOG_LEVEL", "INFO"))
+
+    pool = WorkerPool(args.workers, args.max_requests, args.timeout)
+    server = make_server(
+        pool, socket=args.socket, port=args.port, outdir_root=args.outdir_root
+    )
+    logger.info(f"serving on {server.server_address}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        pool.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+import argparse
+import logging
+import os
+import sys
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from external_resources_io.exit_status import EXIT_ERROR, EXIT_OK
+from pydantic import ValidationError
+
+# Only the input models, validating must not load cdktf nor the AWS provider
+from er_aws_s3.input import AppInterfaceInput
+
+logger = logging.getLogger(__name__)
+
+# Inputs handed to a worker at once, amortizing the inter-process round trips
+CHUNK_SIZE = 64
+
+
+@dataclass
+class ValidationResult:
+    """Errors of an input file, empty when valid"""
+
+    path: Path
+    errors: list[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        """True if the input is valid"""
+        return not self.errors
+
+
+def validate_file(path: Path) -> ValidationResult:
+    """Validates an input file, parsing its bytes with the pydantic JSON parser"""
+    try:
+        AppInterfaceInput.model_validate_json(path.read_bytes())
+    except ValidationError as e:
+        return ValidationResult(
+            path,
+            [
+                f"{'.'.join(str(loc) for loc in error['loc']) or '<root>'}: "
+                f"{error['msg']}"
+                for error in e.errors(include_url=False)
+            ],
+        )
+    except OSError as e:
+        return ValidationResult(path, [str(e)])
+    return ValidationResult(path)
+
+
+def iter_files(sources: Iterable[str]) -> Iterator[Path]:
+    """Yields the given files and the *.json files of the given directories"""
+    for source in sources:
+        path = Path(source)
+        if path.is_dir():
+            yield from sorted(path.rglob("*.json"))
+        else:
+            yield path
+
+
+def validate_files(paths: Iterable[Path], workers: int = 1) -> list[ValidationResult]:
+    """Validates every file, in parallel with workers > 1 (0 for one per CPU)"""
+    paths = list(paths)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(paths) <= CHUNK_SIZE:
+        return [validate_file(path) for path in paths]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(validate_file, paths, chunksize=CHUNK_SIZE))
+
+
+def main() -> None:
+    """Validate AppInterface inputs without synthesizing them"""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument(
+        "sources", nargs="+", help="Input files or directories of *.json inputs"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="Number of worker processes, 0 for one per CPU core",
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=os.environ.get("LOG_LEVEL", "INFO"))
+
+    results = validate_files(iter_files(args.sources), args.workers)
+    invalid = [r for r in results if not r.ok]
+    for result in invalid:
+        for error in result.errors:
+            logger.error("%s: %s", result.path, error)
+    logger.info("%d inputs validated, %d invalid", len(results), len(invalid))
+    sys.exit(EXIT_ERROR if invalid else EXIT_OK)
+
+
+if __name__ == "__main__":
+    main()
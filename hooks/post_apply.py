@@ -0,0 +1,37 @@
+#!/usr/bin/env python
+import logging
+import os
+
+from external_resources_io.config import Action, Config
+from external_resources_io.input import parse_model, read_input_from_file
+from external_resources_io.log import setup_logging
+
+from er_aws_s3.cache import SynthCache, state_id
+from er_aws_s3.input import AppInterfaceInput
+
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    """Records the input synthesized for the state as applied, after an apply.
+
+    After a destroy the state is forgotten, a later apply of the same input plans.
+    """
+    setup_logging()
+    if (cache := SynthCache.from_env()) is None:
+        return
+    ai_input = parse_model(
+        AppInterfaceInput,
+        read_input_from_file(
+            file_path=os.environ.get("ER_INPUT_FILE", "/inputs/input.json")
+        ),
+    )
+    # The fields are read from the environment
+    if Config().action == Action.DESTROY:  # type: ignore[call-arg]
+        cache.mark_destroyed(state_id(ai_input))
+    elif not cache.mark_applied(state_id(ai_input)):
+        logger.info("No synthesized input pending for this state")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+#!/usr/bin/env python
+import logging
+import os
+import sys
+from pathlib import Path
+
+from external_resources_io.config import Action, Config
+from external_resources_io.exit_status import EXIT_ERROR, EXIT_OK
+from external_resources_io.log import setup_logging
+
+from er_aws_s3.plan import analyze_file
+
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    """Flags the destructive S3 changes of the plan, streaming it"""
+    setup_logging()
+    config = Config()
+    verdict = analyze_file(
+        Path(config.plan_file_json), destroy=config.action == Action.DESTROY
+    )
+    verdict_file = Path(
+        os.environ.get(
+            "ER_VERDICT_FILE", Path(config.plan_file_json).parent / "verdict.json"
+        )
+    )
+    verdict_file.write_text(verdict.model_dump_json(indent=2), encoding="utf-8")
+    for finding in verdict.findings:
+        logger.error(f"{finding.address}: {finding.reason}")
+    for warning in verdict.warnings:
+        logger.warning(f"{warning.address}: {warning.reason}")
+    logger.info(
+        f"{verdict.resource_changes} resource changes, "
+        f"{len(verdict.findings)} destructive, {len(verdict.warnings)} warnings, "
+        f"verdict in {verdict_file}"
+    )
+    sys.exit(EXIT_ERROR if verdict.destructive else EXIT_OK)
+
+
+if __name__ == "__main__":
+    main()
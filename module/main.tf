@@ -14,8 +14,9 @@ resource "aws_s3_bucket_ownership_controls" "this" {
 }
 
 resource "aws_s3_bucket_acl" "this" {
-  bucket = aws_s3_bucket.this.id
-  acl    = "private"
+  bucket     = aws_s3_bucket.this.id
+  acl        = "private"
+  depends_on = [aws_s3_bucket_ownership_controls.this]
 }
 
 # resource "aws_s3_bucket_logging" "this" {
@@ -51,7 +52,7 @@ resource "aws_s3_bucket_lifecycle_configuration" "this" {
       status = rule.value.status
 
       dynamic "filter" {
-        for_each = rule.value.filter != null ? [rule.value.filter] : []
+        for_each = try(rule.value.filter, null) != null ? [rule.value.filter] : []
         content {
           dynamic "and" {
             for_each = lookup(filter.value, "and", null) != null ? [filter.value.and] : []
@@ -77,7 +78,7 @@ resource "aws_s3_bucket_lifecycle_configuration" "this" {
       }
 
       dynamic "transition" {
-        for_each = try(rule.value.transition,null) != null ? [rule.value.transition] : []
+        for_each = flatten([try(rule.value.transition, [])])
         content {
           storage_class = transition.value.storage_class
           days          = lookup(transition.value, "days", null)
@@ -86,7 +87,7 @@ resource "aws_s3_bucket_lifecycle_configuration" "this" {
       }
 
       dynamic "expiration" {
-        for_each = try(rule.value.expiration,null) != null ? [rule.value.expiration] : []
+        for_each = flatten([try(rule.value.expiration, [])])
         content {
           days                        = lookup(expiration.value, "days", null)
           date                        = lookup(expiration.value, "date", null)
@@ -102,14 +103,14 @@ resource "aws_s3_bucket_lifecycle_configuration" "this" {
       }
 
       dynamic "noncurrent_version_expiration" {
-        for_each = try(rule.value.noncurrent_version_expiration, null) != null ? [rule.value.noncurrent_version_expiration] : []
+        for_each = flatten([try(rule.value.noncurrent_version_expiration, [])])
         content {
           noncurrent_days = lookup(noncurrent_version_expiration.value, "noncurrent_days", null)
         }
       }
 
       dynamic "noncurrent_version_transition" {
-        for_each = try(rule.value.noncurrent_version_transition, null) != null ? [rule.value.noncurrent_version_transition] : []
+        for_each = flatten([try(rule.value.noncurrent_version_transition, [])])
         content {
           noncurrent_days = lookup(noncurrent_version_transition.value, "noncurrent_days", null)
           storage_class  = lookup(noncurrent_version_transition.value, "storage_class", null)
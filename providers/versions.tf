@@ -0,0 +1,13 @@
+# The AWS provider version cdktf-cdktf-provider-aws pins, cached in the image
+# for the offline config of the cdktf stack. Keep in sync with the package,
+# tests/test_providers.py checks it.
+terraform {
+  required_version = "1.6.6"
+
+  required_providers {
+    aws = {
+      source  = "hashicorp/aws"
+      version = "5.84.0"
+    }
+  }
+}
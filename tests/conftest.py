@@ -61,3 +61,254 @@ def input_data() -> dict:
 def input_object() -> AppInterfaceInput:
     """Returns an AppInterfaceInput object"""
     return AppInterfaceInput.model_validate(input_data())
+
+
+def _with_data(**data: object) -> dict:
+    """Returns the JSON input data updated with the given data attributes"""
+    input_ = input_data()
+    input_["data"].update(data)
+    return input_
+
+
+def input_corpus() -> dict[str, dict]:
+    """Returns a corpus of JSON input data covering every Stack feature"""
+    return {
+        "default": input_data(),
+        "minimal": _with_data(default_tags=None, lifecycle_rules=None, tags=None),
+        "versioning": _with_data(versioning=True, lifecycle_rules=None),
+        "storage_class": _with_data(versioning=True, storage_class="standard_ia"),
+        "cors": _with_data(
+            cors_rules=[
+                {
+                    "allowed_headers": ["*"],
+                    "allowed_methods": ["GET", "HEAD"],
+                    "allowed_origins": ["https://example.com"],
+                    "max_age_seconds": 3000,
+                }
+            ]
+        ),
+        "bucket_policy": _with_data(bucket_policy='{"Version": "2012-10-17"}'),
+        "logging": _with_data(
+            s3_bucket_logging={"identifier": "logs", "target_prefix": "test-s3/"}
+        ),
+        "replication": _with_data(
+            versioning=True,
+            replication_configurations=[
+                {
+                    "rule_name": "to-dr",
+                    "status": "Enabled",
+                    "destination_bucket_identifier": "test-s3-dr",
+                },
+                {
+                    "rule_name": "to-archive",
+                    "status": "Enabled",
+                    "destination_bucket_identifier": "test-s3-archive",
+                    "storage_class": "GLACIER",
+                },
+            ],
+        ),
+        "replication_time_control": _with_data(
+            versioning=True,
+            replication_configurations=[
+                {
+                    "rule_name": "logs-to-dr",
+                    "status": "Enabled",
+                    "destination_bucket_identifier": "test-s3-dr",
+                    "priority": 10,
+                    "filter_prefix": "logs/",
+                    "replication_time_control": True,
+                },
+                {
+                    "rule_name": "all-to-dr",
+                    "status": "Enabled",
+                    "destination_bucket_identifier": "test-s3-dr",
+                    "priority": 1,
+                    "replication_metrics": True,
+                },
+            ],
+        ),
+        "event_notifications": _with_data(
+            event_notifications=[
+                {
+                    "destination_type": "sqs",
+                    "destination_identifier": "arn:aws:sqs:us-east-1:123:queue",
+                    "event_type": ["s3:ObjectCreated:*"],
+                    "filter_prefix": "in/",
+                    "filter_suffix": ".json",
+                },
+                {
+                    "destination_type": "sns",
+                    "destination_identifier": "arn:aws:sns:us-east-1:123:topic",
+                    "event_type": ["s3:ObjectRemoved:*"],
+                    "filter_prefix": "out/",
+                    "filter_suffix": ".json",
+                },
+            ]
+        ),
+        "sqs_notification": _with_data(
+            event_notifications=[
+                {
+                    "destination_type": "sqs",
+                    "destination_identifier": "arn:aws:sqs:us-east-1:123:queue",
+                    "event_type": ["s3:ObjectCreated:*"],
+                    "filter_prefix": "",
+                    "filter_suffix": "",
+                }
+            ]
+        ),
+        "shared_data_sources": _with_data(
+            versioning=True,
+            s3_bucket_logging={"identifier": "test-s3-dr"},
+            replication_configurations=[
+                {
+                    "rule_name": "to-dr",
+                    "status": "Enabled",
+                    "destination_bucket_identifier": "test-s3-dr",
+                }
+            ],
+            event_notifications=[
+                {
+                    "destination_type": "sqs",
+                    "destination_identifier": "queue",
+                    "event_type": ["s3:ObjectCreated:*"],
+                    "filter_prefix": "in/",
+                    "filter_suffix": "",
+                },
+                {
+                    "destination_type": "sqs",
+                    "destination_identifier": "queue",
+                    "event_type": ["s3:ObjectRemoved:*"],
+                    "filter_prefix": "out/",
+                    "filter_suffix": "",
+                },
+                {
+                    "destination_type": "sns",
+                    "destination_identifier": "topic",
+                    "event_type": ["s3:ObjectRestore:*"],
+                    "filter_prefix": "",
+                    "filter_suffix": "",
+                },
+            ],
+        ),
+        "lambda_eventbridge": _with_data(
+            eventbridge=True,
+            event_notifications=[
+                {
+                    "destination_type": "lambda",
+                    "destination_identifier": "thumbnailer",
+                    "event_type": ["s3:ObjectCreated:*"],
+                    "filter_prefix": "images/",
+                    "filter_suffix": ".png",
+                },
+                {
+                    "destination_type": "lambda",
+                    "destination_identifier": "thumbnailer",
+                    "event_type": ["s3:ObjectCreated:*"],
+                    "filter_prefix": "images/",
+                    "filter_suffix": ".jpg",
+                },
+                {
+                    "destination_type": "lambda",
+                    "destination_identifier": (
+                        "arn:aws:lambda:us-east-1:123:function:audit:prod"
+                    ),
+                    "event_type": ["s3:ObjectRemoved:*"],
+                    "filter_prefix": "",
+                    "filter_suffix": "",
+                },
+                {
+                    "destination_type": "lambda",
+                    "destination_identifier": (
+                        "arn:aws:lambda:us-east-1:123:function:restorer:prod"
+                    ),
+                    "event_type": ["s3:ObjectRestore:*"],
+                    "filter_prefix": "",
+                    "filter_suffix": "",
+                },
+                {
+                    "destination_type": "eventbridge",
+                    "destination_identifier": (
+                        "arn:aws:lambda:us-east-1:123:function:indexer"
+                    ),
+                    "event_type": ["s3:ObjectCreated:*"],
+                    "filter_prefix": "images/",
+                    "filter_suffix": ".png",
+                },
+                {
+                    "destination_type": "eventbridge",
+                    "destination_identifier": "arn:aws:sqs:us-east-1:123:archive",
+                    "event_type": ["s3:ObjectCreated:*", "s3:ObjectRemoved:*"],
+                    "filter_prefix": "",
+                    "filter_suffix": "",
+                },
+            ],
+        ),
+        "iam_actions": _with_data(acl="public-read", allow_object_tagging=True),
+        "bucket_attributes": _with_data(force_destroy=True, object_lock_enabled=True),
+        "performance": _with_data(
+            performance={"transfer_acceleration": True},
+            server_side_encryption_configuration={
+                "rule": {
+                    "apply_server_side_encryption_by_default": {
+                        "sse_algorithm": "aws:kms",
+                        "kms_master_key_id": "alias/test-s3",
+                    }
+                }
+            },
+        ),
+        "directory_bucket": _with_data(
+            directory_bucket={"availability_zone_id": "use1-az4"},
+            versioning=True,
+            lifecycle_rules=[
+                {"id": "expire", "enabled": "true", "expiration": {"days": 7}}
+            ],
+            bucket_policy='{"Version": "2012-10-17"}',
+        ),
+        "cdn": _with_data(
+            website={
+                "index_document": {"suffix": "index.html"},
+                "error_document": {"key": "error.html"},
+                "cdn": {"default_ttl": 600, "price_class": "PriceClass_100"},
+            },
+            bucket_policy=(
+                '{"Version": "2012-10-17", "Statement": {"Sid": "Deny", '
+                '"Effect": "Deny", "Principal": "*", "Action": "s3:DeleteBucket", '
+                '"Resource": "arn:aws:s3:::test-s3"}}'
+            ),
+        ),
+        "monitoring": _with_data(
+            metrics_configurations=[
+                {"name": "EntireBucket"},
+                {
+                    "name": "hot-prefix",
+                    "filter_prefix": "uploads/",
+                    "filter_tags": {"team": "app-sre"},
+                },
+            ],
+            inventory_configurations=[
+                {
+                    "name": "daily",
+                    "destination_bucket_identifier": "test-s3-inventory",
+                    "destination_prefix": "inventory/",
+                    "optional_fields": ["Size", "StorageClass"],
+                },
+                {
+                    "name": "weekly-versions",
+                    "destination_bucket_identifier": "test-s3",
+                    "format": "ORC",
+                    "frequency": "Weekly",
+                    "included_object_versions": "All",
+                    "filter_prefix": "uploads/",
+                },
+            ],
+            analytics_configurations=[
+                {"name": "console-only", "filter_prefix": "logs/"},
+                {
+                    "name": "exported",
+                    "filter_tags": {"team": "app-sre"},
+                    "destination_bucket_identifier": "test-s3-inventory",
+                    "destination_prefix": "analytics/",
+                },
+            ],
+        ),
+    }
@@ -0,0 +1,106 @@
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from er_aws_s3 import batch
+from er_aws_s3.batch import BatchItem, BatchResult, iter_inputs, synth_batch
+
+from .conftest import input_data
+
+
+def test_iter_inputs_directory(tmp_path: Path) -> None:
+    """Every json file of a directory is an item named after the file"""
+    (tmp_path / "b.json").write_text("{}")
+    (tmp_path / "a.json").write_text("{}")
+    (tmp_path / "ignored.txt").write_text("{}")
+    assert [i.name for i in iter_inputs(str(tmp_path))] == ["a", "b"]
+
+
+def test_iter_inputs_jsonl(tmp_path: Path) -> None:
+    """JSONL items are named after the bucket identifier or their line"""
+    source = tmp_path / "inputs.jsonl"
+    source.write_text(json.dumps(input_data()) + "\n\nnot-json\n")
+    assert [i.name for i in iter_inputs(str(source))] == ["test-s3", "line-3"]
+
+
+def test_synth_batch_isolates_errors(tmp_path: Path) -> None:
+    """A bad input does not abort the batch"""
+    results = synth_batch(
+        [
+            BatchItem(name="bad", payload='{"data": {}}'),
+            BatchItem(name="good", payload=json.dumps(input_data())),
+        ],
+        str(tmp_path),
+    )
+    assert [(r.name, r.ok) for r in results] == [("bad", False), ("good", True)]
+    assert (tmp_path / "good" / "stacks" / "CDKTF" / "cdk.tf.json").exists()
+
+
+def test_iter_inputs_jsonl_names_are_safe_and_unique(tmp_path: Path) -> None:
+    """Unsafe identifiers fall back to the line, duplicates get its suffix"""
+    source = tmp_path / "inputs.jsonl"
+    escaping = input_data()
+    escaping["data"]["identifier"] = "../escaped"
+    source.write_text(
+        "\n".join(json.dumps(d) for d in (input_data(), input_data(), escaping))
+    )
+    assert [i.name for i in iter_inputs(str(source))] == [
+        "test-s3",
+        "test-s3-line-2",
+        "line-3",
+    ]
+
+
+def test_synth_batch_rejects_unsafe_and_duplicate_names(tmp_path: Path) -> None:
+    """Items never write outside outdir nor overwrite each other"""
+    payload = json.dumps({"data": {}})
+    results = synth_batch(
+        [
+            BatchItem(name="a", payload=payload),
+            BatchItem(name="a", payload=payload),
+            BatchItem(name="..", payload=payload),
+        ],
+        str(tmp_path / "out"),
+    )
+    assert [r.error for r in results][1:] == [
+        "duplicate name 'a'",
+        "unsafe item name '..'",
+    ]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["out"]
+
+
+def _synth_or_crash(item: BatchItem, outdir: str) -> BatchResult:
+    """Stands for synth_item in the spawned workers, without booting jsii"""
+    if item.name == "crash":
+        os._exit(1)
+    return BatchResult(name=item.name, outdir=str(Path(outdir) / item.name))
+
+
+def test_synth_batch_pool(tmp_path: Path) -> None:
+    """Pool workers synthesize the items, results keep the input order"""
+    results = synth_batch(
+        [
+            BatchItem(name="bad", payload='{"data": {}}'),
+            BatchItem(name="good", payload=json.dumps(input_data())),
+        ],
+        str(tmp_path),
+        workers=2,
+    )
+    assert [(r.name, r.ok) for r in results] == [("bad", False), ("good", True)]
+    assert (tmp_path / "good" / "stacks" / "CDKTF" / "cdk.tf.json").exists()
+
+
+def test_synth_batch_pool_isolates_crashes(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A crashed worker fails its own item only, the others are retried"""
+    monkeypatch.setattr(batch, "synth_item", _synth_or_crash)
+    names = ["a", "b", "crash", "c", "d"]
+    results = synth_batch(
+        [BatchItem(name=name, payload="{}") for name in names], str(tmp_path), 2
+    )
+    assert [(r.name, r.error) for r in results] == [
+        (name, "worker crashed" if name == "crash" else None) for name in names
+    ]
@@ -0,0 +1,53 @@
+from pathlib import Path
+
+from er_aws_s3.benchmark import PHASES, growth_exponent, measure_isolated, run
+from er_aws_s3.fleet import (
+    DIMENSIONS,
+    MAX_CORS_RULES,
+    synthetic_fleet,
+    synthetic_input,
+)
+from er_aws_s3.input import AppInterfaceInput
+
+
+def test_synthetic_input_is_capped_at_aws_limits() -> None:
+    """The generator never exceeds the AWS limits and yields valid inputs"""
+    ai_input = AppInterfaceInput.model_validate(
+        synthetic_input(dict.fromkeys(DIMENSIONS, 10_000))
+    )
+    assert len(ai_input.data.cors_rules or []) == MAX_CORS_RULES
+    assert len(ai_input.data.tags or {}) == DIMENSIONS["tags"]
+
+
+def test_synthetic_fleet() -> None:
+    """Every fleet member has its own identifier"""
+    fleet = [i["data"]["identifier"] for i in synthetic_fleet(3)]
+    assert len(set(fleet)) == 3
+
+
+def test_growth_exponent() -> None:
+    """Linear and quadratic growths are told apart"""
+    assert growth_exponent([1, 10], [1.0, 10.0]) == 1
+    assert growth_exponent([1, 10], [1.0, 100.0]) == 2
+    assert growth_exponent([1], [1.0]) is None
+
+
+def test_measure_isolated_covers_node(tmp_path: Path) -> None:
+    """Each measurement reports its own peak RSS, the jsii node kernel included"""
+    python = measure_isolated(synthetic_input({}), "python", tmp_path)
+    cdktf = measure_isolated(synthetic_input({}), "cdktf", tmp_path)
+    assert set(python["phases"]) == set(cdktf["phases"]) == set(PHASES)
+    assert cdktf["peak_rss_kb"] > python["peak_rss_kb"] > 0
+
+
+def test_run_report() -> None:
+    """The report holds every phase of every measured count"""
+    report = run(engine="python", counts=(1, 5), dimensions=("cors_rules", "tags"))
+    assert [(r["dimension"], r["count"]) for r in report["results"]] == [
+        ("cors_rules", 1),
+        ("cors_rules", 5),
+        ("tags", 1),
+        ("tags", 5),
+    ]
+    assert all(set(r["phases"]) == set(PHASES) for r in report["results"])
+    assert set(report["scaling"]) == {"cors_rules", "tags"}
@@ -0,0 +1,157 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from external_resources_io.exit_status import EXIT_OK, EXIT_SKIP
+
+from er_aws_s3.cache import SynthCache, state_id
+from er_aws_s3.input import AppInterfaceInput
+
+from .conftest import input_data
+
+HOOK = Path(__file__).parents[1] / "hooks" / "post_apply.py"
+
+
+def _outdir(path: Path, content: str) -> Path:
+    stack_dir = path / "stacks" / "CDKTF"
+    stack_dir.mkdir(parents=True)
+    (stack_dir / "cdk.tf.json").write_text(content)
+    return path
+
+
+def test_key_is_canonical() -> None:
+    """The key does not depend on the key order of the input"""
+    data = input_data()
+    reordered = dict(reversed(list(input_data().items())))
+    assert SynthCache.key(data) == SynthCache.key(reordered)
+    data["data"]["identifier"] = "other"
+    assert SynthCache.key(data) != SynthCache.key(reordered)
+
+
+def test_key_covers_the_synth_settings(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """The engine and the plugin cache change the outdir, hence the key"""
+    monkeypatch.delenv("ER_SYNTH_ENGINE", raising=False)
+    monkeypatch.delenv("TF_PLUGIN_CACHE_DIR", raising=False)
+    keys = {SynthCache.key(input_data())}
+    monkeypatch.setenv("ER_SYNTH_ENGINE", "python")
+    keys.add(SynthCache.key(input_data()))
+    monkeypatch.setenv("TF_PLUGIN_CACHE_DIR", str(tmp_path))
+    keys.add(SynthCache.key(input_data()))
+    assert len(keys) == 3
+
+
+def test_store_and_restore(tmp_path: Path) -> None:
+    """A stored outdir is restored on a hit"""
+    cache = SynthCache(tmp_path / "cache")
+    assert not cache.restore("key", tmp_path / "restored")
+    cache.store("key", _outdir(tmp_path / "out", "{}"))
+    assert cache.restore("key", tmp_path / "restored")
+    assert (
+        tmp_path / "restored" / "stacks" / "CDKTF" / "cdk.tf.json"
+    ).read_text() == "{}"
+
+
+def test_restore_replaces_outdir(tmp_path: Path) -> None:
+    """No file of an earlier synth survives a restore"""
+    cache = SynthCache(tmp_path / "cache")
+    cache.store("key", _outdir(tmp_path / "out", "{}"))
+    stale = _outdir(tmp_path / "restored", "stale").joinpath("terraform.rc")
+    stale.write_text("stale")
+    assert cache.restore("key", tmp_path / "restored")
+    assert not stale.exists()
+
+
+def test_evict_least_recently_used(tmp_path: Path) -> None:
+    """The least recently used entries are evicted beyond max_bytes"""
+    cache = SynthCache(tmp_path / "cache", max_bytes=25)
+    cache.store("a", _outdir(tmp_path / "a", "a" * 10))
+    cache.store("b", _outdir(tmp_path / "b", "b" * 10))
+    assert cache.restore("a", tmp_path / "restored")
+    cache.store("c", _outdir(tmp_path / "c", "c" * 10))
+    assert sorted(e.name for e in cache.entries.iterdir()) == ["a", "c"]
+
+
+def test_unchanged_only_once_applied(tmp_path: Path) -> None:
+    """A hit is unchanged only if it is the last key applied to the same state"""
+    cache = SynthCache(tmp_path / "cache")
+    assert not cache.mark_applied("state")
+    cache.mark_pending("a", "state")
+    # The apply failed: the retry must plan again
+    assert not cache.is_unchanged("a", "state")
+    assert cache.mark_applied("state")
+    assert cache.is_unchanged("a", "state")
+    assert not cache.is_unchanged("a", "other-state")
+    cache.mark_pending("b", "state")
+    assert cache.is_unchanged("a", "state")
+    cache.mark_applied("state")
+    assert not cache.is_unchanged("a", "state")
+
+
+def _post_apply(input_file: Path, cache: SynthCache, action: str) -> None:
+    subprocess.run(
+        [sys.executable, str(HOOK)],
+        env={
+            **os.environ,
+            "PYTHONPATH": str(HOOK.parents[1]),
+            "ER_INPUT_FILE": str(input_file),
+            "ER_SYNTH_CACHE_DIR": str(cache.directory),
+            "ACTION": action,
+        },
+        check=True,
+    )
+
+
+def test_post_apply_hook(tmp_path: Path) -> None:
+    """The hook records the pending input of the state as applied"""
+    input_file = tmp_path / "input.json"
+    input_file.write_text(json.dumps(input_data()))
+    cache = SynthCache(tmp_path / "cache")
+    state = state_id(AppInterfaceInput.model_validate(input_data()))
+    cache.mark_pending("key", state)
+    _post_apply(input_file, cache, "apply")
+    assert cache.is_unchanged("key", state)
+
+
+def test_destroy_after_apply(tmp_path: Path) -> None:
+    """Destroying the last applied input is never skipped"""
+    input_file = tmp_path / "input.json"
+    input_file.write_text(json.dumps(input_data()))
+    cache = SynthCache(tmp_path / "cache")
+
+    def run(action: str) -> int:
+        return subprocess.run(
+            [sys.executable, "-m", "er_aws_s3"],
+            env={
+                **os.environ,
+                "ER_INPUT_FILE": str(input_file),
+                "ER_OUTDIR": str(tmp_path / "out"),
+                "ER_SYNTH_ENGINE": "python",
+                "ER_SYNTH_CACHE_DIR": str(cache.directory),
+                "ACTION": action,
+            },
+            check=False,
+        ).returncode
+
+    assert run("apply") == EXIT_OK
+    _post_apply(input_file, cache, "apply")
+    assert run("apply") == EXIT_SKIP
+    assert run("destroy") == EXIT_OK
+
+
+def test_apply_after_destroy(tmp_path: Path) -> None:
+    """Once destroyed, applying the same input again plans"""
+    input_file = tmp_path / "input.json"
+    input_file.write_text(json.dumps(input_data()))
+    cache = SynthCache(tmp_path / "cache")
+    state = state_id(AppInterfaceInput.model_validate(input_data()))
+    cache.mark_pending("key", state)
+    _post_apply(input_file, cache, "apply")
+    cache.mark_pending("key", state)
+    _post_apply(input_file, cache, "destroy")
+    assert not cache.is_unchanged("key", state)
+    assert not cache.mark_applied(state)
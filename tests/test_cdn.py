@@ -0,0 +1,90 @@
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from er_aws_s3.cdn import merged_bucket_policy
+from er_aws_s3.input import AppInterfaceInput
+from er_aws_s3.json_stack import JsonStack
+
+from .conftest import _with_data, input_corpus
+
+
+def test_merged_bucket_policy() -> None:
+    """Statements are appended, the input policy is untouched without them"""
+    policy = '{"Statement": {"Sid": "A"}}'
+    assert merged_bucket_policy(policy, []) == policy
+    assert merged_bucket_policy(None, []) is None
+    assert json.loads(merged_bucket_policy(policy, [{"Sid": "B"}]) or "") == {
+        "Version": "2012-10-17",
+        "Statement": [{"Sid": "A"}, {"Sid": "B"}],
+    }
+
+
+def test_cdn() -> None:
+    """The distribution reads the REST endpoint, allowed by the bucket policy"""
+    ai_input = AppInterfaceInput.model_validate(input_corpus()["cdn"])
+    document = JsonStack("CDKTF", ai_input).document
+    resources = document["resource"]
+
+    distribution = resources["aws_cloudfront_distribution"]["test-s3-distribution"]
+    assert distribution["origin"] == [
+        {
+            "domain_name": "${aws_s3_bucket.test-s3.bucket_regional_domain_name}",
+            "origin_id": "s3",
+            "origin_access_control_id": (
+                "${aws_cloudfront_origin_access_control.test-s3-oac.id}"
+            ),
+        }
+    ]
+    assert distribution["default_root_object"] == "index.html"
+    assert distribution["default_cache_behavior"]["cache_policy_id"] == (
+        "${aws_cloudfront_cache_policy.test-s3-cache-policy.id}"
+    )
+    cache_policy = resources["aws_cloudfront_cache_policy"]["test-s3-cache-policy"]
+    assert (cache_policy["min_ttl"], cache_policy["default_ttl"]) == (0, 600)
+
+    policy = json.loads(
+        resources["aws_s3_bucket_policy"]["test-s3-bucket_policy"]["policy"]
+    )
+    assert [statement["Sid"] for statement in policy["Statement"]] == [
+        "Deny",
+        "AllowCloudFrontServicePrincipalReadOnly",
+    ]
+    assert policy["Statement"][1]["Condition"] == {
+        "StringEquals": {
+            "AWS:SourceArn": "${aws_cloudfront_distribution.test-s3-distribution.arn}"
+        }
+    }
+    assert document["output"]["output_prefix_s3_bucket__cloudfront_domain"] == {
+        "value": "${aws_cloudfront_distribution.test-s3-distribution.domain_name}"
+    }
+
+
+def test_website_without_cdn() -> None:
+    """Without a cdn block nothing changes"""
+    ai_input = AppInterfaceInput.model_validate(
+        _with_data(website={"index_document": {"suffix": "index.html"}})
+    )
+    resources = JsonStack("CDKTF", ai_input).document["resource"]
+    assert "aws_cloudfront_distribution" not in resources
+    assert "aws_s3_bucket_policy" not in resources
+
+
+@pytest.mark.parametrize(
+    ("data", "message"),
+    [
+        (
+            {"website": {"cdn": {"default_ttl": 10, "max_ttl": 5}}},
+            r"cdn: TTLs must be min_ttl \(0\) <= default_ttl \(10\) <= max_ttl \(5\)",
+        ),
+        (
+            {"website": {"cdn": {}}, "bucket_policy": "{not json"},
+            "bucket_policy: not JSON, the cdn statement cannot merge",
+        ),
+    ],
+)
+def test_invalid_cdn(data: dict, message: str) -> None:
+    """CloudFront settings AWS would reject fail at input validation"""
+    with pytest.raises(ValidationError, match=message):
+        AppInterfaceInput.model_validate(_with_data(**data))
@@ -0,0 +1,89 @@
+import json
+from pathlib import Path
+
+import pytest
+from cdktf import Testing
+
+from er_aws_s3.config import generate_tf_files
+from er_aws_s3.input import AppInterfaceInput, TerraformModuledata
+from er_aws_s3.s3 import Stack
+
+from .conftest import input_corpus, input_data
+
+# Attributes of aws_s3_bucket.this in module/main.tf, tags aside
+MODULE_BUCKET_ATTRIBUTES = (
+    "bucket",
+    "bucket_prefix",
+    "force_destroy",
+    "object_lock_enabled",
+)
+
+
+def test_generate_tf_files(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """The tfvars and the backend of the HCL module are written"""
+    input_file = tmp_path / "input.json"
+    input_file.write_text(json.dumps(input_data()), encoding="utf-8")
+    monkeypatch.setenv("INPUT_FILE", str(input_file))
+    monkeypatch.setenv("TF_VARS_FILE", str(tmp_path / "terraform.tfvars.json"))
+    monkeypatch.setenv("BACKEND_TF_FILE", str(tmp_path / "backend.tf"))
+
+    generate_tf_files()
+
+    tf_vars = json.loads((tmp_path / "terraform.tfvars.json").read_text())
+    assert set(tf_vars) == {
+        "s3_bucket",
+        "lifecycle_rules",
+        "server_side_encryption_configuration",
+        "tags",
+        "region",
+    }
+    assert tf_vars["region"] == "us-east-1"
+    backend = (tmp_path / "backend.tf").read_text()
+    assert 'bucket = "external-resources-terraform-state-dev"' in backend
+
+
+@pytest.mark.parametrize("name", sorted(input_corpus()))
+def test_tf_vars_match_cdktf_stack(name: str) -> None:
+    """The HCL module gets the bucket resources the cdktf Stack emits"""
+    ai_input = AppInterfaceInput.model_validate(input_corpus()[name])
+    if ai_input.data.directory_bucket:
+        pytest.skip("The HCL module does not support directory buckets")
+    tf_vars = json.loads(
+        TerraformModuledata(ai_input=ai_input).model_dump_json(exclude_none=True)
+    )
+    resources = json.loads(Testing.synth(Stack(Testing.app(), "CDKTF", ai_input)))[
+        "resource"
+    ]
+
+    bucket = {
+        key: tf_vars["s3_bucket"][key]
+        for key in MODULE_BUCKET_ATTRIBUTES
+        if key in tf_vars["s3_bucket"]
+    }
+    if tf_vars["tags"]:
+        bucket["tags"] = tf_vars["tags"]
+    assert resources["aws_s3_bucket"][ai_input.data.identifier] == bucket
+    assert resources["aws_s3_bucket_server_side_encryption_configuration"][
+        "s3ss_enc_conf"
+    ]["rule"] == [tf_vars["server_side_encryption_configuration"]]
+    lifecycle = resources.get("aws_s3_bucket_lifecycle_configuration", {})
+    assert [configuration["rule"] for configuration in lifecycle.values()] == (
+        [tf_vars["lifecycle_rules"]] if tf_vars["lifecycle_rules"] else []
+    )
+
+
+def test_generate_tf_files_directory_bucket(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """The HCL module refuses the directory buckets it cannot create"""
+    input_file = tmp_path / "input.json"
+    input_file.write_text(
+        json.dumps(input_corpus()["directory_bucket"]), encoding="utf-8"
+    )
+    monkeypatch.setenv("INPUT_FILE", str(input_file))
+    monkeypatch.setenv("TF_VARS_FILE", str(tmp_path / "terraform.tfvars.json"))
+    monkeypatch.setenv("BACKEND_TF_FILE", str(tmp_path / "backend.tf"))
+
+    with pytest.raises(ValueError, match="does not support directory buckets"):
+        generate_tf_files()
+    assert not (tmp_path / "terraform.tfvars.json").exists()
@@ -0,0 +1,15 @@
+from er_aws_s3.input import AppInterfaceInput
+from er_aws_s3.json_stack import JsonStack
+
+from .conftest import input_corpus
+
+
+def test_data_sources_are_shared() -> None:
+    """Every distinct target is looked up once"""
+    ai_input = AppInterfaceInput.model_validate(input_corpus()["shared_data_sources"])
+    data = JsonStack("CDKTF", ai_input).document["data"]
+    assert {type_: list(sources) for type_, sources in data.items()} == {
+        "aws_s3_bucket": ["test-s3-dr-s3-ds"],
+        "aws_sqs_queue": ["queue-sqs-ds"],
+        "aws_sns_topic": ["topic-sns-ds"],
+    }
@@ -0,0 +1,91 @@
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from er_aws_s3.directory import region_code
+from er_aws_s3.input import AppInterfaceInput
+from er_aws_s3.json_stack import JsonStack
+
+from .conftest import _with_data, input_corpus
+
+
+@pytest.mark.parametrize(
+    ("region", "code"),
+    [
+        ("us-east-1", "use1"),
+        ("us-west-2", "usw2"),
+        ("eu-central-1", "euc1"),
+        ("ap-northeast-1", "apne1"),
+        ("ap-southeast-2", "apse2"),
+    ],
+)
+def test_region_code(region: str, code: str) -> None:
+    """Availability Zone IDs start with the compressed region name"""
+    assert region_code(region) == code
+
+
+def test_directory_bucket() -> None:
+    """A zonal directory bucket, a session policy and no ACL nor versioning"""
+    ai_input = AppInterfaceInput.model_validate(input_corpus()["directory_bucket"])
+    document = JsonStack("CDKTF", ai_input).document
+    resources = document["resource"]
+
+    assert resources["aws_s3_directory_bucket"]["test-s3"]["bucket"] == (
+        "test-s3--use1-az4--x-s3"
+    )
+    assert "aws_s3_bucket" not in resources
+    assert "aws_s3_bucket_acl" not in resources
+    assert "aws_s3_bucket_ownership_controls" not in resources
+    # The input enables the versioning, directory buckets have none
+    assert "aws_s3_bucket_versioning" not in resources
+    policy = json.loads(resources["aws_iam_policy"]["test-s3iam_policy"]["policy"])
+    assert policy["Statement"] == [
+        {
+            "Sid": "CreateSession",
+            "Effect": "Allow",
+            "Action": "s3express:CreateSession",
+            "Resource": "${aws_s3_directory_bucket.test-s3.arn}",
+        }
+    ]
+    assert document["output"]["output_prefix_s3_bucket__endpoint"] == {
+        "value": "s3express-use1-az4.us-east-1.amazonaws.com"
+    }
+
+
+@pytest.mark.parametrize(
+    ("data", "message"),
+    [
+        (
+            {"directory_bucket": {"availability_zone_id": "usw2-az1"}},
+            "usw2-az1: not in us-east-1",
+        ),
+        (
+            {"directory_bucket": {"availability_zone_id": "us-east-1a"}},
+            "us-east-1a: not an Availability Zone ID",
+        ),
+        (
+            {
+                "identifier": "a" * 50,
+                "directory_bucket": {"availability_zone_id": "use1-az4"},
+            },
+            "longer than 63 characters",
+        ),
+        (
+            {
+                "directory_bucket": {"availability_zone_id": "use1-az4"},
+                "cors_rules": [{"allowed_methods": ["GET"]}],
+            },
+            "cors_rules: not supported by directory buckets",
+        ),
+        (
+            # The default input lifecycle rule expires noncurrent versions
+            {"directory_bucket": {"availability_zone_id": "use1-az4"}},
+            "cleanup_noncurrent_versions: noncurrent_version_expiration not supported",
+        ),
+    ],
+)
+def test_invalid_directory_bucket(data: dict, message: str) -> None:
+    """Settings S3 Express One Zone does not support fail at input validation"""
+    with pytest.raises(ValidationError, match=message):
+        AppInterfaceInput.model_validate(_with_data(**data))
@@ -0,0 +1,74 @@
+import pytest
+
+from er_aws_s3.graph import Edge, analyze, dependency_graph
+from er_aws_s3.input import AppInterfaceInput
+from er_aws_s3.json_stack import JsonStack
+
+from .conftest import input_corpus
+
+# Resources applied one after the other in the longest chain of the stack:
+# bucket, ownership controls then ACL, or versioning then lifecycle/replication.
+# Raise it only for a dependency terraform or AWS really requires.
+MAX_CRITICAL_PATH = 3
+
+
+@pytest.mark.parametrize("name", sorted(input_corpus()))
+def test_apply_critical_path(name: str) -> None:
+    """Stack changes do not silently serialize the apply"""
+    ai_input = AppInterfaceInput.model_validate(input_corpus()[name])
+    report = analyze(JsonStack("CDKTF", ai_input).document)
+    assert len(report.critical_path) <= MAX_CRITICAL_PATH, report.critical_path
+    assert report.removable_edges == []
+    # The IAM user does not wait for the bucket
+    assert report.depths["aws_iam_user.test-s3_user"] == 1
+
+
+def test_dependency_graph() -> None:
+    """References, in JSON policies too, and depends_on are edges"""
+    document = {
+        "resource": {
+            "aws_s3_bucket": {"b": {"bucket": "b"}},
+            "aws_iam_policy": {
+                "p": {"policy": '{"Resource": "${aws_s3_bucket.b.arn}/*"}'}
+            },
+            "aws_iam_user": {"u": {"depends_on": ["aws_s3_bucket.b"]}},
+            "aws_iam_user_policy_attachment": {
+                "a": {
+                    "user": "${aws_iam_user.u.name}",
+                    "policy_arn": "${aws_iam_policy.p.arn}",
+                    "depends_on": ["aws_iam_policy.p", "aws_s3_bucket.b"],
+                }
+            },
+        },
+        "data": {"aws_sqs_queue": {"q": {"name": "${var.unknown}"}}},
+    }
+    assert dependency_graph(document) == {
+        "aws_s3_bucket.b": {},
+        "aws_iam_policy.p": {"aws_s3_bucket.b": {"reference"}},
+        "aws_iam_user.u": {"aws_s3_bucket.b": {"depends_on"}},
+        "aws_iam_user_policy_attachment.a": {
+            "aws_iam_user.u": {"reference"},
+            "aws_iam_policy.p": {"reference", "depends_on"},
+            "aws_s3_bucket.b": {"depends_on"},
+        },
+        "data.aws_sqs_queue.q": {},
+    }
+    report = analyze(document)
+    assert report.critical_path == [
+        "aws_s3_bucket.b",
+        "aws_iam_policy.p",
+        "aws_iam_user_policy_attachment.a",
+    ]
+    assert report.depths["data.aws_sqs_queue.q"] == 1
+    assert report.removable_edges == [
+        Edge(
+            "aws_iam_user_policy_attachment.a",
+            "aws_iam_policy.p",
+            "the resource already references it",
+        ),
+        Edge(
+            "aws_iam_user_policy_attachment.a",
+            "aws_s3_bucket.b",
+            "implied by the other dependencies",
+        ),
+    ]
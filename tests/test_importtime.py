@@ -0,0 +1,64 @@
+import json
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+from .conftest import input_data
+
+# Cumulative import budget of er_aws_s3.s3, in microseconds
+IMPORT_BUDGET_US = int(os.environ.get("ER_IMPORT_BUDGET_US", "5000000"))
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| \s*(\S+)$")
+
+
+def importtime(
+    *args: str, env: dict[str, str] | None = None
+) -> tuple[int, dict[str, dict[str, int]]]:
+    """Runs python -X importtime and returns the self/cumulative cost per module"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        capture_output=True,
+        text=True,
+        env={**os.environ, **(env or {})},
+        check=False,
+    )
+    modules = {}
+    for line in proc.stderr.splitlines():
+        if match := IMPORTTIME_LINE.match(line):
+            self_us, cumulative_us, name = match.groups()
+            modules[name] = {
+                "self_us": int(self_us),
+                "cumulative_us": int(cumulative_us),
+            }
+    return proc.returncode, modules
+
+
+def test_s3_module_does_not_load_provider() -> None:
+    """Importing the Stack module must not load the AWS provider assembly"""
+    returncode, modules = importtime("-c", "import er_aws_s3.s3")
+    assert returncode == 0
+    assert not [m for m in modules if m.startswith("cdktf_cdktf_provider_aws")]
+    assert modules["er_aws_s3.s3"]["cumulative_us"] < IMPORT_BUDGET_US
+
+
+def test_main_importtime_report(tmp_path: Path) -> None:
+    """Records the import cost per module of a full `python -m er_aws_s3` run"""
+    input_file = tmp_path / "input.json"
+    input_file.write_text(json.dumps(input_data()))
+    returncode, modules = importtime(
+        "-m",
+        "er_aws_s3",
+        env={"ER_INPUT_FILE": str(input_file), "ER_OUTDIR": str(tmp_path / "out")},
+    )
+    assert returncode == 0
+    assert "cdktf_cdktf_provider_aws" in modules
+
+    report = Path(os.environ.get("ER_IMPORTTIME_REPORT", tmp_path / "importtime.json"))
+    report.write_text(
+        json.dumps(
+            dict(sorted(modules.items(), key=lambda m: -m[1]["cumulative_us"])),
+            indent=2,
+        )
+    )
@@ -0,0 +1,32 @@
+from er_aws_s3.fleet import DIMENSIONS, synthetic_input
+from er_aws_s3.input import AppInterfaceInput
+from er_aws_s3.jsii_profile import profile_stacks
+
+# Kernel round trips per synthesized bucket with one item of every dimension
+MAX_CALLS_PER_BUCKET = 43
+
+
+def test_kernel_round_trips_per_bucket() -> None:
+    """The bucket tokens are read once, not once per step"""
+    inputs = [
+        AppInterfaceInput.model_validate(
+            synthetic_input(dict.fromkeys(DIMENSIONS, 1), f"bucket-{i}")
+        )
+        for i in range(2)
+    ]
+    report = profile_stacks(inputs).report()
+
+    assert report["total_calls"] <= MAX_CALLS_PER_BUCKET * len(inputs)
+    phases = report["phases"]
+    assert phases["Stack"]["by_request"]["Get"] == 2 * len(inputs)
+    for step in (
+        "Stack._s3_bucket_ownership_controls",
+        "Stack._s3_bucket_acl",
+        "Stack._s3_server_side_encryption",
+        "Stack._s3_versioning",
+        "Stack._s3_lifecycle_rules",
+        "Stack._s3_cors_rules",
+        "Stack._s3_event_notifications",
+    ):
+        assert "Get" not in phases[step]["by_request"], step
+    assert phases["App.synth"]["calls"] == len(inputs)
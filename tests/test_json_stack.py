@@ -0,0 +1,38 @@
+import json
+
+import pytest
+from cdktf import Testing
+
+from er_aws_s3.input import AppInterfaceInput
+from er_aws_s3.json_stack import JsonStack, aws_provider_version, logical_id
+from er_aws_s3.s3 import Stack
+
+from .conftest import input_corpus
+
+
+def _strip_metadata(value: object) -> object:
+    """Drops the cdktf '//' metadata blocks, they are ignored by terraform"""
+    if isinstance(value, dict):
+        return {k: _strip_metadata(v) for k, v in value.items() if k != "//"}
+    if isinstance(value, list):
+        return [_strip_metadata(v) for v in value]
+    return value
+
+
+@pytest.mark.parametrize("name", sorted(input_corpus()))
+def test_json_stack_equals_cdktf_stack(name: str) -> None:
+    """Both engines synthesize the same terraform document"""
+    ai_input = AppInterfaceInput.model_validate(input_corpus()[name])
+    cdktf_document = json.loads(Testing.synth(Stack(Testing.app(), "CDKTF", ai_input)))
+    json_document = json.loads(json.dumps(JsonStack("CDKTF", ai_input).document))
+    assert _strip_metadata(cdktf_document) == json_document
+
+
+def test_aws_provider_version() -> None:
+    """The provider version is read without importing the provider"""
+    assert aws_provider_version().count(".") == 2
+
+
+def test_logical_id() -> None:
+    """Disallowed characters are dropped like cdktf does"""
+    assert logical_id("$test-s3.bucket_policy") == "test-s3bucket_policy"
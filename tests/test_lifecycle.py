@@ -0,0 +1,141 @@
+import pytest
+from pydantic import ValidationError
+
+from er_aws_s3.input import AppInterfaceInput
+from er_aws_s3.json_stack import JsonStack
+from er_aws_s3.lifecycle import lifecycle_rules, validate_lifecycle_rules
+
+from .conftest import _with_data
+
+
+def test_lifecycle_rules_are_merged_and_sorted() -> None:
+    """User, versioning and storage class rules are merged and sorted by id"""
+    rules = lifecycle_rules(
+        [{"id": "user", "status": "Enabled"}],
+        versioning=True,
+        storage_class="GLACIER",
+    )
+    assert [r["id"] for r in rules] == [
+        "GLACIER_storage_class",
+        "expire_noncurrent_versions",
+        "user",
+    ]
+
+
+def test_user_noncurrent_version_expiration_wins() -> None:
+    """No versioning rule is added when a user rule expires noncurrent versions"""
+    user_rule = {"id": "user", "noncurrent_version_expiration": {"noncurrent_days": 7}}
+    assert lifecycle_rules([user_rule], versioning=True, storage_class=None) == [
+        user_rule
+    ]
+
+
+@pytest.mark.parametrize(
+    ("rule", "error"),
+    [
+        (
+            {"id": "ia", "transition": {"days": 10, "storage_class": "STANDARD_IA"}},
+            "ia: transition to STANDARD_IA requires days >= 30, got 10",
+        ),
+        (
+            {
+                "id": "up",
+                "transition": [
+                    {"days": 30, "storage_class": "GLACIER"},
+                    {"days": 90, "storage_class": "STANDARD_IA"},
+                ],
+            },
+            "up: transition from GLACIER to STANDARD_IA goes up",
+        ),
+        (
+            {
+                "id": "short",
+                "transition": [
+                    {"days": 30, "storage_class": "STANDARD_IA"},
+                    {"days": 45, "storage_class": "GLACIER"},
+                ],
+            },
+            "short: transition to GLACIER must be at least 30 days after",
+        ),
+        (
+            {
+                "id": "expire",
+                "transition": {"days": 90, "storage_class": "GLACIER"},
+                "expiration": {"days": 60},
+            },
+            "expire: expiration days must be greater than 90, got 60",
+        ),
+        (
+            {
+                "id": "noncurrent",
+                "noncurrent_version_transition": {
+                    "noncurrent_days": 1,
+                    "storage_class": "onezone_ia",
+                },
+            },
+            "noncurrent: transition to ONEZONE_IA requires noncurrent_days >= 30",
+        ),
+        ({"status": "Enabled"}, "every lifecycle rule requires an id"),
+    ],
+)
+def test_validate_lifecycle_rules(rule: dict, error: str) -> None:
+    """Rules S3 rejects at apply time fail locally"""
+    with pytest.raises(ValueError, match=error):
+        validate_lifecycle_rules([rule])
+
+
+def test_validate_lifecycle_rules_reports_every_error() -> None:
+    """Every error is reported at once"""
+    rules = [
+        {"id": "dup", "expiration": {"days": 0}},
+        {"id": "dup", "transition": {"days": 1, "storage_class": "COLD"}},
+    ]
+    with pytest.raises(ValueError, match="dup: duplicate") as e:
+        validate_lifecycle_rules(rules)
+    assert str(e.value).count("dup:") == 3
+
+
+def test_input_fails_on_conflicting_managed_rule_id() -> None:
+    """A user rule clashing with a managed rule id fails the input validation"""
+    data = _with_data(
+        versioning=True,
+        storage_class="glacier",
+        lifecycle_rules=[{"id": "GLACIER_storage_class", "status": "Enabled"}],
+    )
+    with pytest.raises(ValidationError, match="duplicate lifecycle rule id"):
+        AppInterfaceInput.model_validate(data)
+
+
+def test_single_lifecycle_configuration() -> None:
+    """All the rules of the bucket end up in one lifecycle configuration"""
+    data = _with_data(versioning=True, storage_class="glacier")
+    stack = JsonStack("CDKTF", AppInterfaceInput.model_validate(data))
+    configurations = stack.document["resource"]["aws_s3_bucket_lifecycle_configuration"]
+    assert list(configurations) == ["lifecycle_configuration"]
+    assert [r["id"] for r in configurations["lifecycle_configuration"]["rule"]] == [
+        "GLACIER_storage_class",
+        "cleanup_noncurrent_versions",
+    ]
+
+
+@pytest.mark.parametrize(
+    ("lifecycle", "legacy"),
+    [
+        (None, "cleanup_noncurrent_versions"),
+        ([], "noncurrent_version_expiration_lifecycle_rule"),
+    ],
+)
+def test_lifecycle_configuration_is_moved(
+    lifecycle: list[dict] | None, legacy: str
+) -> None:
+    """The merged configuration takes over the first one-rule configuration"""
+    data = _with_data(versioning=True, storage_class="glacier")
+    if lifecycle is not None:
+        data["data"]["lifecycle_rules"] = lifecycle
+    stack = JsonStack("CDKTF", AppInterfaceInput.model_validate(data))
+    assert stack.document["moved"] == [
+        {
+            "from": f"aws_s3_bucket_lifecycle_configuration.{legacy}",
+            "to": "aws_s3_bucket_lifecycle_configuration.lifecycle_configuration",
+        }
+    ]
@@ -0,0 +1,49 @@
+import json
+import os
+from pathlib import Path
+
+from er_aws_s3 import memory_profile
+from er_aws_s3.fleet import DIMENSIONS, synthetic_input
+
+# Ceilings of a bucket with every input dimension at its AWS limit, by phase, in
+# multiples of its input size: Python heap peak, Python memory retained and jsii
+# node heap growth
+CEILINGS = {
+    "get_ai_input": (32, 16, 64),
+    "Stack.__init__": (128, 64, 256),
+    "App.synth": (128, 64, 256),
+}
+
+
+def test_node_memory() -> None:
+    """The memory of a process is read from /proc, None once it exited"""
+    memory = memory_profile.node_memory(os.getpid())
+    assert memory is not None
+    assert memory["rss_bytes"] >= memory["heap_bytes"] > 0
+    assert memory["peak_rss_bytes"] >= memory["rss_bytes"]
+    assert memory_profile.node_memory(-1) is None
+
+
+def test_phase_without_profiling() -> None:
+    """Phases are a no-op unless a report file is configured"""
+    with memory_profile.profiling() as profiler:
+        assert profiler is None
+        with memory_profile.phase("noop"):
+            pass
+
+
+def test_memory_ceilings(tmp_path: Path) -> None:
+    """Large inputs stay under the memory ceilings of every phase"""
+    report = memory_profile.profile_synth(dict(DIMENSIONS), tmp_path / "memory.json")
+    size = len(json.dumps(synthetic_input(dict(DIMENSIONS))))
+
+    assert report["phases"].keys() == CEILINGS.keys()
+    for name, (peak, retained, node_heap) in CEILINGS.items():
+        memory = report["phases"][name]
+        assert memory["peak_bytes"] <= peak * size, name
+        assert memory["retained_bytes"] <= retained * size, name
+        assert memory["top_allocations"], name
+        node = memory["node"]
+        assert node is not None, name
+        growth = node["peak_heap_bytes"] - node["start_heap_bytes"]
+        assert growth <= node_heap * size, name
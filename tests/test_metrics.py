@@ -0,0 +1,72 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from er_aws_s3 import metrics
+
+from .conftest import input_data
+
+
+def _spans(metrics_file: Path) -> list[dict]:
+    document = json.loads(metrics_file.read_text())
+    return document["resourceSpans"][0]["scopeSpans"][0]["spans"]
+
+
+def test_span_is_a_noop_without_recording() -> None:
+    """Nothing is recorded outside of a recording"""
+    with metrics.recording(None) as recorder, metrics.span("phase"):
+        assert recorder is None
+
+
+def test_nested_spans(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Spans record their parent and their wall, CPU and allocation deltas"""
+    monkeypatch.setenv("ER_METRICS_TRACEMALLOC", "1")
+    metrics_file = tmp_path / "metrics.json"
+    with metrics.recording(str(metrics_file)), metrics.span("phase"):
+        data = [0] * 100_000
+    spans = _spans(metrics_file)
+    assert [s["name"] for s in spans] == [metrics.SERVICE_NAME, "phase"]
+    assert spans[1]["parentSpanId"] == spans[0]["spanId"]
+    attributes = {a["key"]: a["value"] for a in spans[1]["attributes"]}
+    assert set(attributes) == {
+        "wall_time_ms",
+        "cpu_time_ms",
+        "alloc_blocks",
+        "alloc_bytes",
+    }
+    assert int(attributes["alloc_bytes"]["intValue"]) >= len(data) * 4
+
+
+@pytest.mark.parametrize(
+    ("engine", "phases"),
+    [
+        ("python", ["JsonStack._s3_bucket", "JsonStack.synth"]),
+        ("cdktf", ["init_cdktf_app", "Stack._s3_bucket", "App.synth"]),
+    ],
+)
+def test_main_metrics_file(tmp_path: Path, engine: str, phases: list[str]) -> None:
+    """A run records every phase and the count of resources by type"""
+    input_file = tmp_path / "input.json"
+    input_file.write_text(json.dumps(input_data()))
+    subprocess.run(
+        [sys.executable, "-m", "er_aws_s3"],
+        env={
+            **os.environ,
+            "ER_INPUT_FILE": str(input_file),
+            "ER_OUTDIR": str(tmp_path / "out"),
+            "ER_SYNTH_ENGINE": engine,
+            "ER_METRICS_FILE": str(tmp_path / "metrics.json"),
+        },
+        check=True,
+    )
+
+    spans = _spans(tmp_path / "metrics.json")
+    names = [s["name"] for s in spans]
+    assert names[:3] == [metrics.SERVICE_NAME, "get_ai_input", "parse_model"]
+    assert set(phases) <= set(names)
+    root = {a["key"]: a["value"] for a in spans[0]["attributes"]}
+    assert root["resources.aws_s3_bucket"] == {"intValue": "1"}
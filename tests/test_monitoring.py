@@ -0,0 +1,143 @@
+import json
+import logging
+
+import pytest
+from pydantic import ValidationError
+
+from er_aws_s3.input import AppInterfaceInput
+from er_aws_s3.json_stack import JsonStack
+
+from .conftest import _with_data, input_corpus
+
+
+def test_monitoring_resources() -> None:
+    """Every configuration is a resource, destinations resolved to bucket ARNs"""
+    ai_input = AppInterfaceInput.model_validate(input_corpus()["monitoring"])
+    document = JsonStack("CDKTF", ai_input).document
+    resources = document["resource"]
+
+    assert resources["aws_s3_bucket_metric"] == {
+        "test-s3-metrics-EntireBucket": {
+            "bucket": "${aws_s3_bucket.test-s3.id}",
+            "name": "EntireBucket",
+        },
+        "test-s3-metrics-hot-prefix": {
+            "bucket": "${aws_s3_bucket.test-s3.id}",
+            "name": "hot-prefix",
+            "filter": {"prefix": "uploads/", "tags": {"team": "app-sre"}},
+        },
+    }
+    inventory = resources["aws_s3_bucket_inventory"]
+    assert inventory["test-s3-inventory-daily"]["destination"] == {
+        "bucket": {
+            "bucket_arn": "${data.aws_s3_bucket.test-s3-inventory-s3-ds.arn}",
+            "format": "Parquet",
+            "prefix": "inventory/",
+        }
+    }
+    weekly = inventory["test-s3-inventory-weekly-versions"]
+    assert weekly["destination"]["bucket"]["bucket_arn"] == (
+        "${aws_s3_bucket.test-s3.arn}"
+    )
+    assert weekly["schedule"] == {"frequency": "Weekly"}
+    assert weekly["filter"] == {"prefix": "uploads/"}
+
+    analytics = resources["aws_s3_bucket_analytics_configuration"]
+    assert "storage_class_analysis" not in analytics["test-s3-analytics-console-only"]
+    assert analytics["test-s3-analytics-exported"]["storage_class_analysis"] == {
+        "data_export": {
+            "output_schema_version": "V_1",
+            "destination": {
+                "s3_bucket_destination": {
+                    "bucket_arn": "${data.aws_s3_bucket.test-s3-inventory-s3-ds.arn}",
+                    "format": "CSV",
+                    "prefix": "analytics/",
+                }
+            },
+        }
+    }
+    # The inventory and analytics destination is looked up once
+    assert list(document["data"]["aws_s3_bucket"]) == ["test-s3-inventory-s3-ds"]
+
+
+def test_self_destination_bucket_policy() -> None:
+    """The bucket policy lets S3 deliver the reports the bucket sends to itself"""
+    ai_input = AppInterfaceInput.model_validate(input_corpus()["monitoring"])
+    document = JsonStack("CDKTF", ai_input).document
+    policy = json.loads(
+        document["resource"]["aws_s3_bucket_policy"]["test-s3-bucket_policy"]["policy"]
+    )
+    assert policy["Statement"] == [
+        {
+            "Sid": "AllowS3InventoryAndAnalyticsReports",
+            "Effect": "Allow",
+            "Principal": {"Service": "s3.amazonaws.com"},
+            "Action": "s3:PutObject",
+            "Resource": "${aws_s3_bucket.test-s3.arn}/*",
+            "Condition": {
+                "ArnLike": {"aws:SourceArn": "${aws_s3_bucket.test-s3.arn}"},
+                "StringEquals": {
+                    "aws:SourceAccount": (
+                        "${data.aws_caller_identity.test-s3-caller-identity.account_id}"
+                    )
+                },
+            },
+        }
+    ]
+
+
+def test_other_destination_is_reported(caplog: pytest.LogCaptureFixture) -> None:
+    """The policy of another destination bucket is a prerequisite, it is logged"""
+    with caplog.at_level(logging.WARNING):
+        AppInterfaceInput.model_validate(input_corpus()["monitoring"])
+    assert [r.getMessage() for r in caplog.records] == [
+        "test-s3-inventory: the bucket policy must allow s3:PutObject to "
+        "s3.amazonaws.com from test-s3, to deliver its reports"
+    ]
+
+
+@pytest.mark.parametrize(
+    ("data", "message"),
+    [
+        (
+            {"metrics_configurations": [{"name": "all"}, {"name": "all"}]},
+            "all: duplicate metrics configuration name",
+        ),
+        (
+            {
+                "inventory_configurations": [
+                    {"name": "daily report", "destination_bucket_identifier": "b"}
+                ]
+            },
+            "daily report: inventory configuration names are 1 to 64",
+        ),
+        (
+            {"analytics_configurations": [{"name": "a", "destination_prefix": "p/"}]},
+            "a: analytics destination_prefix without a destination bucket",
+        ),
+        (
+            {"metrics_configurations": [{"name": f"m{i}"} for i in range(1001)]},
+            "1001 metrics configurations, S3 allows at most 1000",
+        ),
+    ],
+)
+def test_invalid_monitoring_configurations(data: dict, message: str) -> None:
+    """Configurations S3 would reject fail at input validation"""
+    with pytest.raises(ValidationError, match=message):
+        AppInterfaceInput.model_validate(_with_data(**data))
+
+
+def test_unknown_inventory_field() -> None:
+    """Inventory optional fields are the ones S3 reports"""
+    with pytest.raises(ValidationError, match="optional_fields"):
+        AppInterfaceInput.model_validate(
+            _with_data(
+                inventory_configurations=[
+                    {
+                        "name": "daily",
+                        "destination_bucket_identifier": "b",
+                        "optional_fields": ["Colour"],
+                    }
+                ]
+            )
+        )
@@ -0,0 +1,64 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from er_aws_s3.node_cache import (
+    CACHE_VARIABLES,
+    boot,
+    cache_environment,
+    configure,
+    extract_runtime,
+    runtime_entrypoint,
+)
+
+# jsii touches this file of every package cache entry it reuses
+MARKER = ".jsii-runtime-package-cache"
+
+
+def test_cache_environment(tmp_path: Path) -> None:
+    """jsii runs the extracted runtime once there is one"""
+    assert "JSII_RUNTIME" not in cache_environment(tmp_path)
+    entrypoint = extract_runtime(tmp_path)
+    assert entrypoint == runtime_entrypoint(tmp_path)
+    assert (entrypoint.parents[1] / "lib" / "program.js").is_file()
+    assert cache_environment(tmp_path)["JSII_RUNTIME"] == str(entrypoint)
+
+
+def test_configure(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """The cache is configured from ER_NODE_CACHE_DIR, set variables are kept"""
+    for name in CACHE_VARIABLES:
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.delenv("ER_NODE_CACHE_DIR", raising=False)
+    assert not configure()
+    assert not configure(tmp_path / "missing")
+
+    monkeypatch.setenv("ER_NODE_CACHE_DIR", str(tmp_path))
+    monkeypatch.setenv("NODE_COMPILE_CACHE", "/elsewhere")
+    assert configure()
+    assert os.environ["JSII_RUNTIME_PACKAGE_CACHE_ROOT"] == str(tmp_path / "packages")
+    assert os.environ["NODE_COMPILE_CACHE"] == "/elsewhere"
+
+
+def _package_cache(root: Path) -> dict[str, int]:
+    return {
+        str(path.relative_to(root)): path.stat().st_mtime_ns
+        for path in (root / "packages").rglob("*")
+        if path.is_file()
+    }
+
+
+def test_second_boot_reuses_the_cache(tmp_path: Path) -> None:
+    """The second boot reads the extracted assemblies instead of extracting them"""
+    extract_runtime(tmp_path)
+    environment = {**os.environ, **cache_environment(tmp_path)}
+    environment["JSII_SILENCE_WARNING_DEPRECATED_NODE_VERSION"] = "1"
+    boot(environment)
+    first = _package_cache(tmp_path)
+    boot(environment)
+    second = _package_cache(tmp_path)
+
+    assert first.keys() == second.keys()
+    touched = {path for path in first if first[path] != second[path]}
+    assert touched
+    assert {Path(path).name for path in touched} == {MARKER}
@@ -0,0 +1,215 @@
+import time
+
+import pytest
+from pydantic import ValidationError
+
+from er_aws_s3.input import AppInterfaceInput, S3EventNotification
+from er_aws_s3.json_stack import JsonStack
+from er_aws_s3.notifications import (
+    Conflict,
+    eventbridge_event_pattern,
+    expand_event_types,
+    find_conflicts,
+    validate_event_notifications,
+)
+
+from .conftest import _with_data, input_corpus
+
+
+def _notification(
+    prefix: str, suffix: str, *event_types: str, identifier: str = "queue"
+) -> S3EventNotification:
+    return S3EventNotification(
+        destination_type="sqs",
+        destination_identifier=identifier,
+        event_type=list(event_types or ["s3:ObjectCreated:*"]),
+        filter_prefix=prefix,
+        filter_suffix=suffix,
+    )
+
+
+def test_expand_event_types() -> None:
+    """Wildcards expand to the events they match, other types are kept"""
+    assert expand_event_types(["s3:ObjectRemoved:*", "s3:ObjectAcl:Put"]) == {
+        "s3:ObjectRemoved:Delete",
+        "s3:ObjectRemoved:DeleteMarkerCreated",
+        "s3:ObjectAcl:Put",
+    }
+
+
+@pytest.mark.parametrize(
+    ("first", "second", "event_types"),
+    [
+        (("in/", ".json"), ("in/sub/", ".json"), ["s3:ObjectCreated:*"]),
+        (("", ""), ("logs/", ".gz"), ["s3:ObjectCreated:*"]),
+        (("in/", "data.json"), ("in/", ".json"), ["s3:ObjectCreated:*"]),
+        (
+            ("in/", ".json", "s3:ObjectCreated:*"),
+            ("", "", "s3:ObjectCreated:Put", "s3:ObjectRemoved:*"),
+            ["s3:ObjectCreated:Put"],
+        ),
+    ],
+)
+def test_find_conflicts(
+    first: tuple[str, ...], second: tuple[str, ...], event_types: list[str]
+) -> None:
+    """Notifications overlapping on prefix, suffix and event type conflict"""
+    assert find_conflicts([_notification(*first), _notification(*second)]) == [
+        Conflict(0, 1, event_types)
+    ]
+
+
+@pytest.mark.parametrize(
+    ("first", "second"),
+    [
+        (("in/", ".json"), ("out/", ".json")),
+        (("in/", ".json"), ("in/", ".csv")),
+        (
+            ("in/", ".json", "s3:ObjectCreated:*"),
+            ("in/", ".json", "s3:ObjectRemoved:*"),
+        ),
+        (("events-1/", ""), ("events-10/", "")),
+    ],
+)
+def test_no_conflicts(first: tuple[str, ...], second: tuple[str, ...]) -> None:
+    """Disjoint prefixes, suffixes or event types do not conflict"""
+    assert find_conflicts([_notification(*first), _notification(*second)]) == []
+
+
+def test_validate_event_notifications_reports_every_pair() -> None:
+    """Every conflicting pair is reported with its filters"""
+    notifications = [
+        _notification("", ".json", identifier="all"),
+        _notification("in/", ".json", identifier="in"),
+        _notification("in/", "", identifier="in-any"),
+    ]
+    with pytest.raises(ValueError, match="; ") as e:
+        validate_event_notifications(notifications)
+    assert str(e.value).split("; ")[0] == (
+        "event notifications 0 (all) and 1 (in) overlap on s3:ObjectCreated:*: "
+        "prefixes '' and 'in/', suffixes '.json' and '.json'"
+    )
+    assert str(e.value).count("overlap on") == 3
+
+
+def test_input_fails_on_overlapping_filters() -> None:
+    """Overlapping notifications fail the input validation, before any Stack"""
+    data = _with_data(
+        event_notifications=[
+            _notification("in/", ".json").model_dump(exclude={"identifier"}),
+            _notification("in/", "").model_dump(exclude={"identifier"}),
+        ]
+    )
+    with pytest.raises(ValidationError, match=r"event notifications 0 .* and 1"):
+        AppInterfaceInput.model_validate(data)
+
+
+def test_many_disjoint_notifications() -> None:
+    """Disjoint filters are indexed, not compared pairwise"""
+    notifications = [
+        _notification(f"tenant-{i}/", f".{i}.json", "s3:ObjectCreated:*")
+        for i in range(5000)
+    ]
+    start = time.perf_counter()
+    assert find_conflicts(notifications) == []
+    assert time.perf_counter() - start < 5
+
+
+def test_eventbridge_event_pattern() -> None:
+    """Event types map to detail types, both filters to a wildcard"""
+    notification = S3EventNotification(
+        destination_type="eventbridge",
+        destination_identifier="arn:aws:sqs:us-east-1:123:queue",
+        event_type=["s3:ObjectCreated:Put", "s3:ObjectRemoved:*"],
+        filter_prefix="in/*",
+        filter_suffix=".json",
+    )
+    assert eventbridge_event_pattern("bucket", notification) == {
+        "source": ["aws.s3"],
+        "detail-type": ["Object Created", "Object Deleted"],
+        "detail": {
+            "bucket": {"name": ["bucket"]},
+            "object": {"key": [{"wildcard": "in/\\**.json"}]},
+        },
+    }
+
+
+def test_eventbridge_notifications_may_overlap() -> None:
+    """EventBridge rules fan out, they are not part of the overlap check"""
+    notifications = [
+        _notification("in/", ".json"),
+        S3EventNotification(
+            destination_type="eventbridge",
+            destination_identifier="arn:aws:lambda:us-east-1:123:function:f",
+            event_type=["s3:ObjectCreated:*"],
+            filter_prefix="in/",
+            filter_suffix="",
+        ),
+    ]
+    validate_event_notifications(notifications)
+
+
+@pytest.mark.parametrize(
+    ("destination_identifier", "event_type", "message"),
+    [
+        ("queue", "s3:ObjectCreated:*", r"EventBridge targets are ARNs, not queue"),
+        (
+            "arn:aws:sqs:us-east-1:123:queue",
+            "s3:ReducedRedundancyLostObject",
+            r"EventBridge does not deliver s3:ReducedRedundancyLostObject",
+        ),
+    ],
+)
+def test_invalid_eventbridge_notification(
+    destination_identifier: str, event_type: str, message: str
+) -> None:
+    """Rules need an ARN target and events EventBridge delivers"""
+    notification = S3EventNotification(
+        destination_type="eventbridge",
+        destination_identifier=destination_identifier,
+        event_type=[event_type],
+        filter_prefix="",
+        filter_suffix="",
+    )
+    with pytest.raises(ValueError, match=message):
+        validate_event_notifications([notification])
+
+
+def test_lambda_and_eventbridge_destinations() -> None:
+    """Functions get one permission each, the notification waits for them"""
+    ai_input = AppInterfaceInput.model_validate(input_corpus()["lambda_eventbridge"])
+    resources = JsonStack("CDKTF", ai_input).document["resource"]
+
+    notification = resources["aws_s3_bucket_notification"][
+        "test-s3-event-notifications"
+    ]
+    assert notification["eventbridge"] is True
+    assert [f["lambda_function_arn"] for f in notification["lambda_function"]] == [
+        "${data.aws_lambda_function.thumbnailer-lambda-ds.arn}",
+        "${data.aws_lambda_function.thumbnailer-lambda-ds.arn}",
+        "arn:aws:lambda:us-east-1:123:function:audit:prod",
+        "arn:aws:lambda:us-east-1:123:function:restorer:prod",
+    ]
+    # Qualified functions sharing an alias get a permission each
+    assert notification["depends_on"] == [
+        "aws_lambda_permission.test-s3-thumbnailer-s3-permission",
+        "aws_lambda_permission.test-s3-audit-prod-s3-permission",
+        "aws_lambda_permission.test-s3-restorer-prod-s3-permission",
+    ]
+
+    permissions = resources["aws_lambda_permission"]
+    assert permissions["test-s3-audit-prod-s3-permission"] == {
+        "statement_id": "s3-test-s3",
+        "action": "lambda:InvokeFunction",
+        "function_name": "arn:aws:lambda:us-east-1:123:function:audit:prod",
+        "principal": "s3.amazonaws.com",
+        "source_arn": "${aws_s3_bucket.test-s3.arn}",
+    }
+    assert permissions["test-s3-events-0-permission"]["source_arn"] == (
+        "${aws_cloudwatch_event_rule.test-s3-events-0.arn}"
+    )
+    assert "test-s3-events-1-permission" not in permissions
+    assert resources["aws_cloudwatch_event_target"]["test-s3-events-1-target"] == {
+        "rule": "${aws_cloudwatch_event_rule.test-s3-events-1.name}",
+        "arn": "arn:aws:sqs:us-east-1:123:archive",
+    }
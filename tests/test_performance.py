@@ -0,0 +1,90 @@
+import pytest
+from pydantic import ValidationError
+
+from er_aws_s3.input import AppInterfaceInput
+from er_aws_s3.json_stack import JsonStack
+
+from .conftest import _with_data, input_corpus
+
+
+def _kms(**rule: object) -> dict:
+    return {
+        "rule": {
+            "apply_server_side_encryption_by_default": {"sse_algorithm": "aws:kms"},
+            **rule,
+        }
+    }
+
+
+def test_transfer_acceleration() -> None:
+    """The accelerate configuration and its endpoint output are emitted"""
+    ai_input = AppInterfaceInput.model_validate(input_corpus()["performance"])
+    document = JsonStack("CDKTF", ai_input).document
+    assert document["resource"]["aws_s3_bucket_accelerate_configuration"] == {
+        "bucket_accelerate_config": {
+            "bucket": "${aws_s3_bucket.test-s3.id}",
+            "status": "Enabled",
+        }
+    }
+    assert document["output"]["output_prefix_s3_bucket__accelerate_endpoint"] == {
+        "value": "test-s3.s3-accelerate.amazonaws.com"
+    }
+
+
+@pytest.mark.parametrize(
+    ("data", "bucket_key_enabled"),
+    [
+        ({"server_side_encryption_configuration": _kms()}, True),
+        (
+            {
+                "server_side_encryption_configuration": _kms(),
+                "performance": {"bucket_key_enabled": False},
+            },
+            False,
+        ),
+        (
+            {"server_side_encryption_configuration": _kms(bucket_key_enabled=False)},
+            False,
+        ),
+        ({}, None),
+    ],
+)
+def test_bucket_keys(data: dict, *, bucket_key_enabled: bool | None) -> None:
+    """aws:kms rules get Bucket Keys unless the rule or the profile disables them"""
+    ai_input = AppInterfaceInput.model_validate(_with_data(**data))
+    assert (
+        ai_input.data.server_side_encryption_rule.get("bucket_key_enabled")
+        == bucket_key_enabled
+    )
+
+
+@pytest.mark.parametrize(
+    ("data", "message"),
+    [
+        (
+            {"identifier": "test.s3", "performance": {"transfer_acceleration": True}},
+            "test.s3: Transfer Acceleration requires a bucket name without dots",
+        ),
+        (
+            {"region": "cn-north-1", "performance": {"transfer_acceleration": True}},
+            "cn-north-1: Transfer Acceleration is not available",
+        ),
+        (
+            {
+                "server_side_encryption_configuration": {
+                    "rule": {
+                        "apply_server_side_encryption_by_default": {
+                            "sse_algorithm": "aws:kms:dsse"
+                        },
+                        "bucket_key_enabled": True,
+                    }
+                }
+            },
+            "bucket_key_enabled: aws:kms:dsse does not support Bucket Keys",
+        ),
+    ],
+)
+def test_invalid_performance_profile(data: dict, message: str) -> None:
+    """Settings the bucket name or region do not allow fail at input validation"""
+    with pytest.raises(ValidationError, match=message):
+        AppInterfaceInput.model_validate(_with_data(**data))
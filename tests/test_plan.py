@@ -0,0 +1,189 @@
+import io
+import json
+import os
+import subprocess
+import sys
+import tracemalloc
+from pathlib import Path
+
+import pytest
+
+from er_aws_s3.plan import (
+    CHUNK_SIZE,
+    LIFECYCLE_DELETION,
+    JsonStream,
+    analyze,
+    analyze_file,
+)
+
+HOOK = Path(__file__).parents[1] / "hooks" / "post_plan.py"
+
+
+def _change(type_: str, actions: list[str], before: object, after: object) -> dict:
+    return {
+        "address": f"{type_}.this",
+        "type": type_,
+        "name": "this",
+        "change": {
+            "actions": actions,
+            "before": before,
+            "after": after,
+            "after_unknown": {},
+        },
+    }
+
+
+def _plan(*changes: dict) -> str:
+    return json.dumps({
+        "format_version": "1.2",
+        "planned_values": {"root_module": {"resources": [{"values": {"a": '}]\\"'}}]}},
+        "resource_changes": list(changes),
+        "prior_state": {"values": None},
+    })
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 1024])
+def test_json_stream(chunk_size: int) -> None:
+    """Values are read and skipped across chunk boundaries"""
+    document = {
+        "skipped": {"a": [1, 2.5e3, None, True, 'x\\"]}', {}], "b": "é\\n"},
+        "read": [{"s": 'q"uo\\te', "n": -12, "e": [], "o": {}}, False, "\\\\"],
+        "last": 42,
+    }
+    reader = JsonStream(io.StringIO(json.dumps(document, indent=1)), chunk_size)
+    values = {}
+    for key in reader.items():
+        if key == "skipped":
+            reader.skip()
+        else:
+            values[key] = reader.read()
+    assert values == {"read": document["read"], "last": 42}
+
+
+@pytest.mark.parametrize(
+    ("change", "reasons"),
+    [
+        (
+            _change("aws_s3_bucket", ["delete", "create"], {}, {}),
+            ["bucket replacement, its objects are lost"],
+        ),
+        (
+            _change(
+                "aws_s3_bucket",
+                ["update"],
+                {"force_destroy": False},
+                {"force_destroy": True},
+            ),
+            ["force_destroy enabled, deleting the bucket empties it"],
+        ),
+        (
+            _change(
+                "aws_s3_bucket_versioning",
+                ["update"],
+                {"versioning_configuration": [{"status": "Enabled"}]},
+                {"versioning_configuration": [{"status": "Suspended"}]},
+            ),
+            ["versioning disabled"],
+        ),
+        (
+            _change(
+                "aws_s3_bucket_versioning",
+                ["delete"],
+                {"versioning_configuration": [{"status": "Enabled"}]},
+                None,
+            ),
+            ["versioning disabled"],
+        ),
+        (
+            _change("aws_s3_directory_bucket", ["create", "delete"], {}, {}),
+            ["bucket replacement, its objects are lost"],
+        ),
+        (
+            _change("aws_s3_directory_bucket", ["delete"], {}, None),
+            ["bucket deletion"],
+        ),
+        (_change("aws_s3_bucket", ["update"], {}, {"tags": {}}), []),
+        (_change("aws_s3_bucket_acl", ["delete"], {}, None), []),
+    ],
+)
+def test_analyze(change: dict, reasons: list[str]) -> None:
+    """Destructive S3 changes are flagged"""
+    verdict = analyze(io.StringIO(_plan(change)))
+    assert [f.reason for f in verdict.findings] == reasons
+    assert verdict.destructive == bool(reasons)
+
+
+def test_analyze_access_key_rotation() -> None:
+    """Rotating the access key is expected, it is a warning"""
+    plan = _plan(_change("aws_iam_access_key", ["create", "delete"], {}, {}))
+    verdict = analyze(io.StringIO(plan))
+    assert not verdict.destructive
+    assert [w.reason for w in verdict.warnings] == [
+        "IAM access key rotation, the current key stops working"
+    ]
+
+
+def test_analyze_destroy() -> None:
+    """Deletions are expected when destroying"""
+    plan = _plan(
+        _change("aws_s3_bucket", ["delete"], {}, None),
+        _change("aws_iam_access_key", ["delete"], {}, None),
+    )
+    verdict = analyze(io.StringIO(plan), destroy=True)
+    assert not verdict.destructive
+    assert not verdict.warnings
+    verdict = analyze(io.StringIO(plan))
+    assert (len(verdict.findings), len(verdict.warnings)) == (1, 1)
+
+
+def test_analyze_memory_is_flat(tmp_path: Path) -> None:
+    """Memory does not grow with the number of resource changes"""
+    plan_file = tmp_path / "plan.json"
+    change = _change("aws_s3_bucket", ["update"], {"tags": {}}, {"tags": {"a": "b"}})
+    with plan_file.open("w") as f:
+        f.write('{"planned_values": ' + json.dumps(["x" * 1000] * 10_000))
+        f.write(', "resource_changes": [')
+        f.write(", ".join([json.dumps(change)] * 20_000))
+        f.write("]}")
+
+    tracemalloc.start()
+    try:
+        verdict = analyze_file(plan_file)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert verdict.resource_changes == 20_000
+    assert plan_file.stat().st_size > 10 * CHUNK_SIZE
+    # A few chunks, whatever the plan size
+    assert peak < 5 * CHUNK_SIZE
+
+
+def test_post_plan_hook(tmp_path: Path) -> None:
+    """The hook writes the verdict and fails on destructive changes"""
+    plan_file = tmp_path / "plan.json"
+    plan_file.write_text(_plan(_change("aws_s3_bucket", ["delete", "create"], {}, {})))
+    proc = subprocess.run(
+        [sys.executable, str(HOOK)],
+        env={
+            **os.environ,
+            "PYTHONPATH": str(HOOK.parents[1]),
+            "PLAN_FILE_JSON": str(plan_file),
+        },
+        check=False,
+    )
+    assert proc.returncode == 1
+    verdict = json.loads((tmp_path / "verdict.json").read_text())
+    assert verdict["findings"][0]["address"] == "aws_s3_bucket.this"
+
+
+def test_analyze_lifecycle_configuration_deletion() -> None:
+    """Deleting a lifecycle configuration next to a kept one drops its rules"""
+    kept = _change("aws_s3_bucket_lifecycle_configuration", ["no-op"], {}, {})
+    deleted = _change("aws_s3_bucket_lifecycle_configuration", ["delete"], {}, None)
+    deleted["address"] = "aws_s3_bucket_lifecycle_configuration.old"
+    verdict = analyze(io.StringIO(_plan(kept, deleted)))
+    assert [(f.address, f.reason) for f in verdict.findings] == [
+        ("aws_s3_bucket_lifecycle_configuration.old", LIFECYCLE_DELETION)
+    ]
+    assert not analyze(io.StringIO(_plan(deleted))).destructive
+    assert not analyze(io.StringIO(_plan(kept, deleted)), destroy=True).destructive
@@ -0,0 +1,163 @@
+import base64
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from er_aws_s3.json_stack import aws_provider_version
+from er_aws_s3.providers import (
+    CLI_CONFIG_FILE,
+    LOCK_FILE,
+    package_hash,
+    provider_dir,
+    write_offline_config,
+)
+
+from .conftest import input_data
+
+BINARY = f"terraform-provider-aws_v{aws_provider_version()}_x5"
+SYNCED_VERSIONS = Path(__file__).parents[1] / "providers" / "versions.tf"
+TERRAFORM = shutil.which("terraform")
+
+
+def _plugin_cache(cache_dir: Path) -> Path:
+    """Returns a plugin cache holding the pinned provider for two platforms"""
+    for platform in ("linux_amd64", "darwin_arm64"):
+        package_dir = provider_dir(cache_dir, aws_provider_version()) / platform
+        package_dir.mkdir(parents=True)
+        (package_dir / BINARY).write_bytes(f"provider for {platform}".encode())
+    return cache_dir
+
+
+def _verify_lock(lock_file: Path, cache_dir: Path) -> None:
+    """The lock hashes are those of the cached provider binaries"""
+    version = aws_provider_version()
+    lock = lock_file.read_text()
+    assert f'version     = "{version}"' in lock
+    expected = []
+    for package_dir in provider_dir(cache_dir, version).iterdir():
+        lines = "".join(
+            f"{hashlib.sha256(path.read_bytes()).hexdigest()}  {path.name}\n"
+            for path in sorted(package_dir.iterdir())
+        )
+        digest = hashlib.sha256(lines.encode()).digest()
+        expected.append("h1:" + base64.b64encode(digest).decode())
+    assert sorted(re.findall(r'"(h1:[^"]+)"', lock)) == sorted(expected)
+
+
+def test_image_caches_the_cdktf_provider_version() -> None:
+    """The image plugin cache holds the provider version the cdktf stack pins"""
+    versions = SYNCED_VERSIONS.read_text(encoding="utf-8")
+    match = re.search(r'version\s*=\s*"([^"]+)"', versions.split("aws = {")[1])
+    assert match
+    assert match[1] == aws_provider_version()
+
+
+def test_package_hash(tmp_path: Path) -> None:
+    """The h1 hash covers every file of the package, by name"""
+    (tmp_path / BINARY).write_bytes(b"provider")
+    first = package_hash(tmp_path)
+    (tmp_path / "LICENSE").write_text("license")
+    assert package_hash(tmp_path) != first
+    assert first.startswith("h1:")
+
+
+def test_write_offline_config(tmp_path: Path) -> None:
+    """The lock and the CLI config point terraform init at the plugin cache"""
+    cache_dir = _plugin_cache(tmp_path / "cache")
+    stack_dir = tmp_path / "out" / "stacks" / "CDKTF"
+    stack_dir.mkdir(parents=True)
+
+    assert write_offline_config(tmp_path / "out", stack_dir, cache_dir)
+
+    _verify_lock(stack_dir / LOCK_FILE, cache_dir)
+    cli_config = (tmp_path / "out" / CLI_CONFIG_FILE).read_text()
+    assert f'path    = "{cache_dir}"' in cli_config
+    assert 'exclude = ["registry.terraform.io/hashicorp/aws"]' in cli_config
+
+
+@pytest.mark.skipif(TERRAFORM is None, reason="terraform is not installed")
+def test_terraform_init_with_offline_config(tmp_path: Path) -> None:
+    """terraform init installs the provider from the mirror, without network"""
+    cache_dir = _plugin_cache(tmp_path / "cache")
+    stack_dir = tmp_path / "out" / "stacks" / "CDKTF"
+    stack_dir.mkdir(parents=True)
+    (stack_dir / "cdk.tf.json").write_text(
+        json.dumps({
+            "terraform": {
+                "required_providers": {
+                    "aws": {"source": "aws", "version": aws_provider_version()}
+                }
+            }
+        })
+    )
+    assert write_offline_config(tmp_path / "out", stack_dir, cache_dir)
+    assert "plugin_cache_dir" not in (tmp_path / "out" / CLI_CONFIG_FILE).read_text()
+
+    environment = {
+        name: value
+        for name, value in os.environ.items()
+        if name != "TF_PLUGIN_CACHE_DIR"
+    }
+    subprocess.run(
+        [
+            str(TERRAFORM),
+            f"-chdir={stack_dir}",
+            "init",
+            "-input=false",
+            "-backend=false",
+        ],
+        env={
+            **environment,
+            "TF_CLI_CONFIG_FILE": str(tmp_path / "out" / CLI_CONFIG_FILE),
+            "HOME": str(tmp_path),
+        },
+        check=True,
+    )
+    assert (stack_dir / ".terraform" / "providers").is_dir()
+
+
+def test_uncached_provider_writes_nothing(tmp_path: Path) -> None:
+    """Without the pinned provider in the cache, terraform init goes online"""
+    assert not write_offline_config(tmp_path, tmp_path, tmp_path / "cache")
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_synth_writes_offline_config(tmp_path: Path) -> None:
+    """A run with TF_PLUGIN_CACHE_DIR writes the lock next to cdk.tf.json"""
+    cache_dir = _plugin_cache(tmp_path / "cache")
+    input_file = tmp_path / "input.json"
+    input_file.write_text(json.dumps(input_data()))
+    subprocess.run(
+        [sys.executable, "-m", "er_aws_s3"],
+        env={
+            **os.environ,
+            "ER_INPUT_FILE": str(input_file),
+            "ER_OUTDIR": str(tmp_path / "out"),
+            "ER_SYNTH_ENGINE": "python",
+            "TF_PLUGIN_CACHE_DIR": str(cache_dir),
+        },
+        check=True,
+    )
+    _verify_lock(tmp_path / "out" / "stacks" / "CDKTF" / LOCK_FILE, cache_dir)
+    assert (tmp_path / "out" / CLI_CONFIG_FILE).is_file()
+
+
+@pytest.mark.skipif(
+    not provider_dir(
+        Path(os.environ.get("TF_PLUGIN_CACHE_DIR", "/nonexistent")),
+        aws_provider_version(),
+    ).is_dir(),
+    reason="the pinned provider is not in the terraform plugin cache",
+)
+def test_lock_matches_the_image_plugin_cache(tmp_path: Path) -> None:
+    """The lock matches the providers terraform-provider-sync cached"""
+    cache_dir = Path(os.environ["TF_PLUGIN_CACHE_DIR"])
+    assert write_offline_config(tmp_path, tmp_path, cache_dir)
+    _verify_lock(tmp_path / LOCK_FILE, cache_dir)
@@ -0,0 +1,97 @@
+import pytest
+from pydantic import ValidationError
+
+from er_aws_s3.input import AppInterfaceInput, S3ReplicationConfiguration
+from er_aws_s3.json_stack import JsonStack
+from er_aws_s3.replication import (
+    priorities,
+    replication_rules,
+    validate_replication_configurations,
+)
+
+from .conftest import _with_data, input_corpus
+
+
+def _config(rule_name: str, **attributes: object) -> S3ReplicationConfiguration:
+    return S3ReplicationConfiguration.model_validate({
+        "rule_name": rule_name,
+        "status": "Enabled",
+        "destination_bucket_identifier": f"{rule_name}-replica",
+        **attributes,
+    })
+
+
+def test_priorities_follow_the_input_order() -> None:
+    """Rules without a priority win in the input order"""
+    assert priorities([_config("a"), _config("b", priority=7), _config("c")]) == [
+        2,
+        7,
+        1,
+    ]
+
+
+def test_default_priorities_skip_the_explicit_ones() -> None:
+    """Rules without a priority never collide with a priority set on another"""
+    configs = [_config("a", priority=2), _config("b"), _config("c")]
+    assert priorities(configs) == [2, 3, 1]
+    validate_replication_configurations(configs, identifier="b", versioning=True)
+
+
+def test_replication_time_control_enables_the_metrics() -> None:
+    """RTC rules get the 15 minutes threshold and the metrics S3 requires"""
+    rules = replication_rules(
+        [_config("rtc", replication_time_control=True, filter_prefix="logs/")],
+        lambda identifier: f"arn:aws:s3:::{identifier}",
+    )
+    assert rules == [
+        {
+            "id": "rtc",
+            "status": "Enabled",
+            "priority": 1,
+            "filter": {"prefix": "logs/"},
+            "delete_marker_replication": {"status": "Disabled"},
+            "destination": {
+                "bucket": "arn:aws:s3:::rtc-replica",
+                "replication_time": {"status": "Enabled", "time": {"minutes": 15}},
+                "metrics": {"status": "Enabled", "event_threshold": {"minutes": 15}},
+            },
+        }
+    ]
+
+
+def test_validate_replication_configurations_reports_every_error() -> None:
+    """Duplicates, a missing versioning and a too long role name are reported"""
+    configs = [_config("dup", priority=1), _config("dup", priority=1)]
+    with pytest.raises(ValueError, match="requires the bucket versioning") as e:
+        validate_replication_configurations(
+            configs, identifier="b" * 60, versioning=False
+        )
+    assert "dup: duplicate replication rule name" in str(e.value)
+    assert "replication role name longer than 64 characters" in str(e.value)
+    assert "dup: priority 1 already used by dup" in str(e.value)
+
+
+def test_input_fails_without_versioning() -> None:
+    """Replicating an unversioned bucket fails the input validation"""
+    data = _with_data(
+        versioning=False,
+        replication_configurations=[_config("to-dr").model_dump()],
+    )
+    with pytest.raises(ValidationError, match="requires the bucket versioning"):
+        AppInterfaceInput.model_validate(data)
+
+
+def test_single_replication_configuration() -> None:
+    """All the rules share one configuration, one role and one policy"""
+    ai_input = AppInterfaceInput.model_validate(input_corpus()["replication"])
+    resources = JsonStack("CDKTF", ai_input).document["resource"]
+    configuration = resources["aws_s3_bucket_replication_configuration"][
+        "replication_configuration"
+    ]
+    assert [r["id"] for r in configuration["rule"]] == ["to-dr", "to-archive"]
+    assert configuration["role"] == "${aws_iam_role.test-s3_replication_iam_role.arn}"
+    assert configuration["depends_on"] == ["aws_s3_bucket_versioning.bucket_versioning"]
+    assert list(resources["aws_iam_role"]) == ["test-s3_replication_iam_role"]
+    assert list(resources["aws_iam_role_policy_attachment"]) == [
+        "test-s3_replication_iam_policy_attachment"
+    ]
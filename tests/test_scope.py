@@ -0,0 +1,98 @@
+from typing import Any
+
+from er_aws_s3.input import AppInterfaceInput
+from er_aws_s3.json_stack import JsonStack
+from er_aws_s3.scope import plan_scope, state_addresses
+
+from .conftest import input_corpus, input_data
+
+
+def _input(**data: object) -> AppInterfaceInput:
+    raw = input_data()
+    raw["data"].update(data)
+    return AppInterfaceInput.model_validate(raw)
+
+
+def _state(ai_input: AppInterfaceInput) -> dict[str, Any]:
+    """Returns the terraform.tfstate of an applied input"""
+    document = JsonStack("CDKTF", ai_input).document
+    return {
+        "version": 4,
+        "resources": [
+            {"mode": mode, "type": type_, "name": name, "instances": []}
+            for kind, mode in (("resource", "managed"), ("data", "data"))
+            for type_, blocks in document.get(kind, {}).items()
+            for name in blocks
+        ],
+    }
+
+
+def test_state_addresses() -> None:
+    """Data sources are prefixed, unknown state formats are not trusted"""
+    state = {
+        "version": 4,
+        "resources": [
+            {"mode": "managed", "type": "aws_s3_bucket", "name": "b"},
+            {"mode": "data", "type": "aws_sqs_queue", "name": "q"},
+        ],
+    }
+    assert state_addresses(state) == {"aws_s3_bucket.b", "data.aws_sqs_queue.q"}
+    assert state_addresses({"version": 3, "resources": []}) is None
+
+
+def test_plan_scope_cors() -> None:
+    """A cors_rules change targets the CORS configuration only"""
+    previous = _input()
+    current = AppInterfaceInput.model_validate(input_corpus()["cors"])
+    scope = plan_scope(_state(previous), previous, current)
+    assert scope.args() == [
+        "-target=aws_s3_bucket_cors_configuration.bucket_cors_config"
+    ]
+
+
+def test_plan_scope_lifecycle() -> None:
+    """A lifecycle_rules change targets the lifecycle configuration only"""
+    previous = _input()
+    current = _input(lifecycle_rules=[])
+    scope = plan_scope(_state(previous), previous, current)
+    assert scope.targets == [
+        "aws_s3_bucket_lifecycle_configuration.lifecycle_configuration"
+    ]
+
+
+def test_plan_scope_unchanged() -> None:
+    """Nothing changed, the plan does not refresh anything"""
+    ai_input = _input()
+    scope = plan_scope(_state(ai_input), ai_input, _input())
+    assert not scope.full
+    assert scope.args() == ["-refresh=false"]
+
+
+def test_plan_scope_out_of_sync_state() -> None:
+    """Resources the state misses or holds on top of the input are targeted"""
+    ai_input = _input()
+    state = _state(ai_input)
+    state["resources"] = [
+        r for r in state["resources"] if r["type"] != "aws_s3_bucket_acl"
+    ]
+    state["resources"].append({
+        "mode": "managed",
+        "type": "aws_s3_bucket_cors_configuration",
+        "name": "bucket_cors_config",
+    })
+    assert plan_scope(state, ai_input, ai_input).targets == [
+        "aws_s3_bucket_acl.bucket_acl",
+        "aws_s3_bucket_cors_configuration.bucket_cors_config",
+    ]
+
+
+def test_plan_scope_full() -> None:
+    """Without a state or a previous input, or on global changes, plan it all"""
+    ai_input = _input()
+    state = _state(ai_input)
+    assert plan_scope(None, ai_input, ai_input).full
+    assert plan_scope(state, None, ai_input).full
+    scope = plan_scope(state, ai_input, _input(output_prefix="other"))
+    assert scope.full
+    assert scope.args() == []
+    assert scope.reason == "output changed"
@@ -0,0 +1,148 @@
+import json
+import socket
+import threading
+import urllib.request
+from collections.abc import Iterator
+from http import HTTPStatus
+from pathlib import Path
+
+import pytest
+
+from er_aws_s3 import server as server_module
+from er_aws_s3.server import WorkerPool, make_server
+
+from .conftest import input_data
+
+
+@pytest.fixture
+def pool(monkeypatch: pytest.MonkeyPatch) -> Iterator[WorkerPool]:
+    """Python engine workers, recycled after two requests"""
+    monkeypatch.setenv("ER_SYNTH_ENGINE", "python")
+    pool = WorkerPool(1, max_requests=2, timeout=60, warmup=False)
+    yield pool
+    pool.close()
+
+
+@pytest.fixture
+def url(pool: WorkerPool, tmp_path: Path) -> Iterator[str]:
+    """Base URL of a server listening on a localhost port, outdirs in tmp_path"""
+    server = make_server(pool, outdir_root=tmp_path)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.socket.getsockname()
+    yield f"http://{host}:{port}"
+    server.shutdown()
+    server.server_close()
+
+
+def _request(url: str, data: bytes | None = None) -> tuple[int, bytes]:
+    try:
+        with urllib.request.urlopen(url, data=data, timeout=60) as response:  # noqa: S310
+            return response.status, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.read()
+
+
+def test_synth(url: str, tmp_path: Path) -> None:
+    """The synthesized stack is returned or written to the requested outdir"""
+    status, body = _request(f"{url}/synth", json.dumps(input_data()).encode())
+    assert status == HTTPStatus.OK
+    assert "test-s3" in json.loads(body)["resource"]["aws_s3_bucket"]
+
+    status, body = _request(
+        f"{url}/synth?outdir=out", json.dumps(input_data()).encode()
+    )
+    assert status == HTTPStatus.OK
+    assert json.loads(body) == {"outdir": str(tmp_path.resolve() / "out")}
+    assert (tmp_path / "out" / "stacks" / "CDKTF" / "cdk.tf.json").exists()
+
+    status, body = _request(f"{url}/metrics")
+    assert "er_aws_s3_worker_recycles_total 1" in body.decode()
+    assert 'er_aws_s3_requests_total{status="200"} 2' in body.decode()
+
+
+@pytest.mark.parametrize("outdir", ["../out", "/etc", "out/../.."])
+def test_outdir_outside_of_the_root(url: str, outdir: str) -> None:
+    """Outdirs escaping the outdir root are rejected without synthesizing"""
+    status, body = _request(
+        f"{url}/synth?outdir={outdir}", json.dumps(input_data()).encode()
+    )
+    assert status == HTTPStatus.BAD_REQUEST
+    assert "outside of the outdir root" in json.loads(body)["error"]
+
+
+def test_outdir_without_root(pool: WorkerPool) -> None:
+    """Without an outdir root, requests can not write outdirs"""
+    server = make_server(pool)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.socket.getsockname()
+    status, body = _request(
+        f"http://{host}:{port}/synth?outdir=out", json.dumps(input_data()).encode()
+    )
+    server.shutdown()
+    server.server_close()
+    assert status == HTTPStatus.BAD_REQUEST
+    assert "outdir requires the server --outdir-root" in json.loads(body)["error"]
+
+
+def test_failed_replacement_degrades(
+    url: str, pool: WorkerPool, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A worker failing to start is missing until a later request starts it"""
+    payload = json.dumps(input_data()).encode()
+    assert pool.synth(payload, None)[0] == HTTPStatus.OK
+    worker = server_module.Worker
+
+    def _fail(**_: object) -> None:
+        raise OSError("too many open files")
+
+    monkeypatch.setattr(server_module, "Worker", _fail)
+    # The second request recycles the worker, its replacement fails to start
+    assert pool.synth(payload, None)[0] == HTTPStatus.OK
+    status, body = _request(f"{url}/healthz")
+    assert status == HTTPStatus.SERVICE_UNAVAILABLE
+    assert json.loads(body) == {
+        "status": "degraded",
+        "workers": 1,
+        "idle": 0,
+        "missing": 1,
+    }
+
+    monkeypatch.setattr(server_module, "Worker", worker)
+    assert pool.synth(payload, None)[0] == HTTPStatus.OK
+    status, body = _request(f"{url}/healthz")
+    assert status == HTTPStatus.OK
+    assert json.loads(body)["missing"] == 0
+
+
+def test_invalid_input(url: str) -> None:
+    """Invalid inputs are rejected without synthesizing"""
+    status, body = _request(f"{url}/synth", b'{"data": {}}')
+    assert status == HTTPStatus.UNPROCESSABLE_ENTITY
+    assert "validation error" in json.loads(body)["error"]
+
+
+def test_timeout(pool: WorkerPool) -> None:
+    """A request exceeding the timeout kills and replaces its worker"""
+    pool.timeout = 0.001
+    status, _ = pool.synth(json.dumps(input_data()).encode(), None)
+    assert status == HTTPStatus.GATEWAY_TIMEOUT
+    pool.timeout = 60
+    status, _ = pool.synth(json.dumps(input_data()).encode(), None)
+    assert status == HTTPStatus.OK
+    assert pool.stats["timeouts"] == 1
+
+
+def test_unix_socket_health(pool: WorkerPool, tmp_path: Path) -> None:
+    """The server listens on a Unix socket"""
+    server = make_server(pool, socket=str(tmp_path / "er.sock"))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    with socket.socket(socket.AF_UNIX) as client:
+        client.connect(str(tmp_path / "er.sock"))
+        client.sendall(b"GET /healthz HTTP/1.0\r\n\r\n")
+        response = b"".join(iter(lambda: client.recv(4096), b""))
+    server.shutdown()
+    server.server_close()
+    headers, body = response.split(b"\r\n\r\n", 1)
+    assert headers.startswith(b"HTTP/1.0 200")
+    assert json.loads(body) == {"status": "ok", "workers": 1, "idle": 1, "missing": 0}
@@ -0,0 +1,67 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from er_aws_s3.input import S3EventNotification
+from er_aws_s3.validate import iter_files, validate_files
+
+from .conftest import input_data
+
+
+def test_validate_files_reports_every_error(tmp_path: Path) -> None:
+    """Every error of every invalid input is reported"""
+    (tmp_path / "nested").mkdir()
+    (tmp_path / "nested" / "good.json").write_text(json.dumps(input_data()))
+    bad = input_data()
+    bad["data"]["acl"] = "open"
+    del bad["provision"]["identifier"]
+    (tmp_path / "bad.json").write_text(json.dumps(bad))
+    (tmp_path / "broken.json").write_text("{")
+
+    results = {r.path.name: r for r in validate_files(iter_files([str(tmp_path)]))}
+    assert results["good.json"].ok
+    assert [e.split(":")[0] for e in results["bad.json"].errors] == [
+        "data.acl",
+        "provision.identifier",
+    ]
+    assert results["broken.json"].errors[0].startswith("<root>: Invalid JSON")
+
+
+def test_validate_files_in_parallel(tmp_path: Path) -> None:
+    """Worker processes return the results in the input order"""
+    paths = []
+    for i in range(100):
+        data = input_data()
+        if i % 10 == 0:
+            data["data"]["acl"] = "open"
+        paths.append(tmp_path / f"{i:03}.json")
+        paths[-1].write_text(json.dumps(data))
+    results = validate_files(paths, workers=2)
+    assert [r.path for r in results] == paths
+    assert [r.ok for r in results] == [i % 10 != 0 for i in range(100)]
+
+
+def test_validate_does_not_import_cdktf() -> None:
+    """Validating only loads the input models"""
+    subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, er_aws_s3.validate; assert 'cdktf' not in sys.modules",
+        ],
+        check=True,
+    )
+
+
+def test_event_notification_identifier() -> None:
+    """The identifier is the ARN resource name, computed once"""
+    notification = S3EventNotification(
+        destination_type="sqs",
+        destination_identifier="arn:aws:sqs:us-east-1:123:queue",
+        event_type=["s3:ObjectCreated:*"],
+        filter_prefix="",
+        filter_suffix="",
+    )
+    assert notification.identifier == "queue"
+    assert notification.__dict__["identifier"] == "queue"